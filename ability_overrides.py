@@ -0,0 +1,211 @@
+import ast
+import argparse
+import numpy as np
+import pandas as pd
+
+
+class AbilityOverrides:
+    """
+
+    Applies hand-maintained corrections to the abilities dataframe. There isn't a reliable way to tell
+    from Dissidia Compendium which abilities are uncapped (and a few HP caps on the website are wrong),
+    so these rules are kept in a CSV (datasets/ability_overrides.csv) and updated as I go along.
+
+    Every rule has a type, a character (blank for every character), an ability name, and a game version
+    (blank for both). The rule types are:
+
+    1) fix_hp_cap: sets the ability's HP Dmg Cap up to hp_dmg_cap_up_perc
+    2) uncapped: sets the ability's HP Dmg Cap up to hp_dmg_cap_up_perc (900, which takes a character
+       from 99,999 dmg to 999,999 dmg) and adds 'Uncapped' to its attributes
+    3) split_uncapped: for abilities with some HP attacks uncapped and the rest regularly capped. Moves
+       main_target_hp_attacks and non_target_hp_attacks out of the ability and into a follow-up row
+       named followup_name, with hp_dmg_cap_up_perc, right before the ability
+    4) add_followup: adds a follow-up row named ability_name after the character's other abilities, for
+       follow-ups the website doesn't list
+
+    The rules are applied in that order, in one pass over a whole roster's abilities dataframe, so they
+    can be re-applied to saved dataframes without scraping again.
+
+    """
+
+    RULE_TYPES = ['fix_hp_cap', 'uncapped', 'split_uncapped', 'add_followup']
+    GAME_VERSIONS = ['GL', 'JP']
+    ROW_KEY = ['char_name', 'ability_name', 'game_version']
+
+    def __init__(self, rule_df):
+        rule_df = rule_df.copy()
+
+        unknown_rule_set = set(rule_df['rule']) - set(self.RULE_TYPES)
+
+        if unknown_rule_set:
+            raise ValueError(f"Unknown ability override rules: {sorted(unknown_rule_set)}")
+
+        # A blank game version applies to both versions.
+        rule_df['game_version'] = rule_df['game_version'].apply(
+            lambda game_version: self.GAME_VERSIONS if pd.isna(game_version) else [game_version]
+        )
+        rule_df = rule_df.explode('game_version', ignore_index=True)
+
+        for count_column in ['hp_dmg_cap_up_perc', 'main_target_hp_attacks', 'non_target_hp_attacks']:
+            rule_df[count_column] = rule_df[count_column].fillna(0).astype(int)
+
+        self.rule_df = rule_df
+
+    @classmethod
+    def from_csv(cls, rule_csv_path):
+        """
+
+        Loads the rules from a CSV.
+
+        """
+
+        return cls(pd.read_csv(rule_csv_path, dtype={'char_name': object, 'game_version': object}))
+
+    def rules(self, rule_type):
+        """
+
+        Returns every rule of one type.
+
+        """
+
+        return self.rule_df[self.rule_df['rule'] == rule_type]
+
+    def match(self, ability_df, rule_type, column_list):
+        """
+
+        Returns a dataframe aligned with ability_df holding each row's matching rule values (NaN where no
+        rule matches) and a 'matched' column. Rules for a specific character take priority over rules for
+        every character.
+
+        """
+
+        rule_df = self.rules(rule_type)
+
+        matched_df = pd.DataFrame(index=ability_df.index, columns=column_list, dtype=object)
+        matched_df['matched'] = False
+
+        for char_specific, join_key in [(False, self.ROW_KEY[1:]), (True, self.ROW_KEY)]:
+            key_rule_df = rule_df[rule_df['char_name'].notna() == char_specific]
+
+            if key_rule_df.empty:
+                continue
+
+            key_rule_df = key_rule_df.drop_duplicates(join_key, keep='last')[join_key + column_list]
+            key_rule_df = key_rule_df.assign(matched=True)
+
+            joined_df = ability_df[join_key].merge(key_rule_df, on=join_key, how='left')
+            joined_df.index = ability_df.index
+
+            hit = joined_df['matched'].eq(True)
+
+            if not hit.any():
+                continue
+
+            matched_df.loc[hit, column_list + ['matched']] = joined_df.loc[hit, column_list + ['matched']]
+
+        matched_df['matched'] = matched_df['matched'].astype(bool)
+
+        return matched_df
+
+    def apply(self, ability_df):
+        """
+
+        Returns a copy of an abilities dataframe (the concatenated `generate_ability_df` outputs) with every
+        rule applied. Rows stay in their original order, with split-off follow-ups right before the ability
+        they came from and added follow-ups after the rest of their character's abilities.
+
+        """
+
+        column_list = list(ability_df.columns)
+
+        ability_df = ability_df.reset_index(drop=True).copy()
+
+        # Dataframes read back from CSV hold their attribute lists as strings.
+        ability_df['attribute_list'] = ability_df['attribute_list'].apply(
+            lambda attribute_list: ast.literal_eval(attribute_list) if isinstance(attribute_list, str) else attribute_list
+        )
+
+        # Sort keys that put every row back in place once new rows are added
+        ability_df['group_order'] = ability_df.groupby(['char_name', 'game_version'], sort=False).ngroup()
+        ability_df['row_order'] = ability_df.index * 2 + 1
+
+        original_attribute_list = ability_df['attribute_list'].copy()
+
+        # 1) HP cap fixes
+        fix_df = self.match(ability_df, 'fix_hp_cap', ['hp_dmg_cap_up_perc'])
+        ability_df.loc[fix_df['matched'], 'hp_dmg_cap_up_perc'] = fix_df.loc[fix_df['matched'], 'hp_dmg_cap_up_perc'].astype(int)
+
+        # 2) Uncapped abilities
+        uncapped_df = self.match(ability_df, 'uncapped', ['hp_dmg_cap_up_perc'])
+        uncapped = uncapped_df['matched']
+        ability_df.loc[uncapped, 'hp_dmg_cap_up_perc'] = uncapped_df.loc[uncapped, 'hp_dmg_cap_up_perc'].astype(int)
+        ability_df.loc[uncapped, 'attribute_list'] = pd.Series(
+            [['Uncapped'] + attribute_list for attribute_list in ability_df.loc[uncapped, 'attribute_list']],
+            index=ability_df.index[uncapped],
+            dtype=object
+        )
+
+        # 3) Abilities with some HP attacks uncapped
+        split_column_list = ['hp_dmg_cap_up_perc', 'main_target_hp_attacks', 'non_target_hp_attacks', 'followup_name']
+        split_df = self.match(ability_df, 'split_uncapped', split_column_list)
+        split = split_df['matched']
+
+        split_followup_df = ability_df[split].copy()
+        split_followup_df['ability_name'] = split_df.loc[split, 'followup_name']
+        split_followup_df['ability_id'] = np.nan
+        split_followup_df['attribute_list'] = [
+            attribute_list if 'FollowUp' in attribute_list else ['FollowUp'] + attribute_list
+            for attribute_list in original_attribute_list[split]
+        ]
+        split_followup_df['row_order'] -= 1
+
+        for count_column in ['hp_dmg_cap_up_perc', 'main_target_hp_attacks', 'non_target_hp_attacks']:
+            split_followup_df[count_column] = split_df.loc[split, count_column].astype(int)
+
+        for count_column in ['main_target_hp_attacks', 'non_target_hp_attacks']:
+            ability_df.loc[split, count_column] -= split_df.loc[split, count_column].astype(int)
+
+        # 4) Follow-ups the website doesn't list
+        group_df = ability_df.groupby(['char_name', 'game_version'], sort=False).agg(
+            group_order=('group_order', 'first'),
+            row_order=('row_order', 'max')
+        ).reset_index()
+
+        added_followup_df = group_df.merge(
+            self.rules('add_followup').drop(columns=['rule', 'followup_name']),
+            on=['char_name', 'game_version']
+        )
+        added_followup_df['row_order'] += added_followup_df.groupby(['char_name', 'game_version']).cumcount() + 2
+        added_followup_df['ability_id'] = np.nan
+        added_followup_df['attribute_list'] = added_followup_df['attribute_list'].apply(ast.literal_eval)
+
+        ability_df = pd.concat(
+            [ability_df, split_followup_df, added_followup_df[ability_df.columns]],
+            ignore_index=True
+        )
+
+        ability_df = ability_df.sort_values(['group_order', 'row_order'], kind='stable')
+
+        return ability_df[column_list].reset_index(drop=True)
+
+
+def main():
+    """
+
+    Re-applies the override rules to saved abilities dataframes from the command line.
+
+    """
+
+    arg_parser = argparse.ArgumentParser(description="Apply ability override rules to saved abilities dataframes.")
+    arg_parser.add_argument('rule_csv_path', help="Path to the override rules CSV.")
+    arg_parser.add_argument('ability_csv_paths', nargs='+', help="Abilities dataframes to apply the rules to, as saved by the scraper before overrides.")
+    arg_parser.add_argument('--output', required=True, help="Path of the CSV to write the combined result to.")
+    args = arg_parser.parse_args()
+
+    ability_df = pd.concat([pd.read_csv(ability_csv_path, dtype={'ability_id': object}) for ability_csv_path in args.ability_csv_paths])
+
+    AbilityOverrides.from_csv(args.rule_csv_path).apply(ability_df).to_csv(args.output, index=False)
+
+
+if __name__ == '__main__':
+    main()
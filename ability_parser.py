@@ -0,0 +1,242 @@
+import re
+import zlib
+import logging
+
+
+class HpAttackParser:
+    """
+
+    Counts the HP attacks an ability deals to its main target and to non-targets, and adds up the HP Dmg
+    Cap up it grants, from the prettified lines of the ability's info block (see
+    CompendiumScraper.prettify_html_to_list).
+
+    Parsing happens in two steps:
+
+    1) tokenize() walks the lines once and turns every line of interest into a typed event. Cap-up lines
+       become 'cap_up' events holding their percentage. Every HP attack icon ('inline HP') becomes an
+       'hp_attack' event, built by classifying the clause that describes the attack (group attack,
+       attack × times, damage to non-targets, damage copied to non-targets after each HP attack, etc.).
+    2) count() folds the events, in order, into main-target and non-target HP attack counts.
+
+    The clause describing an HP attack sits at a fixed position relative to its icon in the prettified
+    block, and a few layouts move it further down:
+
+    - Damage based on a stored value (e.g., Aerith's BT effect, Astos): 11 lines after the icon
+    - Damage based on a stat or current value (e.g., Aerith's LD follow-up): 6 lines after the icon
+    - Serah and Snow's EX, where a BREAK icon sits between the icon and the non-target clause: 13 lines
+      after the icon
+    - Crystal Generation: 6 lines after the icon
+
+    Every other HP attack reads its clause from 2 lines after the icon.
+
+    Tracing every line of every ability is most of the parser's logging, so with trace_sample_rate below 1
+    only that fraction of abilities is traced. Abilities are picked by a hash of their name, so the same
+    abilities are traced on every run.
+
+    """
+
+    # Clause types for 'hp_attack' events
+    NON_TARGETS_AFTER_EACH_EXCEPT_LAST = 'non_targets_after_each_except_last'
+    NON_TARGETS_AFTER_EACH = 'non_targets_after_each'
+    GROUP_TIMES = 'group_times'
+    GROUP = 'group'
+    NON_TARGETS_TIMES = 'non_targets_times'
+    NON_TARGETS = 'non_targets'
+    MAIN_TARGET_TIMES = 'main_target_times'
+    MAIN_TARGET = 'main_target'
+
+    HP_ATTACK_ICON = "inline HP"
+    FE_CAP_UP_MARKER = "- MAX BRV Cap"
+    CAP_UP_MARKER = "MAX BRV Cap Up by"
+
+    GROUP_COUNT_PATTERN = re.compile(r"Group \d+")
+    GROUP_TIMES_PATTERN = re.compile(r"Group (\d+) times")
+    NON_TARGETS_MULTIPLIER_PATTERN = re.compile(r"to non-targets × \d+")
+    MULTIPLIER_PATTERN = re.compile(r"× (\d+)")
+    NON_TARGETS_TIMES_PATTERN = re.compile(r"to non-targets \d+ times|to non-trap triggered targets \d+ times")
+    NON_TARGETS_PATTERN = re.compile(r"to non-targets|to non-trap triggered targets")
+    TIMES_PATTERN = re.compile(r"(\d+) times")
+
+    def __init__(
+        self,
+        logger,
+        trace_sample_rate = 1.0  # Fraction of abilities whose parsing is traced in the log
+    ):
+        self.logger = logger
+        self.trace_sample_rate = trace_sample_rate
+        self.tracing = True
+
+    def sampled(self, ability_name):
+        """
+
+        Returns True if an ability's parsing should be traced.
+
+        """
+
+        if self.trace_sample_rate >= 1:
+            return True
+
+        return zlib.crc32(ability_name.encode()) % 10000 < self.trace_sample_rate * 10000
+
+    def trace(self, msg, *args):
+        """
+
+        Logs one of the parser's traces, if the current ability is being traced.
+
+        """
+
+        if self.tracing:
+            self.logger.info(msg, *args)
+
+    def parse(self, ability_name, ability_html_lines):
+        """
+
+        Returns a (main target HP attacks, non-target HP attacks, HP Dmg Cap up %) tuple for an ability.
+
+        """
+
+        self.tracing = self.logger.isEnabledFor(logging.INFO) and self.sampled(ability_name)
+
+        return self.count(self.tokenize(ability_name, ability_html_lines))
+
+    def tokenize(self, ability_name, ability_html_lines):
+        """
+
+        Walks an ability's prettified lines once and returns its list of events, in document order.
+
+        """
+
+        event_list = []
+
+        clause_offset = 6 if 'Crystal Generation' in ability_name else 2
+
+        for index, line in enumerate(ability_html_lines):
+
+            # HP Dmg Cap up within the ability and/or from its FE
+            if self.FE_CAP_UP_MARKER in line:
+                event_list.append({
+                    'event': 'cap_up',
+                    'value': int(ability_html_lines[index + 6].strip().replace('%', ''))
+                })
+
+            if self.CAP_UP_MARKER in line:
+                event_list.append({
+                    'event': 'cap_up',
+                    'value': int(ability_html_lines[index + 2].strip().replace('%', ''))
+                })
+
+            if self.HP_ATTACK_ICON not in line:
+                continue
+
+            # Single-target vs group info appears on the preceding line and/or 3 lines before, and sometimes 2 lines after.
+            AOE = 'Group' in ability_html_lines[index - 1] + ability_html_lines[index - 3] + ability_html_lines[index + 2]
+
+            if AOE:
+                self.trace("%s is being considered AOE.", ability_name)
+
+            # An icon right after "Attack" describes the source of the HP damage, not a new HP attack.
+            if 'Attack' in ability_html_lines[index - 2]:
+                continue
+
+            event_list.append(self.hp_attack_event(ability_html_lines, index, clause_offset, AOE))
+
+        return event_list
+
+    def hp_attack_event(self, ability_html_lines, index, clause_offset, AOE):
+        """
+
+        Finds and classifies the clause describing the HP attack whose icon is at `index`, and returns its event.
+
+        """
+
+        attack_info_line = ability_html_lines[index + clause_offset]
+        extra_condition_line = ability_html_lines[index + 6]
+
+        if ("Damage by" in attack_info_line or "Damage to" in attack_info_line) and "of stored value from" in extra_condition_line:
+            attack_info_line = ability_html_lines[index + 11]
+            self.trace("Attack info line is ELEVEN lines after inline HP.")
+
+        if (" by" in attack_info_line or " based on" in attack_info_line) and "of " in extra_condition_line:
+            if "to non-targets" in ability_html_lines[index + 13] and "inline BREAK" in ability_html_lines[index + 11]:
+                attack_info_line = ability_html_lines[index + 13]
+                self.trace("Attack info line is THIRTEEN lines after inline HP (Serah or Snow EX)")
+            else:
+                attack_info_line = ability_html_lines[index + 6]
+                self.trace("Attack info line is SIX lines after inline HP.")
+
+        hp_attacks_to_add = 0
+        add_to_non_target = 0
+
+        if "Damage to non-targets after each HP Attack, except last" in attack_info_line:
+            clause = self.NON_TARGETS_AFTER_EACH_EXCEPT_LAST
+        elif "Damage to non-targets after each HP Attack" in attack_info_line:
+            clause = self.NON_TARGETS_AFTER_EACH
+        elif self.GROUP_COUNT_PATTERN.search(attack_info_line):
+            clause = self.GROUP_TIMES
+            AOE = True
+            hp_attacks_to_add = int(self.GROUP_TIMES_PATTERN.search(attack_info_line).group(1))
+        elif 'Group' in attack_info_line:
+            clause = self.GROUP
+            AOE = True
+            hp_attacks_to_add = 1
+        elif self.NON_TARGETS_MULTIPLIER_PATTERN.search(attack_info_line):
+            clause = self.NON_TARGETS_TIMES
+            add_to_non_target = int(self.MULTIPLIER_PATTERN.search(attack_info_line).group(1))
+        elif self.NON_TARGETS_TIMES_PATTERN.search(attack_info_line):
+            clause = self.NON_TARGETS_TIMES
+            add_to_non_target = int(self.TIMES_PATTERN.search(attack_info_line).group(1))
+        elif self.NON_TARGETS_PATTERN.search(attack_info_line):
+            clause = self.NON_TARGETS
+            add_to_non_target = 1
+        elif self.TIMES_PATTERN.search(attack_info_line):
+            clause = self.MAIN_TARGET_TIMES
+            hp_attacks_to_add = int(self.TIMES_PATTERN.search(attack_info_line).group(1))
+        else:
+            clause = self.MAIN_TARGET
+            hp_attacks_to_add = 1
+
+        return {
+            'event': 'hp_attack',
+            'clause': clause,
+            'AOE': AOE,
+            'hp_attacks_to_add': hp_attacks_to_add,
+            'add_to_non_target': add_to_non_target
+        }
+
+    def count(self, event_list):
+        """
+
+        Folds an ability's events into a (main target HP attacks, non-target HP attacks, HP Dmg Cap up %) tuple.
+
+        """
+
+        main_target_hp_attacks = 0
+        non_target_hp_attacks = 0
+        hp_dmg_cap_up_perc = 0
+
+        for event in event_list:
+            if event['event'] == 'cap_up':
+                hp_dmg_cap_up_perc += event['value']
+                continue
+
+            if event['AOE']:
+                # Group attacks hit everyone. Clauses that only describe non-target damage add nothing here.
+                main_target_hp_attacks += event['hp_attacks_to_add']
+                non_target_hp_attacks += event['hp_attacks_to_add']
+                self.trace("%s HP attacks added to both main and non-target", event['hp_attacks_to_add'])
+            elif event['clause'] in (self.NON_TARGETS_AFTER_EACH, self.NON_TARGETS_AFTER_EACH_EXCEPT_LAST):
+                non_target_hp_attacks = main_target_hp_attacks
+
+                if event['clause'] == self.NON_TARGETS_AFTER_EACH_EXCEPT_LAST:
+                    non_target_hp_attacks -= 1
+
+                self.trace("%s main target HP attacks copied to non-target", main_target_hp_attacks)
+            else:
+                main_target_hp_attacks += event['hp_attacks_to_add']
+                non_target_hp_attacks += event['add_to_non_target']
+                self.trace(
+                    "%s HP attacks for main, and %s HP attacks for non.",
+                    event['hp_attacks_to_add'], event['add_to_non_target']
+                )
+
+        return main_target_hp_attacks, non_target_hp_attacks, hp_dmg_cap_up_perc
@@ -0,0 +1,297 @@
+import asyncio
+import concurrent.futures
+from urllib.parse import urlparse
+
+
+class HostRateLimiter:
+    """
+
+    Spaces out requests to each host so that no host receives more than `requests_per_second`.
+    A rate of 0 (or None) turns the limit off.
+
+    """
+
+    def __init__(self, requests_per_second):
+        self.min_interval = 1 / requests_per_second if requests_per_second else 0
+        self.next_slot_by_host = {}
+        self.lock = asyncio.Lock()
+
+    async def wait(self, host):
+        """
+
+        Sleeps until the next request slot for the host opens up.
+
+        """
+
+        if not self.min_interval:
+            return
+
+        loop = asyncio.get_running_loop()
+
+        async with self.lock:
+            now = loop.time()
+            slot = max(now, self.next_slot_by_host.get(host, now))
+            self.next_slot_by_host[host] = slot + self.min_interval
+
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class AsyncRosterCrawler:
+    """
+
+    Fetches every character's pages on one asyncio event loop, with a cap on the number of requests in
+    flight and a per-host rate limit, and saves each page to the snapshot store.
+
+    The crawler doesn't scrape the website. Dissidia Compendium renders its pages client-side, so the pages
+    come from a snapshot server (`serve_snapshot_store` in snapshot_store.py) holding pages a Selenium run
+    already recorded. An async crawl re-reads those recorded pages, and never sees changes to the website
+    that happened after they were recorded.
+
+    Parsing never runs on the event loop. As soon as a character's GL pages are saved, the character is
+    parsed in a process pool (the same replay parse `run_character_pass` uses), while the loop carries on
+    fetching other characters. JP pages are only fetched for characters the GL parse flags as having a
+    pending rework or not being in GL yet, the same as the serial JP pass, and the same pages are fetched
+    as the Selenium backend would open (see CompendiumScraper.character_page_types).
+
+    Page URLs come from the scraper's HTTP backend, which locates each page from the character's links in
+    character_dict_omnibus.
+
+    The functions that run and merge character scrapes are passed in from web_scraper, rather than
+    imported, since importing web_scraper here would load a second copy of it (with its own globals)
+    whenever it's run as a script.
+
+    """
+
+    def __init__(
+        self,
+        cs,  # CompendiumScraper using the 'http' fetch backend, with a snapshot store configured
+        init_worker,  # web_scraper.init_worker
+        scrape_in_worker,  # web_scraper.scrape_character_in_worker
+        merge_result,  # web_scraper.merge_character_result
+        resume,  # web_scraper.resume_character
+        concurrency = 16,  # Maximum number of requests in flight at once
+        requests_per_second = 8,  # Maximum request rate for each host
+        workers = 1,  # Number of processes to parse characters with
+        retries = 3  # Number of retries for connection errors, rate limits, and server errors
+    ):
+        if cs.fetch_backend != 'http' or cs.snapshot_store is None:
+            raise ValueError(
+                "The async crawler only re-reads recorded pages from a snapshot server, so it needs the 'http' "
+                "fetch backend and a 'snapshot_dir' in the config YAML."
+            )
+
+        self.cs = cs
+        self.init_worker = init_worker
+        self.scrape_in_worker = scrape_in_worker
+        self.merge_result = merge_result
+        self.resume = resume
+        self.concurrency = concurrency
+        self.requests_per_second = requests_per_second
+        self.workers = max(workers, 1)
+        self.retries = retries
+
+        self.fetched_page_count = 0
+
+    @classmethod
+    def from_config(cls, cs, workers=1, **worker_functions):
+        """
+
+        Builds a crawler from the 'async_crawl' section of the scraper's config YAML. worker_functions are
+        passed through to the constructor.
+
+        """
+
+        crawl_config = cs.config.get('async_crawl', {})
+
+        return cls(
+            cs,
+            **worker_functions,
+            concurrency=crawl_config.get('concurrency', 16),
+            requests_per_second=crawl_config.get('requests_per_second', 8),
+            workers=workers,
+            retries=crawl_config.get('retries', 3)
+        )
+
+    def crawl(self, char_name_list=None, on_result=None):
+        """
+
+        Crawls and parses every character in char_name_list (defaults to the whole roster). Returns the
+        `scrape_character` results with every GL result first and every JP result after, each in roster
+        order. Each result is merged into the scraper, and passed to on_result if it's given (its return
+        value replaces the result), as soon as it and every result before it are ready, the same as
+        `run_character_pass`.
+
+        """
+
+        if char_name_list is None:
+            char_name_list = list(self.cs.character_dict_omnibus)
+
+        result_list = asyncio.run(self._crawl_all(char_name_list, on_result))
+
+        self.cs.logger.info(
+            "Async crawl fetched %s pages for %s characters.", self.fetched_page_count, len(char_name_list)
+        )
+
+        return result_list
+
+    async def _crawl_all(self, char_name_list, on_result):
+        """
+
+        Schedules every character's crawl on the event loop, and hands out the results in order as they
+        finish.
+
+        """
+
+        # aiohttp is only needed for async crawls, so it isn't imported with the rest of the scraper.
+        import aiohttp
+
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.rate_limiter = HostRateLimiter(self.requests_per_second)
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.cs.page_backend.timeout)
+
+        result_list = []
+
+        def hand_out(result):
+            self.merge_result(self.cs, result)
+
+            result_list.append(result if on_result is None else on_result(result))
+
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=self.init_worker,
+            initargs=(
+                self.cs.config_yml_path,
+                self.cs.character_dict_omnibus,
+                'replay',
+                self.cs.incremental,
+                self.cs.scrape_started_at_utc
+            )
+        ) as parse_executor:
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+                gl_task_dict = {
+                    char_name: asyncio.create_task(self._crawl_version(session, parse_executor, char_name))
+                    for char_name in char_name_list
+                }
+                jp_task_dict = {
+                    char_name: asyncio.create_task(
+                        self._crawl_version(session, parse_executor, char_name, gl_task=gl_task_dict[char_name])
+                    )
+                    for char_name in char_name_list
+                }
+
+                try:
+                    for char_name in char_name_list:
+                        hand_out(await gl_task_dict[char_name])
+
+                    for char_name in char_name_list:
+                        jp_result = await jp_task_dict[char_name]
+
+                        if jp_result is not None:
+                            hand_out(jp_result)
+                finally:
+                    for task in list(gl_task_dict.values()) + list(jp_task_dict.values()):
+                        task.cancel()
+
+        return result_list
+
+    async def _crawl_version(self, session, parse_executor, char_name, gl_task=None):
+        """
+
+        Fetches and parses one character's GL pages or, if gl_task (the character's GL crawl) is given, their
+        JP pages once the GL parse says they're needed. Returns the result, or None if the JP pages aren't
+        needed. When resuming, versions with a checkpoint are loaded from it instead of being fetched.
+
+        """
+
+        loop = asyncio.get_running_loop()
+
+        JP = gl_task is not None
+        gl_ha_dict = None
+
+        if JP:
+            gl_result = await asyncio.shield(gl_task)
+
+            if not (gl_result['rework_pending'] or gl_result['not_in_gl_yet']):
+                return None
+
+            gl_ha_dict = gl_result['ha_dict']
+
+        result = self.resume(self.cs, char_name, JP=JP) if self.cs.resuming else None
+
+        if result is None:
+            await self._fetch_version(session, char_name, JP, gl_ha_dict)
+
+            result = await loop.run_in_executor(parse_executor, self.scrape_in_worker, char_name, JP, gl_ha_dict)
+
+        return result
+
+    async def _fetch_version(self, session, char_name, JP=False, gl_ha_dict=None):
+        """
+
+        Fetches every page a character needs in one game version, all at once.
+
+        """
+
+        game_version = 'GL' if not JP else 'JP'
+
+        page_type_list = self.cs.character_page_types(char_name, JP=JP, gl_ha_dict=gl_ha_dict)
+
+        # Timed as one span, since the pages are fetched concurrently.
+        with self.cs.stage_timer.span('page_load', char_name, JP=JP):
+            await asyncio.gather(*(
+                self._fetch_page(session, char_name, page_type, game_version)
+                for page_type in page_type_list
+            ))
+
+    async def _fetch_page(self, session, char_name, page_type, game_version):
+        """
+
+        Fetches one page and saves it to the snapshot store. Pages the server doesn't have are skipped,
+        and rate limits, server errors, and connection errors are retried with exponential backoff.
+
+        """
+
+        import aiohttp
+
+        url = self.cs.page_backend.page_url(
+            char_name, page_type, game_version, char_links=self.cs.character_dict_omnibus.get(char_name)
+        )
+        host = urlparse(url).netloc
+
+        for attempt in range(self.retries + 1):
+            try:
+                async with self.semaphore:
+                    await self.rate_limiter.wait(host)
+
+                    async with session.get(url) as response:
+                        if response.status == 404:
+                            self.cs.logger.info("No %s %s page found for %s.", game_version, page_type, char_name.upper())
+                            return
+
+                        if response.status == 429 or response.status >= 500:
+                            raise aiohttp.ClientResponseError(
+                                response.request_info, response.history, status=response.status
+                            )
+
+                        if response.status >= 400:
+                            self.cs.logger.info("Request for %s failed with status %s.", url, response.status)
+                            return
+
+                        page_html = await response.text()
+                break
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == self.retries:
+                    self.cs.logger.info("Giving up on %s after %s attempts: %s", url, attempt + 1, e)
+                    return
+
+                await asyncio.sleep(0.5 * 2 ** attempt)
+
+        # Compressing and writing the page would block the loop, so it happens on a thread.
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.cs.snapshot_store.save, char_name, page_type, game_version, page_html
+        )
+
+        self.fetched_page_count += 1
@@ -0,0 +1,302 @@
+import json
+import time
+import logging
+import argparse
+import tracemalloc
+from web_scraper import CompendiumScraper
+
+
+class ParserBenchmark:
+    """
+
+    Times the parsing half of the scraper's three scrape methods (generate_ability_dict/generate_ability_df,
+    retrieve_hp_caps_from_bt, and retrieve_ha_hp_dmg_cap_up) against the pages recorded in the snapshot
+    store, without a browser or network.
+
+    Every run is split into phases:
+
+    1) load: reading (and decompressing) snapshots from the store
+    2) soup: parsing whole pages with BeautifulSoup (html_to_soup)
+    3) prettify: re-parsing and prettifying single blocks (prettify_html_to_list)
+    4) scan: everything else (finding elements, regex scans, and building dictionaries/dataframes)
+
+    Timings are the best of `repeat` runs. Peak memory comes from a separate tracemalloc run, since
+    tracing slows everything down.
+
+    """
+
+    PHASES = ['load', 'soup', 'prettify', 'scan']
+
+    def __init__(
+        self,
+        config_yml_path,
+        char_name_list = None,  # Characters to benchmark. Defaults to every character in the snapshot store.
+        repeat = 3,  # Number of timed runs per character
+        quiet = True  # If True, silences the scraper's logging so it isn't part of the timings
+    ):
+        self.cs = CompendiumScraper(config_yml_path, fetch_backend='replay', incremental=False)
+
+        if quiet:
+            self.cs.logger.setLevel(logging.WARNING)
+
+        self.char_name_list = char_name_list or self.cs.snapshot_store.characters()
+        self.repeat = max(repeat, 1)
+
+        self.phase_seconds = dict.fromkeys(self.PHASES, 0.0)
+        self.ability_timing_list = []
+        self.last_prettify_seconds = 0.0
+        self.current_key = None
+
+        self.instrument()
+
+    def instrument(self):
+        """
+
+        Wraps the scraper's page loading, soup, prettify, and HP attack scanning calls so their time is
+        added to the right phase.
+
+        """
+
+        cs = self.cs
+        benchmark = self
+
+        load_page = cs.load_page
+        html_to_soup = cs.html_to_soup
+        prettify_html_to_list = cs.prettify_html_to_list
+        parse_hp_attacks = cs.hp_attack_parser.parse
+
+        def timed(phase, func):
+            def wrapper(*args, **kwargs):
+                started_at = time.perf_counter()
+                output = func(*args, **kwargs)
+                seconds = time.perf_counter() - started_at
+                benchmark.phase_seconds[phase] += seconds
+                if phase == 'prettify':
+                    benchmark.last_prettify_seconds = seconds
+                return output
+            return wrapper
+
+        def timed_parse_hp_attacks(ability_name, ability_html_lines):
+            started_at = time.perf_counter()
+            output = parse_hp_attacks(ability_name, ability_html_lines)
+            scan_seconds = time.perf_counter() - started_at
+
+            if benchmark.current_key is not None:
+                benchmark.ability_timing_list.append({
+                    'char_name': benchmark.current_key[0],
+                    'game_version': benchmark.current_key[1],
+                    'ability_name': ability_name,
+                    'prettify_seconds': benchmark.last_prettify_seconds,
+                    'scan_seconds': scan_seconds
+                })
+
+            return output
+
+        cs.load_page = timed('load', load_page)
+        cs.html_to_soup = timed('soup', html_to_soup)
+        cs.prettify_html_to_list = timed('prettify', prettify_html_to_list)
+        cs.hp_attack_parser.parse = timed_parse_hp_attacks
+
+    def parse_character(self, char_name, JP=False):
+        """
+
+        Runs the parsing half of every scrape method for one character. Returns the number of abilities parsed.
+
+        """
+
+        self.cs.generate_ability_dict(char_name, JP=JP)
+        ability_df = self.cs.generate_ability_df(char_name, JP=JP)
+        self.cs.retrieve_hp_caps_from_bt(char_name, JP=JP, return_output=True)
+        self.cs.retrieve_ha_hp_dmg_cap_up(char_name, JP=JP, return_output=True)
+
+        return 0 if ability_df is None else len(ability_df)
+
+    def time_character(self, char_name, JP=False):
+        """
+
+        Returns the best-of-`repeat` timings for one character in one game version, split into phases.
+
+        """
+
+        game_version = 'GL' if not JP else 'JP'
+
+        best_run = None
+
+        for run_number in range(self.repeat):
+            # Only the first run's per-ability timings are kept, so each ability shows up once.
+            self.current_key = (char_name, game_version) if run_number == 0 else None
+            self.phase_seconds = dict.fromkeys(self.PHASES, 0.0)
+
+            started_at = time.perf_counter()
+            ability_count = self.parse_character(char_name, JP=JP)
+            total_seconds = time.perf_counter() - started_at
+
+            if best_run is None or total_seconds < best_run['total_seconds']:
+                phase_seconds = dict(self.phase_seconds)
+                phase_seconds['scan'] = total_seconds - phase_seconds['load'] - phase_seconds['soup'] - phase_seconds['prettify']
+
+                best_run = {
+                    'total_seconds': total_seconds,
+                    'ability_count': ability_count,
+                    'phase_seconds': phase_seconds
+                }
+
+        self.current_key = None
+
+        return best_run
+
+    def peak_memory(self, char_name, JP=False):
+        """
+
+        Returns the peak memory allocated (in bytes) while parsing one character in one game version.
+
+        """
+
+        tracemalloc.start()
+
+        try:
+            self.parse_character(char_name, JP=JP)
+            _, peak_bytes = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return peak_bytes
+
+    def run(self):
+        """
+
+        Benchmarks every character (in JP too, if the store has their JP ability page) and returns the results
+        as a dictionary that can be saved as JSON.
+
+        """
+
+        store = self.cs.snapshot_store
+
+        character_results = {}
+        page_hashes = {}
+
+        for char_name in self.char_name_list:
+            for game_version in ['GL', 'JP']:
+                if not store.has_snapshot(char_name, 'abilities', game_version):
+                    continue
+
+                JP = game_version == 'JP'
+                key = f"{char_name}/{game_version}"
+
+                character_result = self.time_character(char_name, JP=JP)
+                character_result['peak_memory_bytes'] = self.peak_memory(char_name, JP=JP)
+                character_results[key] = character_result
+
+                page_hashes[key] = {
+                    page_type: store.latest_hash(char_name, page_type, game_version)
+                    for page_type in ['abilities'] + self.cs.bt_page_types(char_name) + ['high_armor', 'high_armor_plus']
+                }
+
+        total_seconds = sum(result['total_seconds'] for result in character_results.values())
+        ability_count = sum(result['ability_count'] for result in character_results.values())
+
+        return {
+            'created_at_utc': time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime()),
+            'snapshot_dir': store.snapshot_dir,
+            'repeat': self.repeat,
+            'page_hashes': page_hashes,
+            'totals': {
+                'characters': len(character_results),
+                'abilities': ability_count,
+                'total_seconds': total_seconds,
+                'abilities_per_second': ability_count / total_seconds if total_seconds else 0,
+                'phase_seconds': {
+                    phase: sum(result['phase_seconds'][phase] for result in character_results.values())
+                    for phase in self.PHASES
+                },
+                'peak_memory_bytes': max((result['peak_memory_bytes'] for result in character_results.values()), default=0)
+            },
+            'characters': character_results,
+            'abilities': self.ability_timing_list
+        }
+
+
+def compare_to_baseline(results, baseline):
+    """
+
+    Returns a report (as a list of lines) of how a benchmark's totals and per-character timings changed from a
+    baseline. Characters whose snapshots changed since the baseline are flagged, since their timings aren't comparable.
+
+    """
+
+    def percent_change(new, old):
+        return f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+
+    report_line_list = []
+
+    new_totals = results['totals']
+    old_totals = baseline['totals']
+
+    for metric in ['total_seconds', 'abilities_per_second', 'peak_memory_bytes']:
+        report_line_list.append(
+            f"{metric}: {old_totals[metric]:.4g} -> {new_totals[metric]:.4g} ({percent_change(new_totals[metric], old_totals[metric])})"
+        )
+
+    for phase in ParserBenchmark.PHASES:
+        new_seconds = new_totals['phase_seconds'][phase]
+        old_seconds = old_totals['phase_seconds'][phase]
+        report_line_list.append(f"{phase}_seconds: {old_seconds:.4g} -> {new_seconds:.4g} ({percent_change(new_seconds, old_seconds)})")
+
+    for key, character_result in results['characters'].items():
+        baseline_result = baseline['characters'].get(key)
+
+        if baseline_result is None:
+            continue
+
+        note = "" if results['page_hashes'].get(key) == baseline['page_hashes'].get(key) else " (snapshots changed)"
+
+        report_line_list.append(
+            f"{key}: {baseline_result['total_seconds'] * 1000:.1f}ms -> {character_result['total_seconds'] * 1000:.1f}ms "
+            f"({percent_change(character_result['total_seconds'], baseline_result['total_seconds'])}){note}"
+        )
+
+    return report_line_list
+
+
+def main():
+    """
+
+    Runs the parser benchmark from the command line.
+
+    """
+
+    arg_parser = argparse.ArgumentParser(description="Benchmark the scraper's parsers against the snapshot store.")
+    arg_parser.add_argument('config_yml_path', help="Path to the scraper's config YAML (its snapshot_dir is the corpus).")
+    arg_parser.add_argument('--characters', nargs='+', help="Characters to benchmark. Defaults to every character in the snapshot store.")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="Number of timed runs per character. The best run is kept.")
+    arg_parser.add_argument('--output', help="Path to save the results to, as JSON.")
+    arg_parser.add_argument('--baseline', help="Path of earlier saved results to compare against.")
+    args = arg_parser.parse_args()
+
+    results = ParserBenchmark(args.config_yml_path, char_name_list=args.characters, repeat=args.repeat).run()
+
+    totals = results['totals']
+
+    print(f"Parsed {totals['abilities']} abilities for {totals['characters']} character versions in {totals['total_seconds']:.3f}s "
+          f"({totals['abilities_per_second']:.1f} abilities/sec, peak memory {totals['peak_memory_bytes'] / 1024 / 1024:.1f} MiB).")
+
+    for phase, seconds in totals['phase_seconds'].items():
+        share = seconds / totals['total_seconds'] * 100 if totals['total_seconds'] else 0
+        print(f"  {phase}: {seconds:.3f}s ({share:.0f}%)")
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as baseline_file:
+            baseline = json.load(baseline_file)
+
+        print(f"Compared to baseline from {baseline['created_at_utc']}:")
+
+        for report_line in compare_to_baseline(results, baseline):
+            print(f"  {report_line}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,281 @@
+import os
+import time
+import atexit
+import statistics
+import concurrent.futures
+from selenium.common.exceptions import (
+    WebDriverException, NoSuchElementException, StaleElementReferenceException
+)
+
+
+def process_tree_rss_mb(pid):
+    """
+
+    Returns the resident memory, in MB, of a process and all of its descendants (chromedriver and every
+    Chrome process it started), or None if it can't be measured on this platform. Uses psutil if it's
+    installed, and /proc otherwise.
+
+    """
+
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        try:
+            process = psutil.Process(pid)
+            return sum(
+                member.memory_info().rss for member in [process] + process.children(recursive=True)
+            ) / 2 ** 20
+        except psutil.Error:
+            return None
+
+    if not os.path.isdir('/proc'):
+        return None
+
+    child_pid_dict = {}
+
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as stat_file:
+                # The command name can contain spaces, so the fields are read from after its closing parenthesis.
+                parent_pid = int(stat_file.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+
+        child_pid_dict.setdefault(parent_pid, []).append(int(entry))
+
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    rss_bytes = 0
+    pid_list = [pid]
+
+    while pid_list:
+        member_pid = pid_list.pop()
+        pid_list += child_pid_dict.get(member_pid, [])
+
+        try:
+            with open(f'/proc/{member_pid}/statm', 'r') as statm_file:
+                rss_bytes += int(statm_file.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+
+    return rss_bytes / 2 ** 20
+
+
+class BrowserPool:
+    """
+
+    Owns the scraper's Chrome instance and replaces it when it stops being healthy, instead of restarting
+    it after a fixed number of characters. Health is measured three ways:
+
+    1) Memory: the resident memory of chromedriver and every Chrome process under it
+    2) Latency drift: the median of the last few page loads, compared with the median of the first few
+       page loads after the browser started
+    3) Errors: WebDriver commands that failed for reasons other than a missing or stale element
+
+    Once any of them passes `prewarm_fraction` of its limit, a replacement browser is started in the
+    background, so switching to it doesn't stall the scrape. Replaced browsers are shut down with
+    driver.quit(), which also stops chromedriver, in the background as well.
+
+    Limits are set under 'browser_pool' in the config YAML (max_rss_mb, max_latency_drift, max_errors,
+    prewarm_fraction, latency_window, retries).
+
+    """
+
+    # Errors that are part of normal scraping (probing for elements that may not exist).
+    EXPECTED_ERRORS = (NoSuchElementException, StaleElementReferenceException)
+
+    def __init__(
+        self,
+        start_driver,  # Callable that starts and returns a new WebDriver
+        logger,
+        max_rss_mb = 2000,  # Memory limit for chromedriver and its Chrome processes
+        max_latency_drift = 2.5,  # Limit on recent page load latency, as a multiple of the browser's first page loads
+        max_errors = 5,  # Limit on unexpected WebDriver errors
+        prewarm_fraction = 0.8,  # Fraction of any limit at which a replacement starts warming up
+        latency_window = 10,  # Page loads in the baseline and in the recent window
+        retries = 1  # Times a character is scraped again on a fresh browser after a WebDriver error
+    ):
+        self.start_driver = start_driver
+        self.logger = logger
+        self.max_rss_mb = max_rss_mb
+        self.max_latency_drift = max_latency_drift
+        self.max_errors = max_errors
+        self.prewarm_fraction = prewarm_fraction
+        self.latency_window = latency_window
+        self.retries = retries
+
+        # One thread starts replacements, the other quits old browsers.
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        self.spare_future = None
+
+        self.recycle_count = 0
+        self.driver = self.watch(self.start_driver())
+
+        atexit.register(self.close)
+
+    def watch(self, driver):
+        """
+
+        Resets the health measurements for a newly started driver, and counts its unexpected errors.
+
+        """
+
+        self.error_count = 0
+        self.latency_list = []
+
+        execute = driver.execute
+
+        def watched_execute(driver_command, params=None):
+            try:
+                return execute(driver_command, params)
+            except self.EXPECTED_ERRORS:
+                raise
+            except WebDriverException:
+                self.error_count += 1
+                raise
+
+        driver.execute = watched_execute
+
+        return driver
+
+    def record_page_load(self, seconds):
+        """
+
+        Records how long a page load took on the current browser.
+
+        """
+
+        self.latency_list.append(seconds)
+
+    def rss_mb(self):
+        """
+
+        Returns the current browser's resident memory in MB, or None if it can't be measured.
+
+        """
+
+        try:
+            return process_tree_rss_mb(self.driver.service.process.pid)
+        except AttributeError:
+            return None
+
+    def latency_drift(self):
+        """
+
+        Returns the median of the recent page loads divided by the median of the browser's first page loads,
+        or None until there are enough page loads to compare.
+
+        """
+
+        if len(self.latency_list) < 2 * self.latency_window:
+            return None
+
+        baseline = statistics.median(self.latency_list[:self.latency_window])
+        recent = statistics.median(self.latency_list[-self.latency_window:])
+
+        return recent / baseline if baseline > 0 else None
+
+    def health(self):
+        """
+
+        Returns the current browser's health measurements, each as a fraction of its limit.
+
+        """
+
+        rss_mb = self.rss_mb()
+        latency_drift = self.latency_drift()
+
+        return {
+            'rss_mb': 0 if rss_mb is None else rss_mb / self.max_rss_mb,
+            'latency_drift': 0 if latency_drift is None else latency_drift / self.max_latency_drift,
+            'errors': self.error_count / self.max_errors
+        }
+
+    def check(self):
+        """
+
+        Replaces the browser if it's unhealthy, and starts warming up a replacement if it's getting close.
+        Returns the driver to use next.
+
+        """
+
+        health = self.health()
+
+        problem_list = [f"{name} at {fraction:.0%} of its limit" for name, fraction in health.items() if fraction >= 1]
+
+        if problem_list:
+            return self.recycle(', '.join(problem_list))
+
+        if self.spare_future is None and max(health.values()) >= self.prewarm_fraction:
+            self.logger.info("Browser health is close to its limits (%s). Warming up a replacement.", health)
+            self.spare_future = self.executor.submit(self.start_driver)
+
+        return self.driver
+
+    def recycle(self, reason):
+        """
+
+        Switches to a fresh browser (the warmed-up one, if there is one) and quits the old one in the
+        background. Returns the new driver.
+
+        """
+
+        started_at = time.perf_counter()
+
+        if self.spare_future is not None:
+            new_driver = self.spare_future.result()
+            self.spare_future = None
+        else:
+            new_driver = self.start_driver()
+
+        old_driver = self.driver
+        self.driver = self.watch(new_driver)
+        self.recycle_count += 1
+
+        self.executor.submit(self.quit_driver, old_driver)
+
+        self.logger.info(
+            "Replaced the browser (%s). The switch took %.2fs.", reason, time.perf_counter() - started_at
+        )
+
+        return self.driver
+
+    @staticmethod
+    def quit_driver(driver):
+        """
+
+        Shuts a browser down completely (Chrome and chromedriver). Errors are ignored, since a crashed browser
+        may already be gone.
+
+        """
+
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        """
+
+        Quits the current browser and any warmed-up replacement.
+
+        """
+
+        if self.spare_future is not None:
+            try:
+                self.quit_driver(self.spare_future.result())
+            except Exception:
+                pass
+
+            self.spare_future = None
+
+        if self.driver is not None:
+            self.quit_driver(self.driver)
+            self.driver = None
+
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,105 @@
+import os
+import json
+import glob
+
+
+class CheckpointStore:
+    """
+
+    Keeps track of which characters a scrape run has finished, so an interrupted run can pick up where it
+    left off instead of starting over.
+
+    A character's checkpoint is written once all of their dataframes for a game version are saved.
+    It holds the same fields as a scrape manifest entry (page_hashes, rework_pending, not_in_gl_yet,
+    outputs, and scraped_at_utc), which is everything needed to rebuild the character's result from the
+    intermediate store. RUN holds the start time of the run the checkpoints belong to.
+
+    Layout on disk:
+
+        <checkpoint_dir>/RUN
+        <checkpoint_dir>/<char_name>_<game_version>.json
+
+    Every file is written to a temporary path first and then moved into place, so a checkpoint is either
+    missing or complete.
+
+    """
+
+    RUN_FILE_NAME = 'RUN'
+    CHECKPOINT_SUFFIX = '.json'
+
+    def __init__(self, checkpoint_dir):
+        self.checkpoint_dir = checkpoint_dir
+
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+
+    def checkpoint_path(self, char_name, game_version):
+        """
+
+        Returns the path of a character's checkpoint in a game version.
+
+        """
+
+        return os.path.join(self.checkpoint_dir, f"{char_name}_{game_version.lower()}{self.CHECKPOINT_SUFFIX}")
+
+    def start_run(self, scrape_started_at_utc):
+        """
+
+        Clears every checkpoint left over from an earlier run and marks the start of a new one.
+
+        """
+
+        for checkpoint_path in glob.glob(os.path.join(self.checkpoint_dir, '*' + self.CHECKPOINT_SUFFIX)):
+            os.remove(checkpoint_path)
+
+        atomic_write_text(os.path.join(self.checkpoint_dir, self.RUN_FILE_NAME), scrape_started_at_utc)
+
+    def resume_run(self):
+        """
+
+        Returns the start time of the run the checkpoints belong to, or None if no run has been started.
+
+        """
+
+        try:
+            with open(os.path.join(self.checkpoint_dir, self.RUN_FILE_NAME), 'r') as run_file:
+                return run_file.read().strip()
+        except FileNotFoundError:
+            return None
+
+    def save(self, char_name, game_version, checkpoint):
+        """
+
+        Marks a character as finished in a game version.
+
+        """
+
+        atomic_write_text(self.checkpoint_path(char_name, game_version), json.dumps(checkpoint, indent=2, sort_keys=True))
+
+    def load(self, char_name, game_version):
+        """
+
+        Returns a character's checkpoint in a game version, or None if they haven't been finished.
+
+        """
+
+        try:
+            with open(self.checkpoint_path(char_name, game_version), 'r') as checkpoint_file:
+                return json.load(checkpoint_file)
+        except FileNotFoundError:
+            return None
+
+
+def atomic_write_text(path, text):
+    """
+
+    Writes text to a temporary file next to `path`, then moves it into place.
+
+    """
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+
+    with open(temp_path, 'w') as temp_file:
+        temp_file.write(text)
+
+    os.replace(temp_path, path)
+
@@ -0,0 +1,205 @@
+import requests
+from urllib.parse import urlsplit, parse_qsl, urlencode
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class HttpFetchBackend:
+    """
+
+    Fetches already rendered character pages from a snapshot server over plain HTTP (e.g., one started
+    with `serve_snapshot_store` in snapshot_store.py on a machine that ran the Selenium backend), so other
+    machines can parse them without Chrome. Every request goes through one pooled `requests.Session`, with retries for
+    connection errors, rate limits, and server errors.
+
+    This doesn't scrape Dissidia Compendium itself: its pages are rendered in the browser by the site's
+    scripts, and the parsers need the rendered markup (including the slider states of the buffs page), so
+    a base_url on the real website is refused.
+
+    By default, a character's pages are located from their links in character_dict_omnibus (the same
+    pages the Selenium backend opens): each link's path and query are moved onto base_url, with the game
+    version and snapshot page type added to the query (see link_url). Pages can also be located with URL
+    templates, one per page type, which are filled in with base_url, char_name, game_version, page_type,
+    and the character's links (e.g., '{abilities_url}'). Pages without a link or a template (e.g., the
+    character list page) use DEFAULT_URL_TEMPLATE. `serve_snapshot_store` serves both layouts.
+
+    Pages the server doesn't have (404) are returned as None, the same as a page the browser can't
+    find. Any other failure, once retries run out, is also returned as None, and is recorded in
+    `failure_log` so it can be reported with the character's results.
+
+    """
+
+    DEFAULT_URL_TEMPLATE = '{base_url}/{char_name}/{game_version}/{page_type}'
+
+    # Hosts whose pages are rendered client-side, and so can't be fetched with this backend.
+    CLIENT_RENDERED_HOSTS = ['dissidiacompendium.com', 'www.dissidiacompendium.com']
+
+    # Statuses worth retrying: timeouts, rate limits, and server errors.
+    RETRY_STATUSES = [408, 425, 429, 500, 502, 503, 504]
+
+    def __init__(
+        self,
+        base_url,  # Root URL of the server to fetch from
+        logger,
+        url_templates = None,  # Dictionary of page type -> URL template. Page types not listed use DEFAULT_URL_TEMPLATE.
+        pool_size = 10,  # Number of connections to keep open to the server
+        timeout = 30,  # Seconds before a request is abandoned
+        retries = 3  # Number of retries for connection errors, rate limits, and server errors
+    ):
+        if urlsplit(base_url).hostname in self.CLIENT_RENDERED_HOSTS:
+            raise ValueError(
+                f"{base_url} renders its pages in the browser. Point the HTTP backend at a snapshot server instead."
+            )
+
+        self.base_url = base_url.rstrip('/')
+        self.logger = logger
+        self.url_templates = url_templates or {}
+        self.timeout = timeout
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.5,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=['GET']
+        )
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.failure_log = []
+
+    @classmethod
+    def from_config(cls, config, logger):
+        """
+
+        Builds a backend from the 'http_backend' section of the scraper's config YAML.
+
+        """
+
+        http_config = config.get('http_backend', {})
+
+        return cls(
+            base_url=http_config.get('base_url', 'http://localhost:8000'),
+            logger=logger,
+            url_templates=http_config.get('url_templates'),
+            pool_size=http_config.get('pool_size', 10),
+            timeout=http_config.get('timeout', 30),
+            retries=http_config.get('retries', 3)
+        )
+
+    def page_url(self, char_name, page_type, game_version, char_links=None):
+        """
+
+        Returns the URL for a character's page in a game version. If the character's entry from
+        character_dict_omnibus is passed in as char_links, the page is located from its link, and
+        templates can also use its links (e.g., '{abilities_url}').
+
+        """
+
+        if page_type not in self.url_templates:
+            link_url = self.link_url(page_type, game_version, char_links)
+
+            if link_url is not None:
+                return link_url
+
+        url_template = self.url_templates.get(page_type, self.DEFAULT_URL_TEMPLATE)
+
+        return url_template.format(
+            base_url=self.base_url,
+            char_name=char_name,
+            game_version=game_version,
+            page_type=page_type,
+            **(char_links or {})
+        )
+
+    def link_url(self, page_type, game_version, char_links):
+        """
+
+        Returns the character's link for a page type, moved onto base_url, with game_version and page_type
+        added to its query. Variations of a page type (e.g., 'buffs_enemies_1') use the link of the page type
+        they start with. Returns None if there's no link for the page type.
+
+        """
+
+        link_page_type_list = sorted(
+            (link_name[:-len('_url')] for link_name in (char_links or {}) if link_name.endswith('_url')),
+            key=len,
+            reverse=True
+        )
+
+        for link_page_type in link_page_type_list:
+            if page_type.startswith(link_page_type):
+                link = urlsplit(char_links[f'{link_page_type}_url'])
+
+                query = urlencode(
+                    parse_qsl(link.query, keep_blank_values=True) + [('version', game_version), ('page_type', page_type)]
+                )
+
+                return f"{self.base_url}{link.path}?{query}"
+
+        return None
+
+    def get_page(self, char_name, page_type, game_version, char_links=None):
+        """
+
+        Returns a page's HTML, or None if the server doesn't have it or the request failed. Failures
+        other than a missing page are added to the failure log.
+
+        """
+
+        url = self.page_url(char_name, page_type, game_version, char_links)
+
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+
+            if response.status_code == 404:
+                return None
+
+            response.raise_for_status()
+        except requests.RequestException as e:
+            self.record_failure(char_name, page_type, game_version, url, e)
+            return None
+
+        return response.text
+
+    def record_failure(self, char_name, page_type, game_version, url, error):
+        """
+
+        Logs a page that couldn't be fetched, and adds it to the failure log.
+
+        """
+
+        self.logger.info("Couldn't fetch %s %s page for %s from %s: %s", game_version, page_type, char_name.upper(), url, error)
+
+        self.failure_log.append({
+            'char_name': char_name,
+            'page_type': page_type,
+            'game_version': game_version,
+            'url': url,
+            'error': type(error).__name__
+        })
+
+    def take_failures(self, start_index):
+        """
+
+        Removes and returns every failure recorded since start_index.
+
+        """
+
+        failure_list = self.failure_log[start_index:]
+
+        del self.failure_log[start_index:]
+
+        return failure_list
+
+    def close(self):
+        """
+
+        Closes every pooled connection.
+
+        """
+
+        self.session.close()
@@ -0,0 +1,197 @@
+import os
+import json
+import sqlite3
+import argparse
+import pandas as pd
+
+
+class IntermediateStore:
+    """
+
+    Keeps every character's intermediate dataframes (the ability_df, bt_effect_df, and ha_cap_df that
+    scrape_character produces) in one SQLite file, instead of hundreds of small CSVs in the temp directories.
+
+    Every row is keyed by scrape run (scrape_started_at_utc), character, game version, dataset, and its
+    position in the dataframe, and holds the row itself as JSON, so list columns (attribute_list,
+    enemy_count_apply_list) come back as lists without any re-parsing. Indexes cover lookups by character
+    and by run, so loading one character or a whole run's dataset is a single indexed read.
+
+    Saving a character replaces whatever was stored for them in that game version (from any run), the same
+    way the temp CSVs were overwritten. The rows of characters carried forward by an incremental run stay
+    under the run that originally parsed them.
+
+    The file is opened in WAL mode, so worker processes can save characters while others read.
+
+    """
+
+    DATASETS = ['ability_df', 'bt_effect_df', 'ha_cap_df']
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self.conn = sqlite3.connect(db_path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS intermediate_rows ("
+                "scrape_started_at_utc TEXT NOT NULL, "
+                "char_name TEXT NOT NULL, "
+                "game_version TEXT NOT NULL, "
+                "dataset TEXT NOT NULL, "
+                "row_order INTEGER NOT NULL, "
+                "row_json TEXT NOT NULL, "
+                "PRIMARY KEY (char_name, game_version, dataset, scrape_started_at_utc, row_order))"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS intermediate_rows_by_run "
+                "ON intermediate_rows (scrape_started_at_utc, dataset, char_name, game_version, row_order)"
+            )
+
+    def save(
+        self,
+        char_name,
+        game_version,
+        scrape_started_at_utc,
+        df_dict  # Dataset name -> dataframe, or None if the scrape didn't produce it
+    ):
+        """
+
+        Replaces a character's stored dataframes in a game version, in one transaction.
+
+        """
+
+        row_list = []
+
+        for dataset, df in df_dict.items():
+            if df is None:
+                continue
+
+            # to_json turns numpy types and NaN into plain JSON, one line per row.
+            for row_order, row_json in enumerate(df.to_json(orient='records', lines=True).splitlines()):
+                row_list.append((scrape_started_at_utc, char_name, game_version, dataset, row_order, row_json))
+
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM intermediate_rows WHERE char_name = ? AND game_version = ?", (char_name, game_version)
+            )
+            self.conn.executemany("INSERT INTO intermediate_rows VALUES (?, ?, ?, ?, ?, ?)", row_list)
+
+    @staticmethod
+    def to_df(row_json_list):
+        """
+
+        Rebuilds a dataframe from its stored rows, with the columns in their original order.
+
+        """
+
+        return pd.DataFrame([json.loads(row_json) for row_json in row_json_list])
+
+    def load(self, char_name, game_version, scrape_started_at_utc):
+        """
+
+        Returns a dictionary of dataset name -> dataframe for a character saved by one run. Datasets that weren't
+        saved are left out.
+
+        """
+
+        cursor = self.conn.execute(
+            "SELECT dataset, row_json FROM intermediate_rows "
+            "WHERE char_name = ? AND game_version = ? AND scrape_started_at_utc = ? "
+            "ORDER BY dataset, row_order",
+            (char_name, game_version, scrape_started_at_utc)
+        )
+
+        row_json_dict = {}
+
+        for dataset, row_json in cursor:
+            row_json_dict.setdefault(dataset, []).append(row_json)
+
+        return {dataset: self.to_df(row_json_list) for dataset, row_json_list in row_json_dict.items()}
+
+    def load_dataset(
+        self,
+        dataset,  # 'ability_df', 'bt_effect_df', or 'ha_cap_df'
+        scrape_started_at_utc = None  # Run to load. Defaults to everything stored (the latest rows of every character).
+    ):
+        """
+
+        Returns one dataset for every stored character as a single dataframe, or None if nothing is stored.
+
+        """
+
+        if scrape_started_at_utc is None:
+            cursor = self.conn.execute(
+                "SELECT row_json FROM intermediate_rows WHERE dataset = ? "
+                "ORDER BY scrape_started_at_utc, char_name, game_version, row_order",
+                (dataset,)
+            )
+        else:
+            cursor = self.conn.execute(
+                "SELECT row_json FROM intermediate_rows WHERE scrape_started_at_utc = ? AND dataset = ? "
+                "ORDER BY char_name, game_version, row_order",
+                (scrape_started_at_utc, dataset)
+            )
+
+        row_json_list = [row_json for (row_json,) in cursor]
+
+        return self.to_df(row_json_list) if row_json_list else None
+
+    def runs(self):
+        """
+
+        Returns a dataframe with the number of characters and rows stored for every run and dataset.
+
+        """
+
+        return pd.read_sql_query(
+            "SELECT scrape_started_at_utc, dataset, "
+            "COUNT(DISTINCT char_name || '/' || game_version) AS characters, COUNT(*) AS row_count "
+            "FROM intermediate_rows GROUP BY scrape_started_at_utc, dataset ORDER BY scrape_started_at_utc, dataset",
+            self.conn
+        )
+
+    def close(self):
+        """
+
+        Closes the store's connection.
+
+        """
+
+        self.conn.close()
+
+
+def main():
+    """
+
+    Lists what's in an intermediate store, or exports one dataset from it, from the command line.
+
+    """
+
+    arg_parser = argparse.ArgumentParser(description="Inspect or export the scraper's intermediate results.")
+    arg_parser.add_argument('db_path', help="Path to the intermediate store's SQLite file.")
+    arg_parser.add_argument('--dataset', choices=IntermediateStore.DATASETS, help="Dataset to export. Without it, every run is listed.")
+    arg_parser.add_argument('--run', help="scrape_started_at_utc of the run to export. Defaults to the latest rows of every character.")
+    arg_parser.add_argument('--output', help="CSV path to export to. Defaults to printing the rows.")
+    args = arg_parser.parse_args()
+
+    store = IntermediateStore(args.db_path)
+
+    if args.dataset is None:
+        print(store.runs().to_string(index=False))
+        return
+
+    df = store.load_dataset(args.dataset, scrape_started_at_utc=args.run)
+
+    if df is None:
+        print(f"No {args.dataset} rows stored.")
+    elif args.output:
+        df.to_csv(args.output, index=False)
+    else:
+        print(df.to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
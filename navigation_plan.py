@@ -0,0 +1,117 @@
+class NavigationPlanner:
+    """
+
+    Keeps the browser from loading the same character page twice across the GL and JP passes.
+
+    1) A character whose GL ability page shows a pending rework, or no abilities (they aren't in GL yet),
+       will be scraped again in the JP pass. While the GL pass has their abilities and buffs pages open,
+       each page is switched to JP in place, captured, and switched back. A character without a GL high
+       armor also gets a JP pass, so their high armor page gets the same treatment.
+    2) High armor doesn't change between versions, so once it's been parsed in GL, the JP pass doesn't
+       visit the high armor pages at all (see VERSION_INVARIANT_PAGE_TYPES).
+
+    Pages captured in place are held here until the character's JP scrape takes them (see take_pages).
+    Held pages are sent back from worker processes with their results, so they reach whichever worker
+    runs the JP pass.
+
+    Every page load is counted, along with the loads each rule saved, for the run report.
+
+    """
+
+    VERSION_INVARIANT_PAGE_TYPES = ['high_armor', 'high_armor_plus']
+
+    def __init__(
+        self,
+        logger,
+        enabled = True  # If False, nothing is captured in place (version-invariant pages are still skipped)
+    ):
+        self.logger = logger
+        self.enabled = enabled
+
+        self.jp_char_name_set = set()
+        self.held_page_dict = {}
+
+        self.page_load_count = 0
+        self.saved_load_count = 0
+
+    def plan_jp_in_place(self, char_name, reason):
+        """
+
+        Marks a character as needing a JP pass, so the rest of their GL pages are also captured in JP.
+
+        """
+
+        if self.enabled and char_name not in self.jp_char_name_set:
+            self.jp_char_name_set.add(char_name)
+            self.logger.info("%s needs a JP pass (%s). Capturing JP pages in place.", char_name.upper(), reason)
+
+    def captures_jp_in_place(self, char_name):
+        """
+
+        Returns True if a character's GL pages should also be captured in JP.
+
+        """
+
+        return self.enabled and char_name in self.jp_char_name_set
+
+    def record_load(self):
+        """
+
+        Counts one page load.
+
+        """
+
+        self.page_load_count += 1
+
+    def record_saved(self, char_name, saved_loads, reason):
+        """
+
+        Counts page loads that were saved.
+
+        """
+
+        self.saved_load_count += saved_loads
+
+        self.logger.info("Saved %s page loads for %s (%s).", saved_loads, char_name.upper(), reason)
+
+    def hold_pages(
+        self,
+        char_name,
+        page_dict,  # Page type -> JP page HTML (or None if the page had nothing to capture)
+        saved_loads = 1  # Page loads the JP pass would have needed for these pages
+    ):
+        """
+
+        Holds JP pages captured during the GL pass for the character's JP scrape.
+
+        """
+
+        for page_type, page_html in page_dict.items():
+            self.held_page_dict[(char_name, page_type, 'JP')] = page_html
+
+        if saved_loads:
+            self.record_saved(char_name, saved_loads, f"captured {', '.join(page_dict)} in JP in place")
+
+    def take_pages(self, char_name, game_version):
+        """
+
+        Removes and returns a character's held pages in a game version, keyed the same way as the scraper's
+        page cache.
+
+        """
+
+        key_list = [
+            key for key in self.held_page_dict
+            if key[0] == char_name and key[2] == game_version
+        ]
+
+        return {key: self.held_page_dict.pop(key) for key in key_list}
+
+    def add_held_pages(self, held_page_dict):
+        """
+
+        Adds pages held by another scraper (e.g., sent back from a worker process).
+
+        """
+
+        self.held_page_dict.update(held_page_dict)
@@ -0,0 +1,309 @@
+import os
+import ast
+import glob
+import shutil
+import argparse
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+
+class ParquetOutput:
+    """
+
+    Saves the raw tables as Parquet datasets, partitioned by game version and scrape run, with typed
+    columns instead of the CSVs' strings:
+
+    1) attribute_list and enemy_count_apply_list are native list columns
+    2) HP attack counts and HP Dmg Cap up percentages are small integers, and ability_id is an integer
+    3) char_name is dictionary-encoded
+    4) scrape_started_at_utc and scrape_ended_at_utc are timestamps
+
+    Every table is its own directory, laid out as <table>/game_version=GL/scrape_run=20230909T115619/,
+    so readers can skip the partitions and columns they don't need (see read()). Writing a run replaces
+    any files the same run wrote before (e.g., before it was resumed).
+
+    Runs written a batch at a time (see StreamingRunLoader) are kept under <table>/_pending/ until the
+    run is finished, since their scrape_ended_at_utc isn't known until then.
+
+    """
+
+    PARTITION_COLUMNS = ['game_version', 'scrape_run']
+    PENDING_DIR_NAME = '_pending'
+
+    TABLE_SCHEMAS = {
+        'raw_abilities': pa.schema([
+            ('char_name', pa.dictionary(pa.int16(), pa.string())),
+            ('ability_name', pa.string()),
+            ('ability_id', pa.int32()),
+            ('main_target_hp_attacks', pa.int8()),
+            ('non_target_hp_attacks', pa.int8()),
+            ('hp_dmg_cap_up_perc', pa.int16()),
+            ('attribute_list', pa.list_(pa.string())),
+            ('game_version', pa.string()),
+            ('scrape_started_at_utc', pa.timestamp('s')),
+            ('scrape_ended_at_utc', pa.timestamp('s'))
+        ]),
+        'raw_bt_effects': pa.schema([
+            ('char_name', pa.dictionary(pa.int16(), pa.string())),
+            ('bt_personal_hp_dmg_cap_up', pa.int16()),
+            ('bt_party_hp_dmg_cap_up', pa.int16()),
+            ('enemy_count_apply_list', pa.list_(pa.int8())),
+            ('game_version', pa.string()),
+            ('scrape_started_at_utc', pa.timestamp('s')),
+            ('scrape_ended_at_utc', pa.timestamp('s'))
+        ]),
+        'raw_high_armor_caps': pa.schema([
+            ('char_name', pa.dictionary(pa.int16(), pa.string())),
+            ('personal_hp_dmg_cap_up', pa.int16()),
+            ('party_ha_hp_dmg_cap_up', pa.int16()),
+            ('game_version', pa.string()),
+            ('scrape_started_at_utc', pa.timestamp('s')),
+            ('scrape_ended_at_utc', pa.timestamp('s'))
+        ])
+    }
+
+    LIST_COLUMNS = ['attribute_list', 'enemy_count_apply_list']
+    TIMESTAMP_COLUMNS = ['scrape_started_at_utc', 'scrape_ended_at_utc']
+    INTEGER_DTYPES = {pa.int8(): pd.Int8Dtype(), pa.int16(): pd.Int16Dtype(), pa.int32(): pd.Int32Dtype()}
+
+    def __init__(self, parquet_dir):
+        self.parquet_dir = parquet_dir
+
+        os.makedirs(parquet_dir, exist_ok=True)
+
+    @staticmethod
+    def scrape_run(scrape_started_at_utc):
+        """
+
+        Returns the scrape_run partition value for a run's start time (e.g., '2023-09-09 11:56:19' -> '20230909T115619').
+
+        """
+
+        return pd.Timestamp(scrape_started_at_utc).strftime('%Y%m%dT%H%M%S')
+
+    def table_dir(self, table_name):
+        """
+
+        Returns the directory a table's dataset is saved to.
+
+        """
+
+        return os.path.join(self.parquet_dir, table_name)
+
+    def pending_dir(self, table_name, scrape_started_at_utc):
+        """
+
+        Returns the directory an unfinished run's batches are saved to.
+
+        """
+
+        return os.path.join(self.table_dir(table_name), self.PENDING_DIR_NAME, self.scrape_run(scrape_started_at_utc))
+
+    def partitioning(self):
+        """
+
+        Returns the hive-style partitioning every table is saved with.
+
+        """
+
+        return ds.partitioning(pa.schema([(column, pa.string()) for column in self.PARTITION_COLUMNS]), flavor='hive')
+
+    def arrow_schema(self, table_name):
+        """
+
+        Returns a table's schema, plus its scrape_run partition column.
+
+        """
+
+        return self.TABLE_SCHEMAS[table_name].append(pa.field('scrape_run', pa.string()))
+
+    def to_arrow(self, table_name, df):
+        """
+
+        Converts one of the scraper's dataframes to an Arrow table with the table's schema. Lists saved as
+        strings (e.g., in dataframes read back from CSV) are parsed back into lists, and single values (Lann &
+        Reynn's BT effect rows each apply to one enemy count) are wrapped in one.
+
+        """
+
+        df = df.copy()
+
+        def to_list(value):
+            if isinstance(value, str):
+                value = ast.literal_eval(value)
+
+            return value if isinstance(value, (list, tuple)) or value is None else [value]
+
+        for column in self.LIST_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].apply(to_list)
+
+        if 'ability_id' in df.columns:
+            df['ability_id'] = pd.to_numeric(df['ability_id']).astype('Int32')
+
+        for column in self.TIMESTAMP_COLUMNS:
+            df[column] = pd.to_datetime(df[column])
+
+        df['scrape_run'] = df['scrape_started_at_utc'].dt.strftime('%Y%m%dT%H%M%S')
+
+        schema = self.arrow_schema(table_name)
+
+        return pa.Table.from_pandas(df[schema.names], schema=schema, preserve_index=False)
+
+    def write_run(self, table_name, df):
+        """
+
+        Saves a finished run's dataframe into the table's dataset, replacing any partitions the run already wrote.
+
+        """
+
+        self.write_batches(table_name, self.to_arrow(table_name, df).to_batches())
+
+    def write_batches(self, table_name, batches):
+        """
+
+        Saves record batches (an iterable, so they never all have to be in memory) into the table's dataset,
+        replacing any partitions they belong to.
+
+        """
+
+        ds.write_dataset(
+            pa.RecordBatchReader.from_batches(self.arrow_schema(table_name), batches),
+            self.table_dir(table_name),
+            format='parquet',
+            partitioning=self.partitioning(),
+            basename_template='part-{i}.parquet',
+            existing_data_behavior='delete_matching'
+        )
+
+    def write_pending(self, table_name, df, scrape_started_at_utc):
+        """
+
+        Saves one batch of an unfinished run. scrape_ended_at_utc is filled in by finish_run().
+
+        """
+
+        pending_dir = self.pending_dir(table_name, scrape_started_at_utc)
+        os.makedirs(pending_dir, exist_ok=True)
+
+        part_number = len(glob.glob(os.path.join(pending_dir, '*.parquet')))
+
+        pq.write_table(self.to_arrow(table_name, df), os.path.join(pending_dir, f"part-{part_number}.parquet"))
+
+    def clear_pending(self, table_name, scrape_started_at_utc):
+        """
+
+        Deletes an unfinished run's batches.
+
+        """
+
+        shutil.rmtree(self.pending_dir(table_name, scrape_started_at_utc), ignore_errors=True)
+
+    def finish_run(self, table_name, scrape_started_at_utc, scrape_ended_at_utc):
+        """
+
+        Moves an unfinished run's batches into the table's dataset with scrape_ended_at_utc set, one batch at a time.
+
+        """
+
+        pending_dir = self.pending_dir(table_name, scrape_started_at_utc)
+
+        if not os.path.isdir(pending_dir):
+            return
+
+        scrape_ended_at = pa.scalar(pd.Timestamp(scrape_ended_at_utc).to_pydatetime(), type=pa.timestamp('s'))
+
+        def stamped_batches():
+            for batch in ds.dataset(pending_dir, schema=self.arrow_schema(table_name), format='parquet').to_batches():
+                column_index = batch.schema.get_field_index('scrape_ended_at_utc')
+                yield batch.set_column(column_index, 'scrape_ended_at_utc', pa.array([scrape_ended_at] * batch.num_rows, type=pa.timestamp('s')))
+
+        self.write_batches(table_name, stamped_batches())
+        self.clear_pending(table_name, scrape_started_at_utc)
+
+    def dataset(self, table_name):
+        """
+
+        Returns a table's dataset, for readers that want to build their own scans.
+
+        """
+
+        return ds.dataset(
+            self.table_dir(table_name),
+            format='parquet',
+            partitioning=self.partitioning(),
+            exclude_invalid_files=True,
+            ignore_prefixes=['.', self.PENDING_DIR_NAME]
+        )
+
+    def scrape_runs(self, table_name):
+        """
+
+        Returns the scrape_run partition values saved for a table, oldest first, without reading any row data.
+
+        """
+
+        return sorted({
+            os.path.basename(run_dir).split('=', 1)[1]
+            for run_dir in glob.glob(os.path.join(self.table_dir(table_name), 'game_version=*', 'scrape_run=*'))
+        })
+
+    def read(
+        self,
+        table_name,
+        columns = None,  # Columns to read. Defaults to every column.
+        game_version = None,  # 'GL' or 'JP'. Defaults to both.
+        scrape_run = 'latest'  # A scrape_run partition value, 'latest', or None for every run
+    ):
+        """
+
+        Reads a table into a dataframe, only touching the partitions and columns asked for.
+
+        """
+
+        if scrape_run == 'latest':
+            scrape_run_list = self.scrape_runs(table_name)
+            scrape_run = scrape_run_list[-1] if scrape_run_list else None
+
+        filter_expression = None
+
+        for column, value in [('game_version', game_version), ('scrape_run', scrape_run)]:
+            if value is None:
+                continue
+
+            column_filter = ds.field(column) == value
+            filter_expression = column_filter if filter_expression is None else filter_expression & column_filter
+
+        # Nullable integer columns (ability_id) would otherwise come back as floats.
+        return self.dataset(table_name).to_table(columns=columns, filter=filter_expression).to_pandas(
+            types_mapper=self.INTEGER_DTYPES.get
+        )
+
+
+def main():
+    """
+
+    Converts the raw CSVs in a datasets directory to Parquet from the command line, e.g., to backfill runs
+    saved before Parquet output existed.
+
+    """
+
+    arg_parser = argparse.ArgumentParser(description="Convert the scraper's raw CSVs to partitioned Parquet datasets.")
+    arg_parser.add_argument('datasets_dir', help="Directory holding raw_abilities.csv, raw_bt_effects.csv, and raw_high_armor_caps.csv.")
+    arg_parser.add_argument('--parquet-dir', help="Directory to save the datasets to. Defaults to <datasets_dir>/parquet/.")
+    args = arg_parser.parse_args()
+
+    datasets_dir = args.datasets_dir.rstrip('/') + '/'
+    parquet_output = ParquetOutput(args.parquet_dir or datasets_dir + 'parquet/')
+
+    for table_name in ParquetOutput.TABLE_SCHEMAS:
+        df = pd.read_csv(f"{datasets_dir}{table_name}.csv", dtype={'ability_id': object})
+        parquet_output.write_run(table_name, df)
+
+        print(f"{table_name}: {len(df)} rows saved to {parquet_output.table_dir(table_name)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,426 @@
+import io
+import os
+import ast
+import time
+import logging
+import argparse
+import numpy as np
+import pandas as pd
+
+
+class PostgresBulkLoader:
+    """
+
+    Loads the scraper's dataframes into Postgres with COPY instead of row-by-row INSERTs.
+
+    Each dataframe is streamed in chunks through COPY FROM STDIN into a temporary staging table shaped
+    like its target table, then moved into the target table with one statement. That statement first
+    deletes any rows from the same scrape (scrape_started_at_utc), so loading a run twice (e.g., after
+    a resume) doesn't duplicate it. Every table is loaded in one transaction, so either all of them
+    are loaded or none are.
+
+    List columns (attribute_list, enemy_count_apply_list) are written as Postgres array literals
+    (e.g., '{Melee,Magic}'), which is how DataFrame.to_sql stored them.
+
+    """
+
+    RUN_KEY_COLUMN = 'scrape_started_at_utc'
+
+    def __init__(
+        self,
+        engine,  # SQLAlchemy engine for the Postgres database
+        logger,
+        chunk_size = 10000  # Number of rows sent per COPY
+    ):
+        self.engine = engine
+        self.logger = logger
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def array_literal(value):
+        """
+
+        Returns a list as a Postgres array literal. Anything else is returned unchanged.
+
+        """
+
+        if isinstance(value, np.ndarray):  # List columns read from Parquet
+            value = value.tolist()
+
+        if not isinstance(value, (list, tuple)):
+            return value
+
+        element_list = []
+
+        for element in value:
+            element = str(element)
+
+            if element == '' or element.upper() == 'NULL' or any(character in element for character in ' ,{}"\\'):
+                element = '"' + element.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+            element_list.append(element)
+
+        return '{' + ','.join(element_list) + '}'
+
+    def copy_rows(self, cursor, staging_table_name, df):
+        """
+
+        Streams a dataframe into a staging table through COPY FROM STDIN, one chunk at a time.
+
+        """
+
+        column_sql = ', '.join(f'"{column}"' for column in df.columns)
+        copy_sql = f'COPY "{staging_table_name}" ({column_sql}) FROM STDIN WITH (FORMAT csv)'
+
+        for chunk_start in range(0, len(df), self.chunk_size):
+            chunk_df = df.iloc[chunk_start:chunk_start + self.chunk_size]
+
+            buffer = io.StringIO()
+            chunk_df.map(self.array_literal).to_csv(buffer, index=False, header=False)
+            buffer.seek(0)
+
+            if hasattr(cursor, 'copy_expert'):  # psycopg2
+                cursor.copy_expert(copy_sql, buffer)
+            else:  # psycopg 3
+                with cursor.copy(copy_sql) as copy:
+                    copy.write(buffer.getvalue())
+
+    def load_table(
+        self,
+        conn,  # Open SQLAlchemy connection
+        table_name,
+        df,
+        key_column_list = None  # Columns whose values identify the rows being replaced. Defaults to the run key.
+    ):
+        """
+
+        Loads one dataframe into a table on an open connection, creating the table if it doesn't exist yet.
+        Existing rows that share a key with any loaded row are replaced. Returns a dictionary with the row
+        count, seconds, and rows/sec.
+
+        """
+
+        # Only imported once something is loaded, so importing this module stays cheap for parse-only runs.
+        import sqlalchemy as sa
+
+        started_at = time.perf_counter()
+
+        if not sa.inspect(conn).has_table(table_name):
+            # Same column types DataFrame.to_sql would have used
+            df.head(0).to_sql(table_name, con=conn, index=False)
+
+        staging_table_name = f"staging_{table_name}"
+        column_sql = ', '.join(f'"{column}"' for column in df.columns)
+
+        conn.exec_driver_sql(
+            f'CREATE TEMP TABLE "{staging_table_name}" (LIKE "{table_name}" INCLUDING DEFAULTS) ON COMMIT DROP'
+        )
+
+        cursor = conn.connection.cursor()
+
+        try:
+            self.copy_rows(cursor, staging_table_name, df)
+        finally:
+            cursor.close()
+
+        key_column_list = [self.RUN_KEY_COLUMN] if key_column_list is None else key_column_list
+
+        if all(key_column in df.columns for key_column in key_column_list):
+            key_sql = ', '.join(f'"{key_column}"' for key_column in key_column_list)
+
+            conn.exec_driver_sql(
+                f'WITH cleared AS ('
+                f'DELETE FROM "{table_name}" WHERE ({key_sql}) IN (SELECT DISTINCT {key_sql} FROM "{staging_table_name}")'
+                f') INSERT INTO "{table_name}" ({column_sql}) SELECT {column_sql} FROM "{staging_table_name}"'
+            )
+        else:
+            conn.exec_driver_sql(
+                f'INSERT INTO "{table_name}" ({column_sql}) SELECT {column_sql} FROM "{staging_table_name}"'
+            )
+
+        seconds = time.perf_counter() - started_at
+        rows_per_second = len(df) / seconds if seconds else 0
+
+        self.logger.info("Loaded %s rows into %s in %.2fs (%.0f rows/sec).", len(df), table_name, seconds, rows_per_second)
+
+        return {'rows': len(df), 'seconds': seconds, 'rows_per_second': rows_per_second}
+
+    def load_tables(self, df_dict, key_column_list=None):
+        """
+
+        Loads a dictionary of table name -> dataframe in one transaction. Returns a dictionary of table name -> load stats.
+
+        """
+
+        with self.engine.begin() as conn:
+            return {
+                table_name: self.load_table(conn, table_name, df, key_column_list=key_column_list)
+                for table_name, df in df_dict.items()
+            }
+
+
+class StreamingRunLoader:
+    """
+
+    Loads a run's rows into Postgres character by character, as they come out of the parsers, instead of
+    holding every dataframe until the end of the run.
+
+    Rows are buffered until max_buffered_rows is reached, then flushed to every table in one transaction.
+    Each flush replaces any rows already loaded for the same run, character, and game version, so a
+    character loaded twice (e.g., when a run is resumed) doesn't duplicate its rows. Flushed rows are
+    also appended to partial CSVs next to the final ones. Rows carried forward from an earlier run are
+    only written to the CSVs (and Parquet), since they're already in Postgres under that run.
+
+    Rows loaded while the run is still going have no scrape_ended_at_utc. finish() flushes what's left,
+    then stamps scrape_ended_at_utc on every row of the run in one last transaction, which marks the run
+    complete, and writes the final CSVs.
+
+    """
+
+    KEY_COLUMNS = [PostgresBulkLoader.RUN_KEY_COLUMN, 'char_name', 'game_version']
+
+    def __init__(
+        self,
+        bulk_loader,  # PostgresBulkLoader instance
+        scrape_started_at_utc,
+        csv_path_dict = None,  # Table name -> path of its final CSV
+        max_buffered_rows = 5000,  # Number of rows (across every table) held in memory before a flush
+        parquet_output = None  # ParquetOutput instance, if the rows should also be saved as Parquet
+    ):
+        self.bulk_loader = bulk_loader
+        self.logger = bulk_loader.logger
+        self.scrape_started_at_utc = scrape_started_at_utc
+        self.csv_path_dict = csv_path_dict or {}
+        self.max_buffered_rows = max(max_buffered_rows, 1)
+        self.parquet_output = parquet_output
+
+        self.buffer_dict = {}
+        self.load_buffer_dict = {}
+        self.buffered_rows = 0
+        self.loaded_rows = {}
+
+        # Partial CSVs always start over, since a resumed run streams its checkpointed characters again.
+        for csv_path in self.csv_path_dict.values():
+            if os.path.exists(self.partial_csv_path(csv_path)):
+                os.remove(self.partial_csv_path(csv_path))
+
+        if parquet_output is not None:
+            for table_name in parquet_output.TABLE_SCHEMAS:
+                parquet_output.clear_pending(table_name, scrape_started_at_utc)
+
+    @staticmethod
+    def partial_csv_path(csv_path):
+        """
+
+        Returns the path rows are appended to until the run is finished.
+
+        """
+
+        return f"{csv_path}.partial"
+
+    def add(
+        self,
+        df_dict,
+        load = True  # False for rows carried forward from an earlier run, which are saved but not loaded again
+    ):
+        """
+
+        Buffers one character's dataframes (table name -> dataframe, or None) and flushes the buffer if it's full.
+
+        """
+
+        for table_name, df in df_dict.items():
+            if df is None:
+                continue
+
+            df = df.copy()
+            df[self.bulk_loader.RUN_KEY_COLUMN] = self.scrape_started_at_utc
+            df['scrape_ended_at_utc'] = None
+
+            self.buffer_dict.setdefault(table_name, []).append(df)
+            self.buffered_rows += len(df)
+
+            if load:
+                self.load_buffer_dict.setdefault(table_name, []).append(df)
+
+        if self.buffered_rows >= self.max_buffered_rows:
+            self.flush()
+
+    def flush(self):
+        """
+
+        Writes every buffered row to the partial CSVs, and upserts the ones to load into Postgres in one
+        transaction.
+
+        """
+
+        if not self.buffer_dict:
+            return
+
+        df_dict = {table_name: pd.concat(df_list, ignore_index=True) for table_name, df_list in self.buffer_dict.items()}
+
+        for table_name, df in df_dict.items():
+            if table_name in self.csv_path_dict:
+                partial_csv_path = self.partial_csv_path(self.csv_path_dict[table_name])
+                df.to_csv(partial_csv_path, mode='a', header=not os.path.exists(partial_csv_path), index=False)
+
+            if self.parquet_output is not None:
+                self.parquet_output.write_pending(table_name, df, self.scrape_started_at_utc)
+
+        load_df_dict = {
+            table_name: pd.concat(df_list, ignore_index=True) for table_name, df_list in self.load_buffer_dict.items()
+        }
+
+        if load_df_dict:
+            self.bulk_loader.load_tables(load_df_dict, key_column_list=self.KEY_COLUMNS)
+
+        for table_name, df in load_df_dict.items():
+            self.loaded_rows[table_name] = self.loaded_rows.get(table_name, 0) + len(df)
+
+        self.logger.info(
+            "Streamed %s of %s buffered rows to the SQL database.",
+            sum(len(df) for df in load_df_dict.values()), self.buffered_rows
+        )
+
+        self.buffer_dict = {}
+        self.load_buffer_dict = {}
+        self.buffered_rows = 0
+
+    def finish(self, scrape_ended_at_utc):
+        """
+
+        Flushes the remaining rows, then marks the run complete by setting scrape_ended_at_utc on all of its
+        rows in one transaction, and moves the partial CSVs (and pending Parquet batches) into place with the
+        same timestamp.
+
+        """
+
+        import sqlalchemy as sa
+
+        self.flush()
+
+        with self.bulk_loader.engine.begin() as conn:
+            for table_name in self.loaded_rows:
+                conn.execute(
+                    sa.text(
+                        f'UPDATE "{table_name}" SET scrape_ended_at_utc = :scrape_ended_at_utc '
+                        f'WHERE "{self.bulk_loader.RUN_KEY_COLUMN}" = :scrape_started_at_utc'
+                    ),
+                    {'scrape_ended_at_utc': scrape_ended_at_utc, 'scrape_started_at_utc': self.scrape_started_at_utc}
+                )
+
+        self.logger.info("Marked the run started at %s complete.", self.scrape_started_at_utc)
+
+        for table_name, csv_path in self.csv_path_dict.items():
+            partial_csv_path = self.partial_csv_path(csv_path)
+
+            if not os.path.exists(partial_csv_path):
+                continue
+
+            temp_path = f"{csv_path}.{os.getpid()}.tmp"
+
+            # Rewritten a chunk at a time as text, so the saved values come out exactly as they went in.
+            chunk_iterator = pd.read_csv(partial_csv_path, dtype=str, keep_default_na=False, chunksize=self.max_buffered_rows)
+
+            for chunk_number, chunk_df in enumerate(chunk_iterator):
+                chunk_df['scrape_ended_at_utc'] = scrape_ended_at_utc
+                chunk_df.to_csv(temp_path, mode='w' if chunk_number == 0 else 'a', header=chunk_number == 0, index=False)
+
+            os.replace(temp_path, csv_path)
+            os.remove(partial_csv_path)
+
+        if self.parquet_output is not None:
+            for table_name in self.loaded_rows:
+                self.parquet_output.finish_run(table_name, self.scrape_started_at_utc, scrape_ended_at_utc)
+
+        return dict(self.loaded_rows)
+
+
+# Raw tables and the CSVs main() saves them to
+RAW_TABLE_CSV_DICT = {
+    'raw_abilities': 'raw_abilities.csv',
+    'raw_bt_effects': 'raw_bt_effects.csv',
+    'raw_high_armor_caps': 'raw_high_armor_caps.csv'
+}
+
+LIST_COLUMNS = ['attribute_list', 'enemy_count_apply_list']
+
+
+def read_raw_csv(csv_path):
+    """
+
+    Reads one of the scraper's output CSVs back into the dataframe it was saved from.
+
+    """
+
+    df = pd.read_csv(csv_path, dtype={'ability_id': object})
+
+    for column in LIST_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].apply(ast.literal_eval)
+
+    return df
+
+
+def drop_carried_forward_rows(df, carried_forward_key_set):
+    """
+
+    Returns a raw table without the rows of character versions that were carried forward from an earlier run
+    (a set of (char_name, game_version) tuples). Those rows are already in the database under the run that
+    parsed them, so loading them again would only duplicate them.
+
+    """
+
+    if df is None or not carried_forward_key_set:
+        return df
+
+    key_series = pd.Series(list(zip(df['char_name'], df['game_version'])), index=df.index)
+
+    return df[~key_series.isin(carried_forward_key_set)]
+
+
+def main():
+    """
+
+    Loads the raw CSVs from a datasets directory into a Postgres database. Meant for timing loads against a
+    throwaway local database.
+
+    """
+
+    arg_parser = argparse.ArgumentParser(description="Bulk load the scraper's raw CSVs into Postgres with COPY.")
+    arg_parser.add_argument('database_url', help="SQLAlchemy URL of the database, e.g. postgresql://localhost/dffoo_test")
+    arg_parser.add_argument('datasets_dir', help="Directory holding raw_abilities.csv, raw_bt_effects.csv, and raw_high_armor_caps.csv.")
+    arg_parser.add_argument('--chunk-size', type=int, default=10000)
+    arg_parser.add_argument('--parquet', action='store_true', help="Load the latest run from the Parquet datasets in <datasets_dir>/parquet/ instead of the CSVs.")
+    args = arg_parser.parse_args()
+
+    import sqlalchemy as sa
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(message)s')
+
+    loader = PostgresBulkLoader(sa.create_engine(args.database_url), logging.getLogger(__name__), chunk_size=args.chunk_size)
+
+    if args.parquet:
+        # Only needed for Parquet input, and it pulls in pyarrow.
+        from parquet_store import ParquetOutput
+
+        parquet_output = ParquetOutput(f"{args.datasets_dir.rstrip('/')}/parquet/")
+
+        df_dict = {
+            table_name: parquet_output.read(table_name).drop(columns=['scrape_run'])
+            for table_name in RAW_TABLE_CSV_DICT
+        }
+    else:
+        df_dict = {
+            table_name: read_raw_csv(f"{args.datasets_dir.rstrip('/')}/{csv_name}")
+            for table_name, csv_name in RAW_TABLE_CSV_DICT.items()
+        }
+
+    load_stats = loader.load_tables(df_dict)
+
+    for table_name, table_stats in load_stats.items():
+        print(f"{table_name}: {table_stats['rows']} rows in {table_stats['seconds']:.2f}s ({table_stats['rows_per_second']:.0f} rows/sec)")
+
+
+if __name__ == '__main__':
+    main()
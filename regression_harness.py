@@ -0,0 +1,213 @@
+import os
+import sys
+import glob
+import time
+import logging
+import argparse
+import importlib
+import pandas as pd
+from web_scraper import CompendiumScraper
+
+
+class RegressionHarness:
+    """
+
+    Checks the ability parser against the hand-verified outputs in character_ability_test_cases.
+
+    Each test case is a CSV named <char_name>_ability_df.csv with the expected main_target_hp_attacks,
+    non_target_hp_attacks, and hp_dmg_cap_up_perc for some of a character's abilities (ability override
+    rules aren't part of the expected output). The character's recorded ability page is loaded from
+    the snapshot store and run through generate_ability_dict and generate_ability_df, and every expected
+    row is compared with the parsed row of the same ability name. If an ability name shows up more than
+    once, rows are matched in order. Parsed abilities that aren't in the test case are ignored.
+
+    """
+
+    COMPARED_COLUMNS = ['main_target_hp_attacks', 'non_target_hp_attacks', 'hp_dmg_cap_up_perc']
+    TEST_CASE_SUFFIX = '_ability_df.csv'
+
+    def __init__(
+        self,
+        config_yml_path,
+        test_case_dir = 'character_ability_test_cases',  # Directory of golden CSVs
+        game_version = 'GL',  # Game version of the recorded pages to test against
+        parser_class = None,  # Alternative HP attack parser class to test in place of the scraper's own
+        quiet = True  # If True, silences the scraper's logging
+    ):
+        self.cs = CompendiumScraper(config_yml_path, fetch_backend='replay', incremental=False)
+
+        if quiet:
+            self.cs.logger.setLevel(logging.WARNING)
+
+        if parser_class is not None:
+            self.cs.hp_attack_parser = parser_class(self.cs.logger)
+
+        self.test_case_dir = test_case_dir
+        self.JP = game_version == 'JP'
+
+    def test_case_paths(self, char_name_list=None):
+        """
+
+        Returns a dictionary of character name -> golden CSV path, for every test case (or the ones in char_name_list).
+
+        """
+
+        test_case_path_dict = {
+            os.path.basename(test_case_path)[:-len(self.TEST_CASE_SUFFIX)]: test_case_path
+            for test_case_path in sorted(glob.glob(os.path.join(self.test_case_dir, '*' + self.TEST_CASE_SUFFIX)))
+        }
+
+        if char_name_list is not None:
+            test_case_path_dict = {
+                char_name: test_case_path
+                for char_name, test_case_path in test_case_path_dict.items()
+                if char_name in char_name_list
+            }
+
+        return test_case_path_dict
+
+    def diff(self, expected_df, parsed_df):
+        """
+
+        Returns a list of differences between a test case and the parser's output, as dictionaries. An empty list
+        means the test case passed.
+
+        """
+
+        # Number repeated ability names, so the nth expected row is compared with the nth parsed row.
+        expected_df = expected_df.assign(occurrence=expected_df.groupby('ability_name').cumcount())
+        parsed_df = parsed_df.assign(occurrence=parsed_df.groupby('ability_name').cumcount())
+
+        joined_df = expected_df.merge(
+            parsed_df[['ability_name', 'occurrence'] + self.COMPARED_COLUMNS],
+            on=['ability_name', 'occurrence'],
+            how='left',
+            suffixes=('_expected', '_parsed'),
+            indicator='match_status'
+        )
+
+        difference_list = []
+
+        for row in joined_df.itertuples(index=False):
+            row_dict = row._asdict()
+
+            if row_dict['match_status'] == 'left_only':
+                difference_list.append({'ability_name': row_dict['ability_name'], 'column': None, 'expected': 'row', 'parsed': 'missing'})
+                continue
+
+            for column in self.COMPARED_COLUMNS:
+                expected = row_dict[f'{column}_expected']
+                parsed = row_dict[f'{column}_parsed']
+
+                if expected != parsed:
+                    difference_list.append({'ability_name': row_dict['ability_name'], 'column': column, 'expected': expected, 'parsed': parsed})
+
+        return difference_list
+
+    def run_test_case(self, char_name, test_case_path):
+        """
+
+        Parses one character's recorded ability page and compares it with their test case. Returns a result dictionary
+        whose status is 'passed', 'failed', or 'no_snapshot'.
+
+        """
+
+        game_version = 'GL' if not self.JP else 'JP'
+
+        if not self.cs.snapshot_store.has_snapshot(char_name, 'abilities', game_version):
+            return {'char_name': char_name, 'status': 'no_snapshot', 'seconds': 0, 'differences': []}
+
+        expected_df = pd.read_csv(test_case_path)
+
+        started_at = time.perf_counter()
+        self.cs.generate_ability_dict(char_name, JP=self.JP)
+        parsed_df = self.cs.generate_ability_df(char_name, JP=self.JP)
+        seconds = time.perf_counter() - started_at
+
+        if parsed_df is None:
+            parsed_df = pd.DataFrame(columns=['ability_name'] + self.COMPARED_COLUMNS)
+
+        difference_list = self.diff(expected_df, parsed_df)
+
+        return {
+            'char_name': char_name,
+            'status': 'failed' if difference_list else 'passed',
+            'seconds': seconds,
+            'ability_count': len(parsed_df),
+            'differences': difference_list
+        }
+
+    def run(self, char_name_list=None):
+        """
+
+        Runs every test case and returns the list of results.
+
+        """
+
+        return [
+            self.run_test_case(char_name, test_case_path)
+            for char_name, test_case_path in self.test_case_paths(char_name_list).items()
+        ]
+
+
+def load_parser_class(parser_path):
+    """
+
+    Imports a parser class from a 'module:ClassName' string.
+
+    """
+
+    module_name, class_name = parser_path.split(':')
+
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def main():
+    """
+
+    Runs the regression harness from the command line. Exits with status 1 if any test case fails.
+
+    """
+
+    arg_parser = argparse.ArgumentParser(description="Compare the ability parser's output with the golden test cases.")
+    arg_parser.add_argument('config_yml_path', help="Path to the scraper's config YAML (its snapshot_dir holds the recorded pages).")
+    arg_parser.add_argument('--test-case-dir', default='character_ability_test_cases', help="Directory of golden CSVs.")
+    arg_parser.add_argument('--game-version', choices=['GL', 'JP'], default='GL')
+    arg_parser.add_argument('--characters', nargs='+', help="Test cases to run. Defaults to all of them.")
+    arg_parser.add_argument('--parser', help="Alternative HP attack parser to test, as 'module:ClassName'.")
+    arg_parser.add_argument('--require-snapshots', action='store_true', help="Fail test cases that have no recorded page instead of skipping them.")
+    args = arg_parser.parse_args()
+
+    harness = RegressionHarness(
+        args.config_yml_path,
+        test_case_dir=args.test_case_dir,
+        game_version=args.game_version,
+        parser_class=load_parser_class(args.parser) if args.parser else None
+    )
+
+    result_list = harness.run(args.characters)
+
+    failed = False
+
+    for result in result_list:
+        if result['status'] == 'no_snapshot':
+            print(f"{result['char_name']}: no recorded {args.game_version} ability page")
+            failed = failed or args.require_snapshots
+            continue
+
+        print(f"{result['char_name']}: {result['status']} ({result['ability_count']} abilities in {result['seconds'] * 1000:.1f}ms)")
+
+        for difference in result['differences']:
+            print(f"    {difference['ability_name']}{' ' + difference['column'] if difference['column'] else ''}: expected {difference['expected']}, parsed {difference['parsed']}")
+
+        failed = failed or result['status'] == 'failed'
+
+    passed_count = sum(result['status'] == 'passed' for result in result_list)
+    print(f"{passed_count} of {len(result_list)} test cases passed.")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
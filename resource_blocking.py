@@ -0,0 +1,237 @@
+class ResourceBlocker:
+    """
+
+    Keeps the browser from downloading resources the parsers never look at (character portraits, icon
+    sprites, fonts, media, and analytics), using Chrome DevTools' Network.setBlockedURLs. Only the
+    downloads are blocked: the elements that reference them stay in the page with their class names, so
+    markers like 'inline HP' and 'inline BREAK' (the HP attack and BREAK icons) are still there to parse.
+    Page scripts and stylesheets are never blocked, since the site renders every page (and positions its
+    sliders and buttons) with them.
+
+    The blocked URL patterns can be set under 'resource_blocking' in the config YAML, along with a list of
+    patterns to let through for each page type (e.g., {buffs: ['*slider*']}).
+
+    Savings are measured on pairs of loads of the same page: for the first `calibration_loads` pages of
+    each page type, the scraper loads the page once without blocking and then again with blocking (see
+    calibrating), with the browser cache disabled for both, so neither load is helped by the other's
+    downloads. The bytes and milliseconds the blocked load saved over its unblocked pair are recorded in
+    `savings_log`. Only the blocked load counts as the page's load; the unblocked one is just a measurement.
+
+    Later pages are only loaded blocked, with the cache back on, so there's nothing from the same page to
+    measure them against. Their savings are estimated as the mean of their page type's measured pairs, and
+    recorded with 'estimated' set. The pairs are measured with the cache off, so when the cache would have
+    served some of the blocked resources anyway, the estimates overstate what blocking saved.
+
+    """
+
+    DEFAULT_BLOCKED_PATTERNS = [
+        # Images
+        '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+        # Fonts
+        '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+        # Media
+        '*.mp4', '*.webm', '*.mp3', '*.ogg', '*.wav',
+        # Analytics and ads
+        '*google-analytics.com*', '*googletagmanager.com*', '*googlesyndication.com*', '*doubleclick.net*'
+    ]
+
+    # Patterns that would also block the scripts or stylesheets every page is rendered with.
+    UNSAFE_PATTERNS = ['*', '*.js', '*.css', '*.json']
+
+    # Bytes transferred for the open page: the document itself plus every resource it loaded.
+    TRANSFER_SIZE_SCRIPT = """
+        return performance.getEntriesByType('navigation')
+            .concat(performance.getEntriesByType('resource'))
+            .reduce((total, entry) => total + (entry.transferSize || 0), 0);
+    """
+
+    def __init__(
+        self,
+        logger,
+        enabled = True,
+        blocked_patterns = None,  # List of URL patterns to block. Overrides DEFAULT_BLOCKED_PATTERNS.
+        allow = None,  # Dictionary of page type -> URL patterns to let through on that page type
+        calibration_loads = 1  # Pages of each page type loaded twice (unblocked, then blocked) to measure savings on
+    ):
+        self.logger = logger
+        self.enabled = enabled
+
+        self.blocked_patterns = list(self.DEFAULT_BLOCKED_PATTERNS if blocked_patterns is None else blocked_patterns)
+        self.allow = allow or {}
+        self.calibration_loads = calibration_loads
+
+        for pattern in self.blocked_patterns:
+            if pattern in self.UNSAFE_PATTERNS:
+                raise ValueError(
+                    f"Blocking {pattern} would break page rendering (and the class markers the parsers rely on)."
+                )
+
+        # Blocked URLs are set per browser, so they're sent again whenever the browser is replaced.
+        self.blocking_driver = None
+        self.active_patterns = None
+        self.cache_disabled = False
+
+        # Page type -> pairs measured, the unblocked half of a pair waiting for its blocked load, and the
+        # savings measured on each pair
+        self.calibration_dict = {}
+        self.unblocked_load_dict = {}
+        self.measured_savings_dict = {}
+        self.blocked = False
+        self.savings_log = []
+
+    def patterns_for(self, page_type):
+        """
+
+        Returns the URL patterns to block on a page type. Allow lists are matched the same way as wait
+        timeouts, so 'buffs' also covers 'buffs_bt_0'.
+
+        """
+
+        allowed_set = set()
+
+        for allowed_page_type, pattern_list in self.allow.items():
+            if page_type.startswith(allowed_page_type):
+                allowed_set.update(pattern_list)
+
+        return [pattern for pattern in self.blocked_patterns if pattern not in allowed_set]
+
+    def calibrating(self, page_type):
+        """
+
+        Returns True while a page type still needs pages loaded in pairs (unblocked, then blocked) to measure
+        savings on.
+
+        """
+
+        return self.enabled and self.calibration_dict.get(page_type, 0) < self.calibration_loads
+
+    def before_load(
+        self,
+        driver,
+        page_type,
+        blocked = True  # False for the unblocked half of a calibration pair
+    ):
+        """
+
+        Sets the browser's blocked URLs for the page type about to be loaded, and turns the browser cache off
+        while the page type is calibrating.
+
+        """
+
+        if not self.enabled:
+            return
+
+        pattern_list = self.patterns_for(page_type) if blocked else []
+        cache_disabled = self.calibrating(page_type)
+
+        if driver is not self.blocking_driver:
+            driver.execute_cdp_cmd('Network.enable', {})
+
+            self.blocking_driver = driver
+            self.active_patterns = None
+            self.cache_disabled = False
+
+        if cache_disabled != self.cache_disabled:
+            driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': cache_disabled})
+
+            self.cache_disabled = cache_disabled
+
+        self.blocked = blocked
+
+        if pattern_list != self.active_patterns:
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': pattern_list})
+
+            self.active_patterns = pattern_list
+
+    def after_load(self, driver, char_name, page_type, seconds):
+        """
+
+        Measures a page load that has finished, if it's part of a calibration pair. The unblocked load is kept
+        until the blocked load of the same page finishes, and then their difference is added to the savings
+        log. Blocked loads after calibration get estimated savings instead (see estimate_savings). Returns the
+        savings, or None.
+
+        """
+
+        if not self.enabled:
+            return None
+
+        if not self.calibrating(page_type):
+            return self.estimate_savings(char_name, page_type)
+
+        transferred_bytes = driver.execute_script(self.TRANSFER_SIZE_SCRIPT) or 0
+
+        if not self.blocked:
+            self.unblocked_load_dict[page_type] = (char_name, transferred_bytes, seconds)
+
+            self.logger.info(
+                "Unblocked calibration load of %s page for %s: %.0f KB in %.0f ms.",
+                page_type, char_name.upper(), transferred_bytes / 1024, seconds * 1000
+            )
+
+            return None
+
+        unblocked_load = self.unblocked_load_dict.pop(page_type, None)
+
+        # Only a blocked load of the same page as the unblocked one makes a pair.
+        if unblocked_load is None or unblocked_load[0] != char_name:
+            return None
+
+        self.calibration_dict[page_type] = self.calibration_dict.get(page_type, 0) + 1
+
+        savings = {
+            'char_name': char_name,
+            'page_type': page_type,
+            'bytes_saved': unblocked_load[1] - transferred_bytes,
+            'ms_saved': (unblocked_load[2] - seconds) * 1000,
+            'estimated': False
+        }
+
+        self.measured_savings_dict.setdefault(page_type, []).append(savings)
+        self.savings_log.append(savings)
+
+        self.logger.info(
+            "Resource blocking on %s page for %s saved %.0f KB and %.0f ms.",
+            page_type, char_name.upper(), savings['bytes_saved'] / 1024, savings['ms_saved']
+        )
+
+        return savings
+
+    def estimate_savings(self, char_name, page_type):
+        """
+
+        Adds a blocked page's estimated savings to the savings log: the mean of the bytes and milliseconds saved
+        on its page type's calibration pairs. Returns the estimate, or None if no pair of the page type was
+        measured.
+
+        """
+
+        measured_savings_list = self.measured_savings_dict.get(page_type)
+
+        if not measured_savings_list:
+            return None
+
+        savings = {
+            'char_name': char_name,
+            'page_type': page_type,
+            'bytes_saved': sum(measured['bytes_saved'] for measured in measured_savings_list) / len(measured_savings_list),
+            'ms_saved': sum(measured['ms_saved'] for measured in measured_savings_list) / len(measured_savings_list),
+            'estimated': True
+        }
+
+        self.savings_log.append(savings)
+
+        return savings
+
+    def take_savings(self, start_index):
+        """
+
+        Removes and returns every savings entry recorded since start_index.
+
+        """
+
+        savings_list = self.savings_log[start_index:]
+
+        del self.savings_log[start_index:]
+
+        return savings_list
@@ -0,0 +1,137 @@
+import os
+import json
+import time
+import calendar
+import hashlib
+
+
+class RosterCache:
+    """
+
+    Remembers the character roster (every character's profile link on the character list page) between
+    runs, so a run that starts within `ttl_hours` of the last discovery doesn't have to load and render the
+    character list page.
+
+    The cache file holds:
+
+    1) char_href_list: every character's profile link, in roster order
+    2) fingerprint: the SHA-256 hex digest of the sorted links, so two rosters can be compared at a glance
+    3) discovered_at_utc: when the roster was last discovered
+
+    Whenever the roster is discovered again, it's compared with the cached one, and the characters that
+    were added or removed are returned (see update).
+
+    """
+
+    def __init__(
+        self,
+        cache_path,
+        ttl_hours = 24  # Hours a discovered roster is reused for. 0 discovers it on every run.
+    ):
+        self.cache_path = cache_path
+        self.ttl_hours = ttl_hours
+
+        try:
+            with open(cache_path, 'r') as cache_file:
+                self.entry = json.load(cache_file)
+        except FileNotFoundError:
+            self.entry = None
+
+    @staticmethod
+    def fingerprint(char_href_list):
+        """
+
+        Returns the SHA-256 hex digest of a roster. The order of the links doesn't matter.
+
+        """
+
+        return hashlib.sha256('\n'.join(sorted(char_href_list)).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def char_name(char_href):
+        """
+
+        Returns the character name at the end of a profile link.
+
+        """
+
+        return char_href.rstrip('/').split('/')[-1]
+
+    def age_hours(self):
+        """
+
+        Returns how many hours ago the cached roster was discovered, or None if there's no cached roster.
+
+        """
+
+        if self.entry is None:
+            return None
+
+        discovered_at = calendar.timegm(time.strptime(self.entry['discovered_at_utc'], '%Y-%m-%d %H:%M:%S'))
+
+        return (time.time() - discovered_at) / 3600
+
+    def is_fresh(self):
+        """
+
+        Returns True if there's a cached roster younger than the TTL.
+
+        """
+
+        age_hours = self.age_hours()
+
+        return age_hours is not None and age_hours < self.ttl_hours
+
+    def char_href_list(self):
+        """
+
+        Returns the cached roster's profile links, or an empty list if there's no cached roster.
+
+        """
+
+        return [] if self.entry is None else list(self.entry['char_href_list'])
+
+    def update(self, char_href_list):
+        """
+
+        Saves a newly discovered roster and returns how it differs from the cached one, as a dictionary of
+        added and removed character names, with the fingerprints of both rosters.
+
+        """
+
+        previous_name_set = {self.char_name(char_href) for char_href in self.char_href_list()}
+        name_set = {self.char_name(char_href) for char_href in char_href_list}
+
+        roster_diff = {
+            'added': [self.char_name(char_href) for char_href in char_href_list if self.char_name(char_href) not in previous_name_set],
+            'removed': sorted(previous_name_set - name_set),
+            'previous_fingerprint': None if self.entry is None else self.entry['fingerprint'],
+            'fingerprint': self.fingerprint(char_href_list)
+        }
+
+        self.entry = {
+            'char_href_list': list(char_href_list),
+            'fingerprint': roster_diff['fingerprint'],
+            'discovered_at_utc': time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+        }
+
+        self.save()
+
+        return roster_diff
+
+    def save(self):
+        """
+
+        Writes the cache to a temporary file, then moves it into place, so a crash mid-write never leaves a
+        half-written roster behind.
+
+        """
+
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+
+        temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+
+        with open(temp_path, 'w') as temp_file:
+            json.dump(self.entry, temp_file, indent=2)
+
+        os.replace(temp_path, self.cache_path)
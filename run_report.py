@@ -0,0 +1,285 @@
+import os
+import glob
+import json
+import time
+import argparse
+import contextlib
+import numpy as np
+
+
+class StageTimer:
+    """
+
+    Records how long each stage of a scrape takes, as spans tagged with the stage and (for character work)
+    the character and game version. The stages are:
+
+    - page_load: loading a page (driver.get plus waiting for it to be ready, or a browserless fetch)
+    - version_toggle: switching a page between GL and JP
+    - ability_scroll: scrolling an ability page until every ability is lazy loaded
+    - bt_slider: dragging BT effect sliders into position
+    - ha_plus_scroll: scrolling the high armor plus page until every block has loaded
+    - parse_ability_page: reading a loaded ability page into the character's ability dictionary
+    - parse_abilities, parse_bt, parse_high_armor: parsing abilities (from the ability dictionary), BT effects,
+      and high armor from pages that have already been loaded
+    - save_intermediates: saving a character's dataframes to the intermediate store
+    - roster, save_outputs, sql_load: run-level work that doesn't belong to one character
+
+    scrape_character takes its character's spans out of the timer (see take_spans) and returns them with
+    its result, so spans recorded in worker processes make it back to the main scraper.
+
+    """
+
+    def __init__(self):
+        self.span_list = []
+
+    @contextlib.contextmanager
+    def span(
+        self,
+        stage,
+        char_name = None,  # None for run-level stages
+        JP = False
+    ):
+        """
+
+        Times the block inside the `with` statement as one span, even if it returns early or raises.
+
+        """
+
+        started_at = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.span_list.append({
+                'stage': stage,
+                'char_name': char_name,
+                'game_version': None if char_name is None else ('GL' if not JP else 'JP'),
+                'seconds': time.perf_counter() - started_at
+            })
+
+    def take_spans(self, start_index):
+        """
+
+        Removes and returns every span recorded since start_index.
+
+        """
+
+        span_list = self.span_list[start_index:]
+
+        del self.span_list[start_index:]
+
+        return span_list
+
+
+def summarize(value_list):
+    """
+
+    Returns the count, total, and percentiles of a list of numbers.
+
+    """
+
+    if not value_list:
+        return {'count': 0, 'total': 0, 'p50': 0, 'p90': 0, 'p99': 0, 'max': 0}
+
+    p50, p90, p99 = np.percentile(value_list, [50, 90, 99])
+
+    return {
+        'count': len(value_list),
+        'total': float(sum(value_list)),
+        'p50': float(p50),
+        'p90': float(p90),
+        'p99': float(p99),
+        'max': float(max(value_list))
+    }
+
+
+def build_run_report(
+    scrape_started_at_utc,
+    scrape_ended_at_utc,
+    result_list,  # Every scrape_character result of the run
+    run_span_list,  # Spans left in the main scraper's timer (run-level work, and async crawl fetches)
+    wall_seconds,  # Seconds from the start of the run to the end of its load
+    slowest_count = 10  # Number of slowest character versions to list
+):
+    """
+
+    Builds a run's performance report, as a dictionary that can be saved as JSON:
+
+    1) stages: count, total, and percentiles of every stage's spans
+    2) characters: every character version's seconds, WebDriver calls, page loads (and loads saved by the
+       navigation planner), seconds spent waiting, and seconds per stage
+    3) slowest_characters: the character versions that took longest
+    4) driver_calls and character_seconds: totals and percentiles across character versions
+    5) failed_pages: pages the HTTP backend couldn't fetch (after retries), with the error
+    6) page_loads: pages loaded, and loads saved, across the run
+    7) resource_blocking: pages loaded with resources blocked (see ResourceBlocker), how many of them were
+       measured against an unblocked load of the same page, and the bytes and milliseconds blocking saved on
+       all of them, by page type. Savings on pages that weren't measured are estimated from the measured ones.
+
+    """
+
+    span_list = list(run_span_list)
+
+    character_list = []
+    resource_blocking_dict = {}
+    failed_page_list = []
+
+    for result in result_list:
+        character_span_list = result.get('spans', [])
+        span_list += character_span_list
+
+        failed_page_list += result.get('failed_pages', [])
+
+        stage_seconds = {}
+
+        for span in character_span_list:
+            stage_seconds[span['stage']] = stage_seconds.get(span['stage'], 0) + span['seconds']
+
+        savings_list = result.get('resource_savings', [])
+
+        for savings in savings_list:
+            page_savings = resource_blocking_dict.setdefault(
+                savings['page_type'], {'pages': 0, 'measured_pages': 0, 'bytes_saved': 0, 'ms_saved': 0}
+            )
+            page_savings['pages'] += 1
+            page_savings['measured_pages'] += 0 if savings.get('estimated') else 1
+            page_savings['bytes_saved'] += savings['bytes_saved']
+            page_savings['ms_saved'] += savings['ms_saved']
+
+        character_list.append({
+            'char_name': result['char_name'],
+            'game_version': result['game_version'],
+            'seconds': result.get('seconds', 0),
+            'driver_calls': result['driver_calls'],
+            'page_loads': result.get('page_loads', 0),
+            'page_loads_saved': result.get('page_loads_saved', 0),
+            'bytes_saved': sum(savings['bytes_saved'] for savings in savings_list),
+            'ms_saved': sum(savings['ms_saved'] for savings in savings_list),
+            'wait_seconds': result['wait_seconds'],
+            'carried_forward': result.get('carried_forward', False),
+            'stage_seconds': stage_seconds
+        })
+
+    stage_dict = {}
+
+    for span in span_list:
+        stage_dict.setdefault(span['stage'], []).append(span['seconds'])
+
+    return {
+        'scrape_started_at_utc': scrape_started_at_utc,
+        'scrape_ended_at_utc': scrape_ended_at_utc,
+        'wall_seconds': wall_seconds,
+        'character_versions': len(character_list),
+        'stages': {stage: summarize(seconds_list) for stage, seconds_list in sorted(stage_dict.items())},
+        'character_seconds': summarize([character['seconds'] for character in character_list]),
+        'driver_calls': summarize([character['driver_calls'] for character in character_list]),
+        'page_loads': {
+            'loaded': sum(character['page_loads'] for character in character_list),
+            'saved': sum(character['page_loads_saved'] for character in character_list)
+        },
+        'resource_blocking': dict(sorted(resource_blocking_dict.items())),
+        'slowest_characters': sorted(character_list, key=lambda character: character['seconds'], reverse=True)[:slowest_count],
+        'failed_pages': failed_page_list,
+        'characters': character_list
+    }
+
+
+def report_path(report_dir, scrape_started_at_utc):
+    """
+
+    Returns the path a run's report is saved to (e.g., run_report_20230909T115619.json).
+
+    """
+
+    scrape_run = time.strftime('%Y%m%dT%H%M%S', time.strptime(scrape_started_at_utc, '%Y-%m-%d %H:%M:%S'))
+
+    return os.path.join(report_dir, f"run_report_{scrape_run}.json")
+
+
+def carried_forward_keys(report_dir, scrape_started_at_utc):
+    """
+
+    Returns the (char_name, game_version) tuples a run carried forward from an earlier run, from its
+    saved report, or None if the run has no report.
+
+    """
+
+    try:
+        with open(report_path(report_dir, scrape_started_at_utc), 'r') as report_file:
+            report = json.load(report_file)
+    except FileNotFoundError:
+        return None
+
+    return {
+        (character['char_name'], character['game_version'])
+        for character in report['characters'] if character.get('carried_forward')
+    }
+
+
+def save_run_report(report_dir, report):
+    """
+
+    Saves a run's report to report_dir, through a temporary file. Returns the report's path.
+
+    """
+
+    os.makedirs(report_dir, exist_ok=True)
+
+    path = report_path(report_dir, report['scrape_started_at_utc'])
+    temp_path = f"{path}.{os.getpid()}.tmp"
+
+    with open(temp_path, 'w') as temp_file:
+        json.dump(report, temp_file, indent=2)
+
+    os.replace(temp_path, path)
+
+    return path
+
+
+def main():
+    """
+
+    Lists the saved run reports from the command line, oldest first, so runs can be compared.
+
+    """
+
+    arg_parser = argparse.ArgumentParser(description="Compare the scraper's saved run reports.")
+    arg_parser.add_argument('report_dir', help="Directory the run reports are saved to.")
+    arg_parser.add_argument('--stages', nargs='+', help="Stages to show the total seconds of. Defaults to every stage.")
+    args = arg_parser.parse_args()
+
+    report_list = []
+
+    for path in sorted(glob.glob(os.path.join(args.report_dir, 'run_report_*.json'))):
+        with open(path, 'r') as report_file:
+            report_list.append(json.load(report_file))
+
+    stage_list = args.stages or sorted({stage for report in report_list for stage in report['stages']})
+
+    for report in report_list:
+        slowest = report['slowest_characters'][0] if report['slowest_characters'] else None
+
+        print(
+            f"{report['scrape_started_at_utc']} -> {report['scrape_ended_at_utc']}: {report['wall_seconds']:.0f}s, "
+            f"{report['character_versions']} character versions, {report['driver_calls']['total']:.0f} WebDriver calls"
+            + (f", {report['page_loads']['loaded']} page loads ({report['page_loads']['saved']} saved)" if 'page_loads' in report else "")
+            + (
+                f", {sum(page['bytes_saved'] for page in report['resource_blocking'].values()) / 2 ** 20:.1f} MB and "
+                f"{sum(page['ms_saved'] for page in report['resource_blocking'].values()) / 1000:.0f}s saved by resource blocking "
+                f"({sum(page.get('measured_pages', page['pages']) for page in report['resource_blocking'].values())} of "
+                f"{sum(page['pages'] for page in report['resource_blocking'].values())} pages measured)"
+                if report.get('resource_blocking') else ""
+            )
+            + (f", slowest {slowest['char_name']}/{slowest['game_version']} ({slowest['seconds']:.1f}s)" if slowest else "")
+            + (f", {len(report['failed_pages'])} failed pages" if report.get('failed_pages') else "")
+        )
+
+        for stage in stage_list:
+            stage_summary = report['stages'].get(stage)
+
+            if stage_summary:
+                print(f"    {stage}: {stage_summary['total']:.1f}s over {stage_summary['count']} spans (p90 {stage_summary['p90']:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
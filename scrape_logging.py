@@ -0,0 +1,159 @@
+import os
+import json
+import time
+import queue
+import atexit
+import logging
+import logging.handlers
+
+
+# Subsystems with their own logger (web_scraper.<subsystem>), so their levels can be set separately under
+# 'log_levels' in the config YAML:
+#
+# - parser: the HP attack parser's per-line traces, and every ability's text as it's collected
+# - slider: BT effect slider offsets
+# - waits: page waits
+# - http: the HTTP fetch backend
+# - browser: the browser pool's health checks and replacements
+SUBSYSTEMS = ['parser', 'slider', 'waits', 'http', 'browser']
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(message)s'
+
+# Attributes every LogRecord has. Anything else on a record was passed with `extra` and is kept as its own
+# field in structured events.
+STANDARD_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+
+    Formats every record as one JSON object per line: time, level, logger, subsystem, and message, plus
+    any fields passed with `extra` (e.g., char_name and game_version).
+
+    """
+
+    def format(self, record):
+        event = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created)) + f'.{int(record.msecs):03d}Z',
+            'level': record.levelname,
+            'logger': record.name,
+            'subsystem': record.name.split('.', 1)[1] if '.' in record.name else None,
+            'message': record.getMessage()
+        }
+
+        for key, value in vars(record).items():
+            if key not in STANDARD_RECORD_ATTRIBUTES:
+                event[key] = value
+
+        if record.exc_info:
+            event['exception'] = self.formatException(record.exc_info)
+
+        return json.dumps(event, default=str)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+
+    Puts records on the queue as they are. QueueHandler normally formats every message before queueing
+    it (so it can be pickled), which leaves the formatting on the logging thread. The queue here never
+    leaves the process, so formatting is left to the listener's thread.
+
+    """
+
+    def prepare(self, record):
+        return record
+
+
+# The listener started by this process, if any. Worker processes started by fork inherit the parent's
+# handler but not its listener thread, so the process ID is kept to tell them apart.
+_listener = None
+_listener_pid = None
+
+
+def stop_listener():
+    """
+
+    Writes out every queued record and stops the background listener.
+
+    """
+
+    global _listener, _listener_pid
+
+    if _listener is not None and _listener_pid == os.getpid():
+        _listener.stop()
+
+    _listener = None
+    _listener_pid = None
+
+
+def configure_logging(
+    config,  # Scraper config dictionary
+    logger_name = 'web_scraper'
+):
+    """
+
+    Sets up the scraper's logger from the config YAML and returns it.
+
+    With 'log_mode' set to 'file' (the default), records are written to the day's log file by a
+    FileHandler on the calling thread, and echoed to the console.
+
+    With 'log_mode' set to 'queue', records are put on an in-process queue and written out by a
+    QueueListener thread, so the scraper never waits on formatting or disk. 'log_format' picks text
+    (the default) or json (one structured event per line) for the log file, and 'log_to_console' turns
+    the console echo back on.
+
+    In either mode, 'log_levels' sets the level of each subsystem (e.g., {parser: WARNING}).
+
+    """
+
+    global _listener, _listener_pid
+
+    log_path = config['logging_dir'] + "web_scraper_" + time.strftime('%Y%m%d') + ".log"
+    logger = logging.getLogger(logger_name)
+
+    if config.get('log_mode', 'file') == 'queue':
+        # Every scraper in a process shares one listener.
+        if _listener_pid != os.getpid():
+            stop_listener()
+
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+
+            formatter = JsonFormatter() if config.get('log_format', 'text') == 'json' else logging.Formatter(LOG_FORMAT)
+
+            file_handler = logging.FileHandler(log_path)
+            file_handler.setFormatter(formatter)
+            handler_list = [file_handler]
+
+            if config.get('log_to_console', False):
+                console_handler = logging.StreamHandler()
+                console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+                handler_list.append(console_handler)
+
+            log_queue = queue.SimpleQueue()
+
+            _listener = logging.handlers.QueueListener(log_queue, *handler_list, respect_handler_level=True)
+            _listener.start()
+            _listener_pid = os.getpid()
+
+            atexit.register(stop_listener)
+
+            logger.addHandler(DeferredQueueHandler(log_queue))
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+    else:
+        logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
+        file_handler = logging.FileHandler(log_path)
+        file_handler.setLevel(logging.INFO)
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+        logger.addHandler(file_handler)
+
+    for subsystem, level in (config.get('log_levels') or {}).items():
+        if subsystem not in SUBSYSTEMS:
+            raise ValueError(f"Unknown logging subsystem: {subsystem}. Expected one of {SUBSYSTEMS}.")
+
+        logger.getChild(subsystem).setLevel(level.upper() if isinstance(level, str) else level)
+
+    return logger
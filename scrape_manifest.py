@@ -0,0 +1,101 @@
+import os
+import json
+
+
+class ScrapeManifest:
+    """
+
+    Remembers what every character's pages looked like the last time they were scraped, so that
+    characters whose pages haven't changed can skip parsing and reuse their previous rows.
+
+    Each entry is keyed by character name and game version, and holds:
+
+    1) page_hashes: the content hash of every page the character was parsed from, by page type
+       (None for pages that weren't there)
+    2) rework_pending and not_in_gl_yet: the flags the parse set, which decide the JP pass
+    3) outputs: which of the character's dataframes (ability_df, bt_effect_df, ha_cap_df) were
+       saved, so they can be carried forward from the intermediate store
+    4) scraped_at_utc: the start of the run that originally parsed the rows being carried forward
+
+    The manifest is read once when it's opened, so every lookup during a run compares against the
+    previous run. New entries are only written to disk when save() is called.
+
+    """
+
+    def __init__(self, manifest_path):
+        self.manifest_path = manifest_path
+
+        try:
+            with open(manifest_path, 'r') as manifest_file:
+                self.entries = json.load(manifest_file)
+        except FileNotFoundError:
+            self.entries = {}
+
+    @staticmethod
+    def entry_key(char_name, game_version):
+        """
+
+        Returns the manifest key for a character in a game version.
+
+        """
+
+        return f"{char_name}/{game_version}"
+
+    def unchanged_entry(self, char_name, game_version, page_hashes):
+        """
+
+        Returns the previous entry for a character if every page hash matches the previous run, or None
+        if the character is new or any page has changed, appeared, or disappeared.
+
+        """
+
+        entry = self.entries.get(self.entry_key(char_name, game_version))
+
+        if entry is None or entry['page_hashes'] != page_hashes:
+            return None
+
+        return entry
+
+    @staticmethod
+    def build_entry(result):
+        """
+
+        Returns the entry for a `scrape_character` result. Checkpoints use the same format.
+
+        """
+
+        return {
+            'page_hashes': result['page_hashes'],
+            'rework_pending': result['rework_pending'],
+            'not_in_gl_yet': result['not_in_gl_yet'],
+            'outputs': {
+                'ability_df': result['ability_df'] is not None,
+                'bt_effect_df': result['bt_effect_df'] is not None,
+                'ha_cap_df': result['ha_cap_df'] is not None
+            },
+            'scraped_at_utc': result['scraped_at_utc']
+        }
+
+    def record(self, result):
+        """
+
+        Adds (or replaces) a character's entry from a `scrape_character` result.
+
+        """
+
+        self.entries[self.entry_key(result['char_name'], result['game_version'])] = self.build_entry(result)
+
+    def save(self):
+        """
+
+        Writes the manifest to a temporary file, then moves it into place, so a crash mid-write never
+        leaves a half-written manifest behind.
+
+        """
+
+        temp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+
+        with open(temp_path, 'w') as temp_file:
+            json.dump(self.entries, temp_file, indent=2, sort_keys=True)
+
+        os.replace(temp_path, self.manifest_path)
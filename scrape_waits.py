@@ -0,0 +1,344 @@
+import time
+
+
+class PageWaiter:
+    """
+
+    Waits on real readiness signals from the browser instead of sleeping for a fixed amount of time.
+
+    There are three signals to wait on:
+
+    1) Element presence: a specific element shows up on the page.
+    2) Network idle: the page has finished loading and no new resources (e.g., the JSON the React
+       pages render from) have been requested for a short quiet period.
+    3) DOM stability: the number of elements on the page has stopped changing for a short quiet
+       period (e.g., after switching between GL and JP).
+
+    Lazy-loaded lists (e.g., the ability list) are collected by collect_lazy_list, which scrolls and
+    waits inside the browser and returns the finished page in one round trip.
+
+    Every wait has a timeout that depends on the page type (abilities, buffs, high_armor, etc.), which
+    can be set under 'wait_timeouts' in the config YAML. How long each wait actually took is recorded
+    in `wait_log`.
+
+    """
+
+    DEFAULT_TIMEOUTS = {
+        'characters': 10,
+        'abilities': 15,
+        'buffs': 10,
+        'high_armor': 10,
+        'high_armor_plus': 10
+    }
+
+    # Length of time the network or DOM must stay unchanged before a page is considered settled.
+    DEFAULT_QUIET_PERIOD = 0.5
+
+    POLL_FREQUENCY = 0.1
+
+    # CSS selectors of each page type's main content block, which for_page_ready waits for once the
+    # network is idle. Characters that don't have the content (e.g., no high armor, or not yet in GL)
+    # legitimately never show it, so this wait is short (see DEFAULT_ELEMENT_TIMEOUT).
+    DEFAULT_READY_SELECTORS = {
+        'characters': '.characterlink',
+        'abilities': "div[class='infotitle abilitydisplayfex ']",
+        'buffs': 'li.buffbutton',
+        'high_armor': "div[class='infonameholderenemybuff default_passive Buffbase']",
+        'high_armor_plus': "div[class='infonameholderenemybuff default_passive Buffbase']"
+    }
+
+    DEFAULT_ELEMENT_TIMEOUT = 3
+
+    # Counts resources with a PerformanceObserver rather than the resource timing buffer, which stops
+    # taking entries once it holds 250. The buffer is enlarged as well, for scripts that read it directly
+    # (e.g., ResourceBlocker's transfer sizes).
+    NETWORK_ACTIVITY_SCRIPT = """
+        if (window.__scrapeResourceCount === undefined) {
+            window.__scrapeResourceCount = 0;
+            performance.setResourceTimingBufferSize(100000);
+            new PerformanceObserver(list => {
+                window.__scrapeResourceCount += list.getEntries().length;
+            }).observe({type: 'resource', buffered: true});
+        }
+        return [document.readyState, window.__scrapeResourceCount];
+    """
+
+    DOM_SIZE_SCRIPT = """
+        return document.getElementsByTagName('*').length;
+    """
+
+    # Scrolls the page in steps while a MutationObserver records when elements were last inserted. Finishes
+    # once nothing has been inserted for the quiet period and either the item at marker_index contains the
+    # marker or the page can't scroll any further, or when the timeout runs out. Returns the page source the
+    # same way chromedriver's page_source does, so snapshots don't change.
+    LAZY_LIST_SCRIPT = """
+        const [itemSelector, marker, markerIndex, scrollStep, quietMs, timeoutMs] = arguments;
+        const done = arguments[arguments.length - 1];
+
+        const startedAt = performance.now();
+        let lastInsertAt = startedAt;
+        let scrolls = 0;
+
+        const observer = new MutationObserver(mutations => {
+            if (mutations.some(mutation => mutation.addedNodes.length)) {
+                lastInsertAt = performance.now();
+            }
+        });
+        observer.observe(document.body, {childList: true, subtree: true});
+
+        const markerFound = () => {
+            const items = document.querySelectorAll(itemSelector);
+            const item = items[markerIndex < 0 ? items.length + markerIndex : markerIndex];
+            return marker !== null && item !== undefined && item.textContent.includes(marker);
+        };
+
+        const tick = () => {
+            const now = performance.now();
+            const atBottom = window.innerHeight + window.scrollY >= document.documentElement.scrollHeight - 1;
+            const quiet = now - lastInsertAt >= quietMs;
+            const timedOut = now - startedAt >= timeoutMs;
+            const settled = quiet && (atBottom || markerFound());
+
+            if (settled || timedOut) {
+                observer.disconnect();
+                done({
+                    item_count: document.querySelectorAll(itemSelector).length,
+                    marker_found: markerFound(),
+                    scrolls: scrolls,
+                    timed_out: !settled,
+                    page_html: new XMLSerializer().serializeToString(document)
+                });
+                return;
+            }
+
+            if (!atBottom) {
+                window.scrollBy(0, scrollStep);
+                scrolls += 1;
+            }
+
+            setTimeout(tick, 100);
+        };
+
+        tick();
+    """
+
+    def __init__(
+        self,
+        logger,
+        timeouts = None,  # Dictionary of page type -> timeout in seconds. Overrides DEFAULT_TIMEOUTS.
+        quiet_period = None,  # Seconds without network/DOM changes before a page is considered settled
+        ready_selectors = None,  # Dictionary of page type -> CSS selector. Overrides DEFAULT_READY_SELECTORS.
+        element_timeout = None  # Seconds for_page_ready waits for the content block after the network is idle
+    ):
+        self.logger = logger
+
+        self.timeouts = dict(self.DEFAULT_TIMEOUTS)
+        self.timeouts.update(timeouts or {})
+
+        self.quiet_period = self.DEFAULT_QUIET_PERIOD if quiet_period is None else quiet_period
+
+        self.ready_selectors = dict(self.DEFAULT_READY_SELECTORS)
+        self.ready_selectors.update(ready_selectors or {})
+
+        self.element_timeout = self.DEFAULT_ELEMENT_TIMEOUT if element_timeout is None else element_timeout
+
+        self.wait_log = []
+
+    def timeout_for(self, page_type):
+        """
+
+        Returns the timeout for a page type. Page types that are variations of another page type
+        (e.g., 'buffs_enemies_1') use the timeout of the page type they start with.
+
+        """
+
+        for known_page_type in sorted(self.timeouts, key=len, reverse=True):
+            if page_type.startswith(known_page_type):
+                return self.timeouts[known_page_type]
+
+        return max(self.timeouts.values())
+
+    def ready_selector_for(self, page_type):
+        """
+
+        Returns the CSS selector of a page type's content block, matched the same way as timeouts, or None.
+
+        """
+
+        for known_page_type in sorted(self.ready_selectors, key=len, reverse=True):
+            if page_type.startswith(known_page_type):
+                return self.ready_selectors[known_page_type]
+
+        return None
+
+    def for_element(
+        self,
+        driver,
+        page_type,
+        locator,
+        timeout = None  # Seconds to wait. Defaults to the page type's timeout.
+    ):
+        """
+
+        Waits for an element to be present on the page. Returns the element, or None if it didn't
+        show up before the timeout.
+
+        """
+
+        # Imported here so scrapers that never start a browser don't import selenium.
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
+        started_at = time.perf_counter()
+
+        try:
+            element = WebDriverWait(
+                driver,
+                timeout=self.timeout_for(page_type) if timeout is None else timeout,
+                poll_frequency=self.POLL_FREQUENCY
+            ).until(
+                EC.presence_of_element_located(locator)
+            )
+            timed_out = False
+        except TimeoutException:
+            element = None
+            timed_out = True
+
+        self._record(page_type, 'element', started_at, timed_out)
+
+        return element
+
+    def for_network_idle(self, driver, page_type):
+        """
+
+        Waits until the document has loaded and no new resources have been requested for the quiet period.
+
+        """
+
+        return self._wait_until_unchanged(driver, page_type, 'network_idle', self.NETWORK_ACTIVITY_SCRIPT)
+
+    def for_dom_stable(self, driver, page_type):
+        """
+
+        Waits until the number of elements on the page stops changing for the quiet period.
+
+        """
+
+        return self._wait_until_unchanged(driver, page_type, 'dom_stable', self.DOM_SIZE_SCRIPT)
+
+    def for_page_ready(self, driver, page_type):
+        """
+
+        Waits for a freshly loaded page to finish its network requests, show its content block, and
+        finish rendering. A missing content block doesn't make the page unready, since some characters
+        don't have one; it only ends that wait early.
+
+        """
+
+        network_idle = self.for_network_idle(driver, page_type)
+
+        ready_selector = self.ready_selector_for(page_type)
+
+        if ready_selector is not None:
+            self.for_element(driver, page_type, ('css selector', ready_selector), timeout=self.element_timeout)
+
+        dom_stable = self.for_dom_stable(driver, page_type)
+
+        return network_idle and dom_stable
+
+    def collect_lazy_list(
+        self,
+        driver,
+        page_type,
+        item_selector,  # CSS selector matching every item of the list
+        marker = None,  # Text that shows up in the item at marker_index once the whole list has loaded
+        marker_index = -1,  # Index of the item to check for the marker (negative counts from the end)
+        scroll_step = 1000  # Pixels scrolled per step
+    ):
+        """
+
+        Scrolls a lazy-loaded list to its end and waits for it to settle, all inside one asynchronous script,
+        so the cost doesn't grow with the length of the list. Returns a dictionary with the page's HTML,
+        the number of items, whether the marker was found, and how many scroll steps were taken.
+
+        """
+
+        started_at = time.perf_counter()
+        timeout = self.timeout_for(page_type)
+
+        driver.set_script_timeout(timeout + 5)
+
+        result = driver.execute_async_script(
+            self.LAZY_LIST_SCRIPT,
+            item_selector, marker, marker_index, scroll_step, int(self.quiet_period * 1000), int(timeout * 1000)
+        )
+
+        self._record(page_type, 'lazy_list', started_at, result['timed_out'])
+
+        return result
+
+    def total_wait_seconds(self):
+        """
+
+        Returns the total number of seconds spent waiting so far.
+
+        """
+
+        return sum(wait['seconds'] for wait in self.wait_log)
+
+    def _wait_until_unchanged(self, driver, page_type, wait_name, script):
+        """
+
+        Polls a script until its result has been the same for the quiet period (and, for network
+        waits, the document has finished loading). Returns False if the page type's timeout is
+        reached first.
+
+        """
+
+        started_at = time.perf_counter()
+        deadline = started_at + self.timeout_for(page_type)
+
+        last_value = None
+        unchanged_since = None
+        timed_out = True
+
+        while time.perf_counter() < deadline:
+            value = driver.execute_script(script)
+            now = time.perf_counter()
+
+            document_loading = isinstance(value, list) and value[0] != 'complete'
+
+            if value != last_value or document_loading:
+                last_value = value
+                unchanged_since = now
+            elif now - unchanged_since >= self.quiet_period:
+                timed_out = False
+                break
+
+            time.sleep(self.POLL_FREQUENCY)
+
+        self._record(page_type, wait_name, started_at, timed_out)
+
+        return not timed_out
+
+    def _record(self, page_type, wait_name, started_at, timed_out):
+        """
+
+        Adds a wait's duration to the wait log.
+
+        """
+
+        seconds = time.perf_counter() - started_at
+
+        self.wait_log.append({
+            'page_type': page_type,
+            'wait': wait_name,
+            'seconds': seconds,
+            'timed_out': timed_out
+        })
+
+        if timed_out:
+            self.logger.info("Timed out after %.2fs waiting for %s on %s page.", seconds, wait_name, page_type)
+        else:
+            self.logger.info("Waited %.2fs for %s on %s page.", seconds, wait_name, page_type)
@@ -0,0 +1,159 @@
+import re
+
+
+class SliderController:
+    """
+
+    Moves the BT effect sliders (stack sliders and Lann & Reynn's enemy-count slider) to a target fill
+    percentage, read from the style of the slider's width element (e.g., 'width: 50%;').
+
+    drag_and_drop_by_offset presses the middle of the slider and drags by an offset from there, so the
+    offset for a target is worked out from the slider's width:
+
+    1) One script call reads the slider's width and current fill, and the slider is dragged straight to
+       the target. Targets of 0% and 100% are overshot past the slider's ends, which clamp.
+    2) If the fill doesn't land on the target (e.g., the slider snaps to steps that don't line up with
+       its width), the offset is bisected between the slider's ends until it does.
+    3) If a drag to one of the ends lands on the wrong side of the target (e.g., the track was still being
+       laid out when it was measured), the slider is measured again and that end is moved out past both
+       the new width and the last offset, so the bisection isn't stuck between bounds that can't reach.
+
+    Every move costs one driver call for the drag and one to read the fill back, and at most `max_drags`
+    drags are made per target. The number of driver calls is logged for every target.
+
+    """
+
+    # Read the slider's width and its current fill in one round trip.
+    MEASURE_SCRIPT = "return [arguments[0].getBoundingClientRect().width, arguments[1].style.width];"
+
+    WIDTH_PATTERN = re.compile(r'width:\s*([\d.]+)%')
+
+    def __init__(
+        self,
+        logger,
+        max_drags = 10,  # Most drags made to reach one target before giving up
+        overshoot = 10  # Pixels dragged past the slider's end for targets of 0% and 100%
+    ):
+        self.logger = logger
+        self.max_drags = max_drags
+        self.overshoot = overshoot
+
+    @classmethod
+    def fill_percentage(cls, style):
+        """
+
+        Returns the fill percentage in a width element's style (e.g., 'width: 50%;' -> 50.0), or None if it
+        has none.
+
+        """
+
+        width_match = cls.WIDTH_PATTERN.search(style or '')
+
+        return float(width_match.group(1)) if width_match else None
+
+    def drag(self, driver, slider, offset, width_element):
+        """
+
+        Drags a slider by an offset from its middle and returns the fill percentage it ends up at. Costs two
+        driver calls.
+
+        """
+
+        # Imported here so scrapers that never start a browser don't import selenium.
+        from selenium.webdriver.common.action_chains import ActionChains
+
+        ActionChains(driver).drag_and_drop_by_offset(slider, round(offset), 0).perform()
+
+        return self.fill_percentage(width_element.get_attribute('style'))
+
+    def set_fill(
+        self,
+        driver,
+        slider,  # Slider WebElement (dragged from its middle)
+        width_element,  # WebElement whose style holds the slider's fill width
+        target_percentage,  # Fill percentage to reach (e.g., 100 for max stacks)
+        label = 'slider'  # Name used in the log
+    ):
+        """
+
+        Moves a slider to the target fill percentage. Returns True once it's there, or False if it couldn't be
+        reached within max_drags drags.
+
+        """
+
+        slider_width, style = driver.execute_script(self.MEASURE_SCRIPT, slider, width_element)
+        fill = self.fill_percentage(style)
+        driver_calls = 1
+        drags = 0
+
+        half_width = slider_width / 2
+        low, high = -half_width - self.overshoot, half_width + self.overshoot
+
+        if 0 < target_percentage < 100:
+            offset = (target_percentage / 100 - 0.5) * slider_width
+        else:
+            offset = self.next_offset(low, high, target_percentage)
+
+        while not self.reached(fill, target_percentage) and drags < self.max_drags:
+            # After the first drag, bisect: the fill only ever grows with the offset.
+            if drags > 0:
+                short = fill is None or fill < target_percentage
+
+                if short:
+                    low = offset
+                else:
+                    high = offset
+
+                if low >= high:
+                    # An end was dragged to and the fill is still on the wrong side of the target, so the
+                    # track is wider than measured. Move that end out past the new width and the last offset.
+                    slider_width, _ = driver.execute_script(self.MEASURE_SCRIPT, slider, width_element)
+                    driver_calls += 1
+                    reach = max(slider_width / 2 + self.overshoot, 2 * abs(offset))
+
+                    if short:
+                        high = reach
+                    else:
+                        low = -reach
+
+                offset = self.next_offset(low, high, target_percentage)
+
+            fill = self.drag(driver, slider, offset, width_element)
+            driver_calls += 2
+            drags += 1
+
+        reached = self.reached(fill, target_percentage)
+
+        self.logger.info(
+            "%s %s %s%% (at %s%%) after %s drags and %s driver calls.",
+            label, "set to" if reached else "couldn't reach", target_percentage, fill, drags, driver_calls
+        )
+
+        return reached
+
+    @staticmethod
+    def next_offset(low, high, target_percentage):
+        """
+
+        Returns the next offset to drag to between two bounds. Targets of 0% and 100% go straight to the
+        end, and everything else to the midpoint.
+
+        """
+
+        if target_percentage >= 100:
+            return high
+
+        if target_percentage <= 0:
+            return low
+
+        return (low + high) / 2
+
+    @staticmethod
+    def reached(fill, target_percentage):
+        """
+
+        Returns True if a fill percentage is on the target.
+
+        """
+
+        return fill is not None and abs(fill - target_percentage) < 0.5
@@ -0,0 +1,259 @@
+import os
+import sys
+import gzip
+import hashlib
+import logging
+import argparse
+from urllib.parse import unquote, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class SnapshotStore:
+    """
+
+    A content-addressed store for rendered Dissidia Compendium pages. Every snapshot is keyed by
+    character name, game version, page type, and the SHA-256 hash of the page's HTML, so saving
+    the same page twice costs nothing, and old versions of a page stay around for comparison.
+
+    Layout on disk:
+
+        <snapshot_dir>/<char_name>/<game_version>/<page_type>/<content_hash>.html.gz
+        <snapshot_dir>/<char_name>/<game_version>/<page_type>/LATEST
+
+    LATEST holds the content hash of the most recently saved snapshot for that key. Every file is
+    written to a temporary path first and then moved into place, so a crash mid-write never
+    leaves a half-written snapshot behind.
+
+    """
+
+    LATEST_FILE_NAME = 'LATEST'
+    SNAPSHOT_SUFFIX = '.html.gz'
+
+    def __init__(self, snapshot_dir):
+        self.snapshot_dir = snapshot_dir
+
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+
+    @staticmethod
+    def content_hash(page_html):
+        """
+
+        Returns the SHA-256 hex digest of a page's HTML.
+
+        """
+
+        return hashlib.sha256(page_html.encode('utf-8')).hexdigest()
+
+    def page_dir(self, char_name, page_type, game_version):
+        """
+
+        Returns the directory that holds every snapshot for one character, page type, and game version.
+
+        """
+
+        return os.path.join(self.snapshot_dir, char_name, game_version, page_type)
+
+    def save(self, char_name, page_type, game_version, page_html):
+        """
+
+        Saves a page's HTML to the store and marks it as the latest snapshot for its key. Returns
+        the page's content hash.
+
+        """
+
+        content_hash = self.content_hash(page_html)
+
+        page_dir = self.page_dir(char_name, page_type, game_version)
+        os.makedirs(page_dir, exist_ok=True)
+
+        snapshot_path = os.path.join(page_dir, content_hash + self.SNAPSHOT_SUFFIX)
+
+        if not os.path.exists(snapshot_path):
+            self._atomic_write(snapshot_path, gzip.compress(page_html.encode('utf-8')))
+
+        self._atomic_write(os.path.join(page_dir, self.LATEST_FILE_NAME), content_hash.encode('utf-8'))
+
+        return content_hash
+
+    def latest_hash(self, char_name, page_type, game_version):
+        """
+
+        Returns the content hash of the latest snapshot for a key, or None if the page has never
+        been saved.
+
+        """
+
+        latest_path = os.path.join(self.page_dir(char_name, page_type, game_version), self.LATEST_FILE_NAME)
+
+        try:
+            with open(latest_path, 'r') as latest_file:
+                return latest_file.read().strip()
+        except FileNotFoundError:
+            return None
+
+    def load(self, char_name, page_type, game_version, content_hash=None):
+        """
+
+        Returns a page's HTML from the store. Loads the latest snapshot unless a specific content
+        hash is given. Returns None if there's no matching snapshot.
+
+        """
+
+        if content_hash is None:
+            content_hash = self.latest_hash(char_name, page_type, game_version)
+
+            if content_hash is None:
+                return None
+
+        snapshot_path = os.path.join(
+            self.page_dir(char_name, page_type, game_version),
+            content_hash + self.SNAPSHOT_SUFFIX
+        )
+
+        try:
+            with open(snapshot_path, 'rb') as snapshot_file:
+                return gzip.decompress(snapshot_file.read()).decode('utf-8')
+        except FileNotFoundError:
+            return None
+
+    def get_page(self, char_name, page_type, game_version, char_links=None):
+        """
+
+        Returns the latest snapshot of a page. Lets the store act as the scraper's page backend in
+        replay mode, alongside the HTTP backend. Snapshots are found by character name, so char_links
+        isn't used.
+
+        """
+
+        return self.load(char_name, page_type, game_version)
+
+    def has_snapshot(self, char_name, page_type, game_version):
+        """
+
+        Returns True if the store holds at least one snapshot for the key.
+
+        """
+
+        return self.latest_hash(char_name, page_type, game_version) is not None
+
+    def characters(self):
+        """
+
+        Returns a sorted list of every character with at least one snapshot in the store.
+
+        """
+
+        return sorted(
+            entry for entry in os.listdir(self.snapshot_dir)
+            if os.path.isdir(os.path.join(self.snapshot_dir, entry)) and not entry.startswith('_')
+        )
+
+    @staticmethod
+    def _atomic_write(path, data):
+        """
+
+        Writes bytes to a temporary file next to `path`, then moves it into place.
+
+        """
+
+        temp_path = f"{path}.{os.getpid()}.tmp"
+
+        with open(temp_path, 'wb') as temp_file:
+            temp_file.write(data)
+
+        os.replace(temp_path, path)
+
+
+class SnapshotRequestHandler(BaseHTTPRequestHandler):
+    """
+
+    Serves the latest snapshots in a SnapshotStore, so recorded pages can be replayed by tools that fetch
+    pages over HTTP instead of reading the store's directory. Pages are served at either:
+
+    1) /<char_name>/<game_version>/<page_type>
+    2) the path of the page's link on the website (/characters/<char_name>/...), with version and page_type
+       in the query, as built by HttpFetchBackend.link_url
+
+    """
+
+    snapshot_store = None
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        path_parts = [unquote(part) for part in path.strip('/').split('/')]
+        query_dict = {name: value_list[-1] for name, value_list in parse_qs(query, keep_blank_values=True).items()}
+
+        page_key = None
+
+        if len(path_parts) >= 2 and path_parts[0] == 'characters' and 'version' in query_dict and 'page_type' in query_dict:
+            page_key = (path_parts[1], query_dict['version'], query_dict['page_type'])
+        elif len(path_parts) == 3:
+            page_key = tuple(path_parts)
+
+        page_html = None
+
+        if page_key is not None and all(page_key) and not any(part in ('.', '..') or '/' in part for part in page_key):
+            char_name, game_version, page_type = page_key
+            page_html = self.snapshot_store.load(char_name, page_type, game_version)
+
+        if page_html is None:
+            self.send_error(404)
+            return
+
+        body = page_html.encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.getLogger(__name__).debug(format, *args)
+
+
+def serve_snapshot_store(snapshot_dir, host='localhost', port=8000):
+    """
+
+    Returns a server that serves the latest pages in a snapshot store. Call serve_forever() on the result
+    to start it.
+
+    """
+
+    handler_class = type(
+        'BoundSnapshotRequestHandler',
+        (SnapshotRequestHandler,),
+        {'snapshot_store': SnapshotStore(snapshot_dir)}
+    )
+
+    return ThreadingHTTPServer((host, port), handler_class)
+
+
+def main():
+    """
+
+    Serves a snapshot store over HTTP from the command line.
+
+    """
+
+    arg_parser = argparse.ArgumentParser(description="Serve the latest pages in a snapshot store over HTTP.")
+    arg_parser.add_argument('snapshot_dir', help="Directory of the snapshot store to serve.")
+    arg_parser.add_argument('--host', default='localhost')
+    arg_parser.add_argument('--port', type=int, default=8000)
+    args = arg_parser.parse_args()
+
+    if not os.path.isdir(args.snapshot_dir):
+        sys.exit(f"{args.snapshot_dir} is not a directory.")
+
+    server = serve_snapshot_store(args.snapshot_dir, host=args.host, port=args.port)
+
+    print(f"Serving {args.snapshot_dir} at http://{args.host}:{args.port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+import os
+import sys
+import yaml
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The scraper's modules live at the top of the repo rather than in a package.
+sys.path.insert(0, REPO_DIR)
+
+
+@pytest.fixture
+def config_yml_path(tmp_path):
+    """
+
+    Writes a scraper config YAML whose output directories are all under tmp_path, and returns its path.
+
+    """
+
+    (tmp_path / 'logs').mkdir()
+
+    config = {
+        'logging_dir': f"{tmp_path / 'logs'}/",
+        'snapshot_dir': str(tmp_path / 'snapshots'),
+        'temp_ability_df_dir': f"{tmp_path / 'temp_ability_dfs'}/",
+        'temp_bt_effect_df_dir': f"{tmp_path / 'temp_bt_effect_dfs'}/",
+        'temp_ha_cap_df_dir': f"{tmp_path / 'temp_ha_cap_dfs'}/",
+        'datasets_dir': f"{tmp_path}/",
+        'ability_overrides_path': os.path.join(REPO_DIR, 'datasets', 'ability_overrides.csv')
+    }
+
+    config_path = tmp_path / 'config.yml'
+    config_path.write_text(yaml.safe_dump(config))
+
+    return str(config_path)
@@ -0,0 +1,96 @@
+import pandas as pd
+import pytest
+from conftest import REPO_DIR
+from ability_overrides import AbilityOverrides
+
+RULE_COLUMNS = [
+    'rule', 'char_name', 'ability_name', 'game_version', 'hp_dmg_cap_up_perc', 'main_target_hp_attacks',
+    'non_target_hp_attacks', 'followup_name', 'attribute_list', 'note'
+]
+
+
+def rule_df(*rule_list):
+    return pd.DataFrame([dict(zip(RULE_COLUMNS, rule)) for rule in rule_list], columns=RULE_COLUMNS)
+
+
+def ability_df(*row_list):
+    return pd.DataFrame(
+        [
+            {
+                'char_name': char_name,
+                'ability_name': ability_name,
+                'ability_id': ability_id,
+                'game_version': game_version,
+                'hp_dmg_cap_up_perc': hp_dmg_cap_up_perc,
+                'main_target_hp_attacks': main_target_hp_attacks,
+                'non_target_hp_attacks': non_target_hp_attacks,
+                'attribute_list': ['Melee']
+            }
+            for char_name, ability_name, ability_id, game_version, hp_dmg_cap_up_perc, main_target_hp_attacks, non_target_hp_attacks in row_list
+        ]
+    )
+
+
+def test_repo_rules_load():
+    AbilityOverrides.from_csv(f"{REPO_DIR}/datasets/ability_overrides.csv")
+
+
+def test_unknown_rule_is_rejected():
+    with pytest.raises(ValueError):
+        AbilityOverrides(rule_df(('cap_everything', None, 'Holy', None, 900, None, None, None, None, None)))
+
+
+def test_fix_hp_cap_prefers_character_rules():
+    overrides = AbilityOverrides(rule_df(
+        ('fix_hp_cap', 'aerith', 'Holy', None, 400, None, None, None, None, None),
+        ('fix_hp_cap', None, 'Holy', None, 50, None, None, None, None, None)
+    ))
+
+    df = overrides.apply(ability_df(('aerith', 'Holy', '1', 'GL', 10, 1, 0), ('yuna', 'Holy', '2', 'GL', 10, 1, 0)))
+
+    assert df['hp_dmg_cap_up_perc'].tolist() == [400, 50]
+
+
+def test_uncapped_adds_the_attribute():
+    overrides = AbilityOverrides(rule_df(('uncapped', 'leonora', 'Flare', None, 900, None, None, None, None, None)))
+
+    df = overrides.apply(ability_df(('leonora', 'Flare', '1', 'JP', 0, 1, 0)))
+
+    assert df.loc[0, 'hp_dmg_cap_up_perc'] == 900
+    assert df.loc[0, 'attribute_list'] == ['Uncapped', 'Melee']
+
+
+def test_split_uncapped_only_matches_its_game_version():
+    overrides = AbilityOverrides(rule_df(('split_uncapped', None, 'Soul Burst', 'GL', 900, 1, 0, 'Soul Burst (Uncapped HP Attack)', None, None)))
+
+    df = overrides.apply(ability_df(('lenna', 'Soul Burst', '1', 'GL', 20, 3, 0), ('lenna', 'Soul Burst', '1', 'JP', 20, 3, 0)))
+
+    assert df[['ability_name', 'game_version', 'hp_dmg_cap_up_perc', 'main_target_hp_attacks']].values.tolist() == [
+        ['Soul Burst (Uncapped HP Attack)', 'GL', 900, 1],
+        ['Soul Burst', 'GL', 20, 2],
+        ['Soul Burst', 'JP', 20, 3]
+    ]
+    assert df.loc[0, 'attribute_list'] == ['FollowUp', 'Melee']
+
+
+def test_add_followup_goes_after_the_characters_abilities():
+    overrides = AbilityOverrides(rule_df(('add_followup', 'seymour', 'Chainspell - Follow Up', 'GL', 20, 4, 0, None, "['Magic', 'FollowUp']", None)))
+
+    df = overrides.apply(ability_df(
+        ('seymour', 'Chainspell', '1', 'GL', 0, 1, 0),
+        ('seymour', 'Anima', '2', 'GL', 0, 1, 0),
+        ('yuna', 'Holy', '3', 'GL', 0, 1, 0)
+    ))
+
+    assert df['ability_name'].tolist() == ['Chainspell', 'Anima', 'Chainspell - Follow Up', 'Holy']
+    assert df.loc[2, 'attribute_list'] == ['Magic', 'FollowUp']
+    assert pd.isna(df.loc[2, 'ability_id'])
+
+
+def test_saved_attribute_lists_are_parsed():
+    overrides = AbilityOverrides(rule_df(('uncapped', None, 'Flare', None, 900, None, None, None, None, None)))
+
+    df = ability_df(('leonora', 'Flare', '1', 'GL', 0, 1, 0))
+    df['attribute_list'] = "['Magic']"
+
+    assert overrides.apply(df).loc[0, 'attribute_list'] == ['Uncapped', 'Magic']
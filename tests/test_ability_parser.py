@@ -0,0 +1,87 @@
+"""
+
+Unit tests for HpAttackParser.
+
+The pages in tests/fixtures/synthetic_ability_pages are synthetic, not recordings of Dissidia Compendium. Their
+ability blocks were written by hand in the layouts HpAttackParser documents, and each one holds the counts the
+parser should read from it in data-expected. They check the parser against those layouts, not against the
+site; regression_harness.py is what compares parses of recorded pages against the golden CSVs.
+
+"""
+
+import os
+import glob
+import logging
+import pytest
+from bs4 import BeautifulSoup
+from conftest import REPO_DIR
+from ability_parser import HpAttackParser
+
+FIXTURE_DIR = os.path.join(REPO_DIR, 'tests', 'fixtures', 'synthetic_ability_pages')
+
+HP = '<span class="inline HP"></span>'
+BRV = '<span class="inline BRV"></span>'
+
+
+def prettified_lines(ability_block_html):
+    # The same lines CompendiumScraper.prettify_html_to_list produces.
+    return BeautifulSoup(f'<div class="bluebase abilityinfobase">{ability_block_html}</div>', 'lxml').prettify().split('\n')
+
+
+def synthetic_ability_blocks():
+    for page_path in sorted(glob.glob(os.path.join(FIXTURE_DIR, '*.html'))):
+        with open(page_path, 'r') as page_file:
+            soup = BeautifulSoup(page_file.read(), 'lxml')
+
+        for ability_title, ability_block in zip(soup.select('div.infotitle'), soup.select('div.abilityinfobase')):
+            ability_name = ability_title.get_text().rsplit(' - #', 1)[0]
+            expected = tuple(int(count) for count in ability_block.attrs.pop('data-expected').split())
+
+            yield pytest.param(
+                ability_name, ''.join(str(child) for child in ability_block.children), expected,
+                id=f"{os.path.basename(page_path)[:-len('.html')]}-{ability_name}"
+            )
+
+
+@pytest.fixture
+def parser():
+    return HpAttackParser(logging.getLogger('test_ability_parser'))
+
+
+@pytest.mark.parametrize('ability_block, expected', [
+    (f'<div>Single-target{BRV}{HP}Attack</div>', (1, 0, 0)),
+    (f'<div>{BRV}{HP}Attack 3 times</div>', (3, 0, 0)),
+    (f'<div>Group{BRV}{HP}Attack</div>', (1, 1, 0)),
+    (f'<div>{BRV}{HP}Group 4 times</div>', (4, 4, 0)),
+    (f'<div>{BRV}{HP}Attack 5 times</div><div>{HP}Damage to non-targets after each HP Attack, except last</div>', (5, 4, 0)),
+    (f'<div>{BRV}{HP}Attack 2 times</div><div>{HP}Damage to non-targets × 3</div>', (2, 3, 0)),
+    (f'<div>{BRV}{HP}Damage to target<span>30%</span>of stored value from<span>Sword Dance</span><span>Group 3 times</span></div>', (3, 3, 0)),
+], ids=[
+    'single_target', 'attack_times', 'group', 'group_times', 'non_targets_after_each_except_last', 'non_targets_multiplier',
+    'stored_value'
+])
+def test_hp_attack_layouts(parser, ability_block, expected):
+    assert parser.parse('Test Ability', prettified_lines(ability_block)) == expected
+
+
+@pytest.mark.parametrize('cap_up_html', [
+    '<div>MAX BRV Cap Up by<span>20%</span></div>',
+    '<div><span>- MAX BRV Cap</span><span>Up</span><span>20%</span></div>'
+], ids=['ability', 'fe'])
+def test_cap_up_layouts(parser, cap_up_html):
+    assert parser.parse('Test Ability', prettified_lines(f'<div>{BRV}{HP}Attack</div>{cap_up_html}')) == (1, 0, 20)
+
+
+def test_hp_icon_after_attack_is_not_counted(parser):
+    ability_block = f'<div>{BRV}{HP}Attack</div><div>HP Damage based on <span>BRV Attack</span>{HP}</div>'
+
+    assert parser.parse('Test Ability', prettified_lines(ability_block)) == (1, 0, 0)
+
+
+def test_no_hp_attack(parser):
+    assert parser.parse('Test Ability', prettified_lines('<div>Grant <span>Faith</span> to self for <span>3</span> turns</div>')) == (0, 0, 0)
+
+
+@pytest.mark.parametrize('ability_name, ability_block, expected', list(synthetic_ability_blocks()))
+def test_synthetic_ability_blocks(parser, ability_name, ability_block, expected):
+    assert parser.parse(ability_name, prettified_lines(ability_block)) == expected
@@ -0,0 +1,51 @@
+import logging
+import pytest
+from navigation_plan import NavigationPlanner
+from web_scraper import CompendiumScraper
+
+
+class FakeDriver:
+
+    def execute_script(self, script, *args):
+        return None
+
+
+@pytest.fixture
+def scraper():
+    # Only the attributes capture_jp_in_place uses, without starting a browser.
+    scraper = CompendiumScraper.__new__(CompendiumScraper)
+    scraper.logger = logging.getLogger('test_capture_jp_in_place')
+    scraper.driver = FakeDriver()
+    scraper.navigation_planner = NavigationPlanner(scraper.logger)
+    scraper.version_switch_list = []
+    scraper.switch_version = lambda char_name, page_type, JP=False: scraper.version_switch_list.append(JP) or True
+
+    return scraper
+
+
+def test_captured_pages_are_held(scraper):
+    scraper.capture_jp_in_place('aerith', 'high_armor', lambda: {'high_armor': '<html></html>', 'high_armor_plus': None})
+
+    assert scraper.navigation_planner.take_pages('aerith', 'JP') == {
+        ('aerith', 'high_armor', 'JP'): '<html></html>',
+        ('aerith', 'high_armor_plus', 'JP'): None
+    }
+    assert scraper.version_switch_list == [True, False]
+
+
+def test_failed_capture_holds_nothing(scraper):
+    scraper.capture_jp_in_place('aerith', 'buffs', lambda: None)
+
+    assert scraper.navigation_planner.take_pages('aerith', 'JP') == {}
+    assert scraper.navigation_planner.saved_load_count == 0
+    assert scraper.version_switch_list == [True, False]
+
+
+def test_capture_that_raises_holds_nothing(scraper):
+    def capture():
+        raise RuntimeError("stale element")
+
+    scraper.capture_jp_in_place('aerith', 'abilities', capture)
+
+    assert scraper.navigation_planner.take_pages('aerith', 'JP') == {}
+    assert scraper.version_switch_list == [True, False]
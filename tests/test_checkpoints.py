@@ -0,0 +1,28 @@
+from checkpoints import CheckpointStore
+from scrape_manifest import ScrapeManifest
+from test_scrape_manifest import scrape_result
+
+
+def test_checkpoint_round_trip(tmp_path):
+    checkpoint_store = CheckpointStore(str(tmp_path / 'checkpoints'))
+
+    assert checkpoint_store.resume_run() is None
+    assert checkpoint_store.load('aerith', 'GL') is None
+
+    checkpoint_store.start_run('2026-01-01 00:00:00')
+    checkpoint_store.save('aerith', 'GL', ScrapeManifest.build_entry(scrape_result()))
+
+    assert checkpoint_store.resume_run() == '2026-01-01 00:00:00'
+    assert checkpoint_store.load('aerith', 'GL')['page_hashes'] == {'abilities': 'a1', 'buffs': None}
+    assert checkpoint_store.load('aerith', 'JP') is None
+
+
+def test_start_run_clears_old_checkpoints(tmp_path):
+    checkpoint_store = CheckpointStore(str(tmp_path / 'checkpoints'))
+    checkpoint_store.start_run('2026-01-01 00:00:00')
+    checkpoint_store.save('aerith', 'GL', {})
+
+    checkpoint_store.start_run('2026-01-02 00:00:00')
+
+    assert checkpoint_store.resume_run() == '2026-01-02 00:00:00'
+    assert checkpoint_store.load('aerith', 'GL') is None
@@ -0,0 +1,100 @@
+"""
+
+Runs the regression harness over the golden CSVs in character_ability_test_cases.
+
+The golden CSVs only mean something against recorded Dissidia Compendium pages, so the golden tests read a
+snapshot store of recordings (snapshot_store.py) from RECORDED_SNAPSHOT_DIR, and skip when it isn't set or
+holds no recorded ability page for a test case. Any Selenium run whose config has a 'snapshot_dir'
+records the pages it renders there.
+
+"""
+
+import os
+import pytest
+import yaml
+from conftest import REPO_DIR
+from snapshot_store import SnapshotStore
+from regression_harness import RegressionHarness
+
+TEST_CASE_DIR = os.path.join(REPO_DIR, 'character_ability_test_cases')
+FIXTURE_DIR = os.path.join(REPO_DIR, 'tests', 'fixtures', 'synthetic_ability_pages')
+RECORDED_SNAPSHOT_DIR = os.environ.get('RECORDED_SNAPSHOT_DIR')
+
+GOLDEN_CHAR_NAME_LIST = sorted(
+    file_name[:-len(RegressionHarness.TEST_CASE_SUFFIX)]
+    for file_name in os.listdir(TEST_CASE_DIR)
+    if file_name.endswith(RegressionHarness.TEST_CASE_SUFFIX)
+)
+
+
+@pytest.fixture
+def harness(config_yml_path):
+    return RegressionHarness(config_yml_path, test_case_dir=TEST_CASE_DIR)
+
+
+@pytest.fixture
+def recorded_harness(config_yml_path):
+    if not RECORDED_SNAPSHOT_DIR:
+        pytest.skip("RECORDED_SNAPSHOT_DIR isn't set, so there are no recorded ability pages to check the golden CSVs against")
+
+    with open(config_yml_path, 'r') as config_file:
+        config = yaml.safe_load(config_file)
+
+    config['snapshot_dir'] = RECORDED_SNAPSHOT_DIR
+
+    with open(config_yml_path, 'w') as config_file:
+        yaml.safe_dump(config, config_file)
+
+    return RegressionHarness(config_yml_path, test_case_dir=TEST_CASE_DIR)
+
+
+@pytest.mark.parametrize('char_name', GOLDEN_CHAR_NAME_LIST)
+def test_golden_passes_on_recorded_page(recorded_harness, char_name):
+    if not SnapshotStore(RECORDED_SNAPSHOT_DIR).has_snapshot(char_name, 'abilities', 'GL'):
+        pytest.skip(f"{RECORDED_SNAPSHOT_DIR} has no recorded GL ability page for {char_name}")
+
+    [result] = recorded_harness.run([char_name])
+
+    assert (result['status'], result['differences']) == ('passed', [])
+
+
+def test_missing_snapshot_is_reported(harness, tmp_path):
+    (tmp_path / 'nobody_ability_df.csv').write_text('ability_name,main_target_hp_attacks,non_target_hp_attacks,hp_dmg_cap_up_perc\n')
+    harness.test_case_dir = str(tmp_path)
+
+    assert harness.run() == [{'char_name': 'nobody', 'status': 'no_snapshot', 'seconds': 0, 'differences': []}]
+
+
+def test_diff_reports_mismatches_and_missing_rows(harness):
+    import pandas as pd
+
+    expected_df = pd.DataFrame({
+        'ability_name': ['Holy', 'Holy', 'Flare'],
+        'main_target_hp_attacks': [1, 2, 1],
+        'non_target_hp_attacks': [0, 0, 0],
+        'hp_dmg_cap_up_perc': [0, 0, 20]
+    })
+    parsed_df = pd.DataFrame({
+        'ability_name': ['Holy', 'Holy'],
+        'main_target_hp_attacks': [1, 3],
+        'non_target_hp_attacks': [0, 0],
+        'hp_dmg_cap_up_perc': [0, 0]
+    })
+
+    assert harness.diff(expected_df, parsed_df) == [
+        {'ability_name': 'Holy', 'column': 'main_target_hp_attacks', 'expected': 2, 'parsed': 3},
+        {'ability_name': 'Flare', 'column': None, 'expected': 'row', 'parsed': 'missing'}
+    ]
+
+
+def test_each_parse_stage_is_timed_once_per_character(config_yml_path):
+    # Any page will do for timing, so this uses one of the parser's synthetic pages.
+    with open(os.path.join(FIXTURE_DIR, 'aerith.html'), 'r') as page_file:
+        SnapshotStore(os.path.join(os.path.dirname(config_yml_path), 'snapshots')).save('aerith', 'abilities', 'GL', page_file.read())
+
+    harness = RegressionHarness(config_yml_path, test_case_dir=TEST_CASE_DIR)
+    harness.run(['aerith'])
+
+    assert [span['stage'] for span in harness.cs.stage_timer.span_list if span['char_name'] == 'aerith'] == [
+        'page_load', 'parse_ability_page', 'parse_abilities'
+    ]
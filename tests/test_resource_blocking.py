@@ -0,0 +1,164 @@
+import logging
+import pytest
+from navigation_plan import NavigationPlanner
+from resource_blocking import ResourceBlocker
+from run_report import StageTimer
+from web_scraper import CompendiumScraper
+
+
+class FakeDriver:
+    """
+
+    Records CDP commands, and reports a page of `page_bytes` bytes, or `blocked_bytes` while URLs are blocked.
+
+    """
+
+    def __init__(self, page_bytes=1000, blocked_bytes=400):
+        self.page_bytes = page_bytes
+        self.blocked_bytes = blocked_bytes
+        self.command_list = []
+        self.blocked_urls = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.command_list.append((command, params))
+
+        if command == 'Network.setBlockedURLs':
+            self.blocked_urls = params['urls']
+
+    def execute_script(self, script):
+        return self.blocked_bytes if self.blocked_urls else self.page_bytes
+
+
+class FakePageDriver(FakeDriver):
+
+    def __init__(self):
+        super().__init__()
+        self.url_list = []
+
+    def get(self, url):
+        self.url_list.append(url)
+
+
+class FakeWaiter:
+
+    def for_page_ready(self, driver, page_type):
+        pass
+
+
+class FakeBrowserPool:
+
+    def __init__(self):
+        self.latency_list = []
+
+    def record_page_load(self, seconds):
+        self.latency_list.append(seconds)
+
+
+def load(resource_blocker, driver, char_name, page_type, seconds_by_blocked):
+    """
+
+    Loads a page the way CompendiumScraper.open_page does.
+
+    """
+
+    for blocked in ([False, True] if resource_blocker.calibrating(page_type) else [True]):
+        resource_blocker.before_load(driver, page_type, blocked=blocked)
+        resource_blocker.after_load(driver, char_name, page_type, seconds_by_blocked[blocked])
+
+
+@pytest.fixture
+def resource_blocker():
+    return ResourceBlocker(logging.getLogger('test_resource_blocking'), calibration_loads=1)
+
+
+def test_savings_are_measured_on_a_pair_of_loads_of_the_same_page(resource_blocker):
+    driver = FakeDriver()
+
+    load(resource_blocker, driver, 'aerith', 'abilities', {False: 2.0, True: 1.5})
+
+    assert resource_blocker.take_savings(0) == [
+        {'char_name': 'aerith', 'page_type': 'abilities', 'bytes_saved': 600, 'ms_saved': 500, 'estimated': False}
+    ]
+    assert ('Network.setCacheDisabled', {'cacheDisabled': True}) in driver.command_list
+
+
+def test_loads_after_calibration_are_blocked_with_the_cache_on_and_estimated(resource_blocker):
+    driver = FakeDriver()
+
+    load(resource_blocker, driver, 'aerith', 'abilities', {False: 2.0, True: 1.5})
+    resource_blocker.take_savings(0)
+    driver.command_list = []
+
+    load(resource_blocker, driver, 'auron', 'abilities', {False: 2.0, True: 1.5})
+
+    assert not resource_blocker.calibrating('abilities')
+    assert resource_blocker.take_savings(0) == [
+        {'char_name': 'auron', 'page_type': 'abilities', 'bytes_saved': 600, 'ms_saved': 500, 'estimated': True}
+    ]
+    assert driver.command_list == [('Network.setCacheDisabled', {'cacheDisabled': False})]
+    assert driver.blocked_urls == ResourceBlocker.DEFAULT_BLOCKED_PATTERNS
+
+
+def test_estimates_are_the_mean_of_the_measured_pairs():
+    resource_blocker = ResourceBlocker(logging.getLogger('test_resource_blocking'), calibration_loads=2)
+
+    load(resource_blocker, FakeDriver(page_bytes=1000), 'aerith', 'abilities', {False: 2.0, True: 1.5})
+    load(resource_blocker, FakeDriver(page_bytes=1400), 'auron', 'abilities', {False: 3.0, True: 1.5})
+    load(resource_blocker, FakeDriver(), 'lenna', 'abilities', {False: 2.0, True: 1.0})
+
+    assert resource_blocker.take_savings(2) == [
+        {'char_name': 'lenna', 'page_type': 'abilities', 'bytes_saved': 800, 'ms_saved': 1000, 'estimated': True}
+    ]
+
+
+def test_page_types_without_a_measured_pair_are_not_estimated():
+    resource_blocker = ResourceBlocker(logging.getLogger('test_resource_blocking'), calibration_loads=0)
+
+    load(resource_blocker, FakeDriver(), 'aerith', 'abilities', {False: 2.0, True: 1.5})
+
+    assert resource_blocker.take_savings(0) == []
+
+
+def test_only_the_blocked_load_counts_as_a_page_load():
+    driver = FakePageDriver()
+
+    # Only the attributes open_page uses, without starting a browser.
+    scraper = CompendiumScraper.__new__(CompendiumScraper)
+    scraper.driver = driver
+    scraper.character_dict_omnibus = {'aerith': {'abilities_url': 'https://example.com/characters/aerith/abilities'}}
+    scraper.resource_blocker = ResourceBlocker(logging.getLogger('test_resource_blocking'), calibration_loads=1)
+    scraper.waiter = FakeWaiter()
+    scraper.stage_timer = StageTimer()
+    scraper.navigation_planner = NavigationPlanner(logging.getLogger('test_resource_blocking'))
+    scraper.browser_pool = FakeBrowserPool()
+
+    scraper.open_page('aerith', 'abilities')
+    scraper.open_page('aerith', 'abilities')
+
+    assert len(driver.url_list) == 3
+    assert scraper.navigation_planner.page_load_count == 2
+    assert len(scraper.browser_pool.latency_list) == 2
+    assert [span['stage'] for span in scraper.stage_timer.span_list] == ['blocking_calibration', 'page_load', 'page_load']
+
+
+def test_each_page_type_calibrates_separately(resource_blocker):
+    driver = FakeDriver()
+
+    load(resource_blocker, driver, 'aerith', 'abilities', {False: 2.0, True: 1.5})
+
+    assert resource_blocker.calibrating('buffs')
+
+
+def test_disabled_blocker_never_calibrates():
+    resource_blocker = ResourceBlocker(logging.getLogger('test_resource_blocking'), enabled=False)
+    driver = FakeDriver()
+
+    load(resource_blocker, driver, 'aerith', 'abilities', {False: 2.0, True: 1.5})
+
+    assert driver.command_list == []
+    assert resource_blocker.take_savings(0) == []
+
+
+def test_unsafe_patterns_are_rejected():
+    with pytest.raises(ValueError):
+        ResourceBlocker(logging.getLogger('test_resource_blocking'), blocked_patterns=['*.js'])
@@ -0,0 +1,51 @@
+import json
+from roster_cache import RosterCache
+
+AERITH = 'https://dissidiacompendium.com/characters/aerith'
+AURON = 'https://dissidiacompendium.com/characters/auron/'
+LENNA = 'https://dissidiacompendium.com/characters/lenna'
+
+
+def test_no_cache(tmp_path):
+    roster_cache = RosterCache(str(tmp_path / 'roster.json'))
+
+    assert roster_cache.age_hours() is None
+    assert not roster_cache.is_fresh()
+    assert roster_cache.char_href_list() == []
+
+
+def test_update_diffs_against_the_cached_roster(tmp_path):
+    cache_path = str(tmp_path / 'cache' / 'roster.json')
+
+    first_diff = RosterCache(cache_path).update([AERITH, AURON])
+
+    assert first_diff['added'] == ['aerith', 'auron']
+    assert first_diff['removed'] == []
+    assert first_diff['previous_fingerprint'] is None
+
+    roster_cache = RosterCache(cache_path)
+    assert roster_cache.is_fresh()
+    assert roster_cache.char_href_list() == [AERITH, AURON]
+
+    second_diff = roster_cache.update([LENNA, AERITH])
+
+    assert second_diff['added'] == ['lenna']
+    assert second_diff['removed'] == ['auron']
+    assert second_diff['previous_fingerprint'] == first_diff['fingerprint']
+
+
+def test_fingerprint_ignores_order():
+    assert RosterCache.fingerprint([AERITH, AURON]) == RosterCache.fingerprint([AURON, AERITH])
+    assert RosterCache.fingerprint([AERITH]) != RosterCache.fingerprint([AURON])
+
+
+def test_stale_cache(tmp_path):
+    cache_path = tmp_path / 'roster.json'
+    cache_path.write_text(json.dumps({
+        'char_href_list': [AERITH],
+        'fingerprint': RosterCache.fingerprint([AERITH]),
+        'discovered_at_utc': '2020-01-01 00:00:00'
+    }))
+
+    assert not RosterCache(str(cache_path), ttl_hours=24).is_fresh()
+    assert RosterCache(str(cache_path), ttl_hours=0).age_hours() > 24
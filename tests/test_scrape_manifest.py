@@ -0,0 +1,39 @@
+from scrape_manifest import ScrapeManifest
+
+
+def scrape_result(char_name='aerith', game_version='GL', page_hashes=None):
+    return {
+        'char_name': char_name,
+        'game_version': game_version,
+        'page_hashes': page_hashes or {'abilities': 'a1', 'buffs': None},
+        'rework_pending': False,
+        'not_in_gl_yet': False,
+        'ability_df': object(),
+        'bt_effect_df': None,
+        'ha_cap_df': None,
+        'scraped_at_utc': '2026-01-01 00:00:00'
+    }
+
+
+def test_manifest_round_trip(tmp_path):
+    manifest_path = str(tmp_path / 'manifest.json')
+
+    manifest = ScrapeManifest(manifest_path)
+    assert manifest.entries == {}
+
+    manifest.record(scrape_result())
+    manifest.save()
+
+    entry = ScrapeManifest(manifest_path).unchanged_entry('aerith', 'GL', {'abilities': 'a1', 'buffs': None})
+
+    assert entry['outputs'] == {'ability_df': True, 'bt_effect_df': False, 'ha_cap_df': False}
+    assert entry['scraped_at_utc'] == '2026-01-01 00:00:00'
+
+
+def test_manifest_changed_pages(tmp_path):
+    manifest = ScrapeManifest(str(tmp_path / 'manifest.json'))
+    manifest.record(scrape_result())
+
+    assert manifest.unchanged_entry('aerith', 'GL', {'abilities': 'a2', 'buffs': None}) is None
+    assert manifest.unchanged_entry('aerith', 'GL', {'abilities': 'a1', 'buffs': 'b1'}) is None
+    assert manifest.unchanged_entry('aerith', 'JP', {'abilities': 'a1', 'buffs': None}) is None
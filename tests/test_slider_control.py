@@ -0,0 +1,62 @@
+import logging
+import pytest
+from slider_control import SliderController
+
+
+class FakeSliderDriver:
+    """
+
+    Stands in for a driver and a slider whose track is `track_width` pixels wide, but measures as
+    `measured_widths` (one per measurement, the last repeating) while it's being laid out. Fills snap to
+    `step` percent.
+
+    """
+
+    def __init__(self, track_width, measured_widths, step=1):
+        self.track_width = track_width
+        self.measured_widths = list(measured_widths)
+        self.step = step
+        self.fill = 50
+        self.measurements = 0
+
+    def execute_script(self, script, slider, width_element):
+        measured_width = self.measured_widths[min(self.measurements, len(self.measured_widths) - 1)]
+        self.measurements += 1
+
+        return [measured_width, f'width: {self.fill}%;']
+
+    def drag(self, offset):
+        fill = min(max((offset + self.track_width / 2) / self.track_width * 100, 0), 100)
+        self.fill = round(fill / self.step) * self.step
+
+        return self.fill
+
+
+@pytest.fixture
+def slider_controller():
+    slider_controller = SliderController(logging.getLogger('test_slider_control'))
+    slider_controller.drag = lambda driver, slider, offset, width_element: driver.drag(offset)
+
+    return slider_controller
+
+
+@pytest.mark.parametrize('target_percentage', [0, 35, 50, 100])
+def test_set_fill(slider_controller, target_percentage):
+    driver = FakeSliderDriver(200, [200], step=5)
+
+    assert slider_controller.set_fill(driver, None, None, target_percentage)
+    assert driver.fill == target_percentage
+
+
+@pytest.mark.parametrize('target_percentage', [0, 100])
+def test_set_fill_remeasures_a_track_wider_than_measured(slider_controller, target_percentage):
+    driver = FakeSliderDriver(600, [100, 600])
+
+    assert slider_controller.set_fill(driver, None, None, target_percentage)
+    assert driver.measurements == 2
+
+
+def test_set_fill_widens_past_a_track_that_keeps_measuring_short(slider_controller):
+    driver = FakeSliderDriver(600, [100])
+
+    assert slider_controller.set_fill(driver, None, None, 100)
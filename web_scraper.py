@@ -1,20 +1,67 @@
 import pandas as pd
-import numpy as np
-import sys
+import json
 import time
 import re
 import contextlib
 import yaml
 import io
-import requests
-import logging
-import sqlalchemy as sa
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
+import argparse
+import concurrent.futures
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup, Tag
+from snapshot_store import SnapshotStore
+from scrape_waits import PageWaiter
+from slider_control import SliderController
+from navigation_plan import NavigationPlanner
+from resource_blocking import ResourceBlocker
+from scrape_manifest import ScrapeManifest
+from roster_cache import RosterCache
+from checkpoints import CheckpointStore
+from intermediate_store import IntermediateStore
+from ability_parser import HpAttackParser
+from ability_overrides import AbilityOverrides
+from pg_loader import PostgresBulkLoader, StreamingRunLoader, RAW_TABLE_CSV_DICT, read_raw_csv, drop_carried_forward_rows
+from run_report import StageTimer, build_run_report, save_run_report, carried_forward_keys
+from scrape_logging import configure_logging
+
+
+def import_browser_modules():
+    """
+
+    Imports selenium into this module. Only scrapers that start a browser need it (see new_driver), so
+    parse-only and load-only runs never pay for the import.
+
+    """
+
+    global webdriver, By, WebDriverWait, EC, ActionChains, WebDriverException
+
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.common.action_chains import ActionChains
+    from selenium.common.exceptions import WebDriverException
+
+
+def create_sql_engine(config):
+    """
+
+    Returns a SQLAlchemy engine for the Postgres database in the config. SQLAlchemy is only imported
+    here, so runs that never touch the database don't pay for the import.
+
+    """
+
+    import sqlalchemy as sa
+
+    engine_url = sa.URL.create(
+        "postgresql",
+        username=config['pg_user'],
+        password=config['pg_pass'],
+        host=config['pg_host'],
+        database=config['pg_db']
+    )
+
+    return sa.create_engine(engine_url)
 
 
 class CompendiumScraper:
@@ -24,7 +71,21 @@ class CompendiumScraper:
 
     """
 
-    def __init__(self, config_yml_path):
+    # Counts the tabs that mark an upcoming JP rework on an ability page (see screen_for_rework).
+    REWORK_TAB_SCRIPT = """
+        return document.querySelectorAll("li[class='filterinactive buffbutton reworktabred_direct']").length;
+    """
+
+    def __init__(
+        self,
+        config_yml_path,
+        fetch_backend = None,  # 'selenium', 'replay' (snapshot store), or 'http' (snapshot server). Defaults to the config's 'fetch_backend' entry.
+        character_dict_omnibus = None,  # If given, skips loading the character list page (used by worker processes)
+        headless = None,  # If True, runs Chrome without a window. Defaults to the config's 'headless' entry.
+        incremental = None,  # If True, skips parsing characters whose pages haven't changed. Defaults to the config's 'incremental' entry.
+        refresh_roster = False  # If True, discovers the roster again even if the cached one is still fresh
+    ):
+        self.config_yml_path = config_yml_path
         self.chars_with_reworks_pending = []
         self.chars_not_in_gl_yet = []
         self.character_list_url = 'https://dissidiacompendium.com/characters/?'
@@ -35,88 +96,136 @@ class CompendiumScraper:
         with open(config_yml_path, 'r') as yml:
             self.config = yaml.safe_load(yml)
 
-        # Start up logging
-        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(message)s')
+        # Start up logging. The noisiest subsystems (parser traces, slider offsets) log through their own
+        # child loggers, so their levels can be set separately (see scrape_logging.py).
+        self.logger = configure_logging(self.config, __name__)
+        self.parser_logger = self.logger.getChild('parser')
+        self.slider_logger = self.logger.getChild('slider')
+        self.LOG_DIVIDER = "===================================================="
 
-        date_string_for_log = time.strftime('%Y%m%d')
+        # Corrections for uncapped abilities, wrong HP caps, and missing follow-ups. Applied to the whole
+        # roster's abilities dataframe at the end of a run (see ability_overrides.py).
+        self.ability_overrides = AbilityOverrides.from_csv(
+            self.config.get('ability_overrides_path', self.config['datasets_dir'] + 'ability_overrides.csv')
+        )
 
-        log_file_name = "web_scraper_" + date_string_for_log +".log"
+        # Every rendered page is saved to the snapshot store (if configured) so that the parsers
+        # can be re-run later without a browser.
+        self.snapshot_store = SnapshotStore(self.config['snapshot_dir']) if self.config.get('snapshot_dir') else None
 
-        file_handler = logging.FileHandler(self.config['logging_dir'] + log_file_name)
-        file_handler.setLevel(logging.INFO)
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(message)s')
-        file_handler.setFormatter(formatter)
-        self.logger = logging.getLogger(__name__)
-        self.logger.addHandler(file_handler)
-        self.logger.removeHandler(logging.StreamHandler)  # Prevent logging in the console.
-        self.LOG_DIVIDER = "===================================================="
+        # Pages come from a live browser ('selenium'), the snapshot store ('replay'), or a snapshot server
+        # over plain HTTP ('http'). The last two never start a browser.
+        self.fetch_backend = fetch_backend or self.config.get('fetch_backend', 'selenium')
 
-        # Dictionary used for processing abilities that have one HP attack uncapped, with all the others
-        # regularly capped.
-        self.N_HP_ATTACKS_UNCAPPED = {
-            'Chuck Staff': {
-                'followup_name': 'Chuck Staff (Uncapped HP Attack)',
-                'gl_hp_attack_count_main': 1,
-                'jp_hp_attack_count_main': 1,
-                'gl_hp_attack_count_non': 1,
-                'jp_hp_attack_count_non': 1
-            },
+        if self.fetch_backend == 'selenium':
+            self.page_backend = None
+        elif self.fetch_backend == 'replay':
+            if self.snapshot_store is None:
+                raise ValueError("Replay mode needs a 'snapshot_dir' entry in the config YAML.")
+            self.page_backend = self.snapshot_store
+        elif self.fetch_backend == 'http':
+            # Only needed for HTTP fetches, and it pulls in requests.
+            from http_backend import HttpFetchBackend
 
-            'Crystal Ray': {
-                'followup_name': 'Crystal Ray (Uncapped HP Attack)',
-                'gl_hp_attack_count_main': 1,
-                'jp_hp_attack_count_main': 1,
-                'gl_hp_attack_count_non': 1,
-                'jp_hp_attack_count_non': 1
-            },
-            'Soul Burst': {
-                'followup_name': 'Soul Burst (Uncapped HP Attack)',
-                'gl_hp_attack_count_main': 1,
-                'jp_hp_attack_count_main': 1,
-                'gl_hp_attack_count_non': 0,
-                'jp_hp_attack_count_non': 0
-            },
-            'Soul Burst+': {
-                'followup_name': 'Soul Burst+ (Uncapped HP Attack)',
-                'gl_hp_attack_count_main': 1,
-                'jp_hp_attack_count_main': 2,
-                'gl_hp_attack_count_non': 0,
-                'jp_hp_attack_count_non': 0
-            },
-        }
+            self.page_backend = HttpFetchBackend.from_config(self.config, self.logger.getChild('http'))
+        else:
+            raise ValueError(f"Unknown fetch backend: {self.fetch_backend}")
 
-        # There isn't a reliable way from Dissidia Compendium to determine what abilities are uncapped,
-        # so I have to make a dictionary and update it as I go along, unfortunately.
-        self.UNCAPPED_ABILITIES_DICT = {
-            'caitsith': ['Transform'],
-            'leonora': ['Flare', 'A Little Black Magic'],
-            'jessie': ['Shaped Charge'],
-            'aerith': ["Additional attack from White Materia's Brilliance"]
-        }
+        self.browserless = self.page_backend is not None
 
-        # Most of these are to fix errors. For Gilgamesh, it's a bit of a hacky work-around to allow his
-        # BT attributes to be parsed like everyone else's.
-        self.FIX_HP_CAP_DICT = {
-            'barret': {
-                'Beam': 10
-            },
-            'yshtola': {
-                'Spiritual Ray': 400
-            },
-            'gilgamesh': {
-                'Ultimate Illusion': 100
-            },
-            'noel': {
-                'Additional attack from Hunter of Light': 15
-            },
-            'kadaj': {
-                'Geophagy': 20
-            }
-        }
+        # Pages the HTTP backend couldn't fetch (other than pages the server doesn't have), for the run report.
+        self.failed_page_log = []
+
+        # Pages fetched ahead of parsing (see prefetch_character_pages), keyed by (char_name, page_type, game_version).
+        self.page_cache = {}
+
+        # In incremental mode, every character's pages are fingerprinted before parsing. Characters whose
+        # pages match the manifest from the previous run reuse their previous rows instead.
+        self.incremental = self.config.get('incremental', False) if incremental is None else incremental
+
+        if self.incremental:
+            self.manifest = ScrapeManifest(
+                self.config.get('manifest_path', self.config['datasets_dir'] + 'scrape_manifest.json')
+            )
+        else:
+            self.manifest = None
+
+        # Every finished character gets a checkpoint, so an interrupted run can be resumed with --resume.
+        # main() sets `resuming` when it picks up an earlier run.
+        self.checkpoints = CheckpointStore(
+            self.config.get('checkpoint_dir', self.config['datasets_dir'] + 'temp/checkpoints/')
+        )
+        self.resuming = False
+
+        # Every character's dataframes are saved to one SQLite file as soon as they're parsed, keyed by run.
+        self.intermediate_store = IntermediateStore(
+            self.config.get('intermediate_db_path', self.config['datasets_dir'] + 'temp/intermediates.sqlite')
+        )
+
+        # Every WebDriver command (including calls on WebElements) goes through driver.execute, which
+        # is wrapped in new_driver() so we can see how many round trips each character costs.
+        self.driver_call_count = 0
+        self.driver_call_counts = {}
+
+        self.headless = self.config.get('headless', False) if headless is None else headless
+
+        # Counts HP attacks and HP Dmg Cap up in generate_ability_df
+        self.hp_attack_parser = HpAttackParser(
+            self.parser_logger, trace_sample_rate=self.config.get('parser_trace_sample_rate', 1.0)
+        )
+
+        # Waits for pages to finish loading/rendering instead of sleeping. Timeouts per page type can
+        # be set under 'wait_timeouts' in the config YAML.
+        self.waiter = PageWaiter(
+            self.logger.getChild('waits'),
+            timeouts=self.config.get('wait_timeouts'),
+            quiet_period=self.config.get('wait_quiet_period'),
+            ready_selectors=self.config.get('wait_ready_selectors'),
+            element_timeout=self.config.get('wait_element_timeout')
+        )
+
+        # Chrome is replaced whenever it stops being healthy (see browser_pool.py).
+        if self.browserless:
+            self.browser_pool = None
+            self.driver = None
+        else:
+            from browser_pool import BrowserPool
+
+            self.browser_pool = BrowserPool(
+                self.new_driver, self.logger.getChild('browser'), **self.config.get('browser_pool', {})
+            )
+            self.driver = self.browser_pool.driver
+
+        # Keeps character pages from downloading images, fonts, media, and analytics (see resource_blocking.py).
+        self.resource_blocker = ResourceBlocker(self.logger.getChild('browser'), **self.config.get('resource_blocking', {}))
+
+        # Captures JP pages in place during the GL pass, and counts page loads (see navigation_plan.py).
+        self.navigation_planner = NavigationPlanner(self.logger, enabled=self.config.get('plan_navigation', True))
 
-        self.driver = webdriver.Chrome()
+        # Moves BT effect sliders straight to their target position (see slider_control.py).
+        self.slider_controller = SliderController(self.slider_logger, max_drags=self.config.get('slider_max_drags', 10))
 
-        self.generate_character_links()
+        # Timing spans for every stage of the scrape, collected into the run report.
+        self.stage_timer = StageTimer()
+
+        # The roster from the character list page is reused for 'roster_ttl_hours' (see roster_cache.py). Replay
+        # runs read the roster from the snapshot store, so they neither use nor update the cache.
+        if self.fetch_backend == 'replay':
+            self.roster_cache = None
+        else:
+            self.roster_cache = RosterCache(
+                self.config.get('roster_cache_path', self.config['datasets_dir'] + 'roster_cache.json'),
+                ttl_hours=self.config.get('roster_ttl_hours', 24)
+            )
+
+        if character_dict_omnibus is None:
+            # Empty until the roster is known. The character list page itself has no character links.
+            self.character_dict_omnibus = {}
+
+            with self.stage_timer.span('roster'):
+                self.generate_character_links(refresh=refresh_roster)
+        else:
+            self.character_dict_omnibus = character_dict_omnibus
 
         self.logger.info("Character links successfully generated.")
 
@@ -128,521 +237,894 @@ class CompendiumScraper:
         self.bt_effect_dict_omnibus_jp = {}
         self.ha_dict_omnibus_jp = {}
 
-    def generate_character_links(self):
+    def new_driver(self):
         """
 
-        Generates a dictionary with character names as the keys. Values for these keys are
-        dictionaries, which contain links to the character's profile, ability, buff,
-        high armor, and high armor plus pages.
+        Starts a new Chrome driver with WebDriver call counting attached.
 
         """
 
-        self.driver.get(self.character_list_url)
+        import_browser_modules()
 
-        character_link_list = WebDriverWait(
-            self.driver,
-            timeout=10
-        ).until(
-            EC.presence_of_all_elements_located((By.CLASS_NAME, "characterlink"))
-        )
+        options = webdriver.ChromeOptions()
 
-        self.logger.info(self.LOG_DIVIDER)
-        self.logger.info("Retrieved all main character links. Generating remaining links for each character.")
-        self.logger.info(self.LOG_DIVIDER)
+        if self.headless:
+            options.add_argument('--headless=new')
 
-        self.character_dict_omnibus = {}
-
-        for char_link in character_link_list:
-            char_name = str(char_link.get_attribute("href").split('/')[-1])
-            link_to_profile = str(char_link.get_attribute("href"))
-            link_to_abilities = str(f"https://dissidiacompendium.com/characters/{char_name}/abilities?")
-            link_to_buffs = str(f"https://dissidiacompendium.com/characters/{char_name}/buffs?")
-            link_to_ha = str(f"https://dissidiacompendium.com/characters/{char_name}/gear?7A=true")
-            link_to_ha_plus = str(f"https://dissidiacompendium.com/characters/{char_name}/gear?7APlus=true")
-
-            char_dict = {
-                    'profile_url': link_to_profile,
-                    'abilities_url': link_to_abilities,
-                    'buffs_url': link_to_buffs,
-                    'high_armor_url': link_to_ha,
-                    'high_armor_plus_url': link_to_ha_plus
-            }
+        driver = webdriver.Chrome(options=options)
 
-            self.character_dict_omnibus[char_name] = char_dict
+        execute = driver.execute
 
-            self.logger.info("self.character_dict_omnibus entry for %s was successful", char_name.upper())
+        def counted_execute(driver_command, params=None):
+            self.driver_call_count += 1
+            return execute(driver_command, params)
 
+        driver.execute = counted_execute
 
-    def prettify_html_to_list(self, html_element):
+        return driver
+
+    def generate_character_links(self, refresh=False):
         """
 
-        Retrieves the 'outerHTML' attribute of an HTML element, parses it, and
-        returns a list to enable iteration over the HTML element.
+        Generates a dictionary with character names as the keys. Values for these keys are
+        dictionaries, which contain links to the character's profile, ability, buff,
+        high armor, and high armor plus pages.
+
+        The roster is taken from the roster cache while it's fresh, unless refresh is True. Otherwise it's
+        discovered from the character list page, and any characters added or removed since the cached
+        roster are logged.
 
         """
 
-        soup = BeautifulSoup(html_element.get_attribute('outerHTML'), 'lxml')
+        if self.roster_cache is not None and self.roster_cache.is_fresh() and not refresh:
+            char_href_list = self.roster_cache.char_href_list()
 
-        return [line for line in soup.prettify().split('\n')]
+            self.logger.info(
+                "Using the roster discovered at %s UTC (%s characters, fingerprint %s).",
+                self.roster_cache.entry['discovered_at_utc'], len(char_href_list), self.roster_cache.entry['fingerprint'][:12]
+            )
+        else:
+            char_href_list = self.discover_roster()
 
+        self.character_dict_omnibus = {
+            RosterCache.char_name(char_href): self.character_links(char_href) for char_href in char_href_list
+        }
 
-    def generate_ability_dict(
-        self,
-        char_name,  # Character name, as a string
-        scroll_speed = 1000,  # Scrolling speed to move through the page for lazy loading
-        JP = False,
-        return_output = False  # If true, will return output in addition to adding to class attribute
-    ):
-        """
+        self.logger.info("Generated links for %s characters.", len(self.character_dict_omnibus))
 
-        Parses a character's ability page to college abilities with HP attacks in them. The function
-        returns an ability dictionary, where the keys are the ability names in human-readable
-        format, and the values are the <div> block containing the number of BRV attacks, HP
-        attacks, buffs granted, attack attributes, etc. of the ability
+    def discover_roster(self):
+        """
 
-        This function also checks whether the character has a JP rework. I couldn't think of a
-        better place to nest that functionality, because I didn't want the scraper to make
-        170+ additional requests just to do one thing.
+        Returns every character's profile link from the character list page, and updates the roster cache
+        with them. If the page comes back empty, the cached roster (if any) is used instead.
 
         """
 
+        if self.browserless:
+            char_href_list = self.load_roster_from_page_backend()
+        else:
+            self.driver.get(self.character_list_url)
+
+            character_link_list = WebDriverWait(
+                self.driver,
+                timeout=self.waiter.timeout_for('characters')
+            ).until(
+                EC.presence_of_all_elements_located((By.CLASS_NAME, "characterlink"))
+            )
+
+            self.capture_page('_roster', 'characters')
+
+            char_href_list = [str(char_link.get_attribute("href")) for char_link in character_link_list]
+
         self.logger.info(self.LOG_DIVIDER)
-        self.logger.info("Generating ability dictionary for %s", char_name.upper())
+        self.logger.info("Retrieved all main character links (%s characters).", len(char_href_list))
         self.logger.info(self.LOG_DIVIDER)
 
-        try:
-            self.driver.get(self.character_dict_omnibus[char_name]['abilities_url'])
-        except Exception:
-            print("You need to generate the character_dict_omnibus first (run generate_character_links).")
-            self.logger.info("User didn't generate character_dict_omnibus first.")
-            return
+        if self.roster_cache is None:
+            return char_href_list
 
-        time.sleep(5)
+        if not char_href_list and self.roster_cache.entry is not None:
+            self.logger.info("The character list came back empty. Using the cached roster instead.")
+            return self.roster_cache.char_href_list()
 
-        actions = ActionChains(self.driver)
+        roster_diff = self.roster_cache.update(char_href_list)
 
-        if JP:
-            try:
-                switch_to_jp_button = self.driver.find_element(By.XPATH, "//span[@class='glflage smalleventbutton']")
+        if roster_diff['previous_fingerprint'] is None:
+            self.logger.info("Cached the roster for the first time.")
+        elif roster_diff['fingerprint'] == roster_diff['previous_fingerprint']:
+            self.logger.info("Roster unchanged since the last discovery.")
+        else:
+            if roster_diff['added']:
+                self.logger.info("New characters since the last discovery: %s", ', '.join(char_name.upper() for char_name in roster_diff['added']))
 
-                actions.click(switch_to_jp_button).perform()
+            if roster_diff['removed']:
+                self.logger.info("Characters no longer on the roster: %s", ', '.join(char_name.upper() for char_name in roster_diff['removed']))
 
-                time.sleep(5)
-            except Exception:
-                pass
+        return char_href_list
 
-        if not JP:
-            self.screen_for_rework(char_name)
+    @staticmethod
+    def character_links(char_href):
+        """
 
-        try:
-            # Just want to test that this can run. Don't want an output.
-            with contextlib.redirect_stdout(io.StringIO()):
-                self.driver.find_element(By.XPATH, "//div[@class='infotitle abilitydisplayfex ']")
-        except Exception:
-            self.logger.info("Unable to access abilities for %s.", char_name.upper())
-            if not JP:
-                self.logger.info("They might not be released to GL yet.")
-                if char_name not in self.chars_not_in_gl_yet:
-                    self.chars_not_in_gl_yet.append(char_name)
-                return
-            else:
-                self.logger.info("Something's wrong with ability_dict generation for %s, since we're already checking the JP version.", char_name.upper())
-                return
+        Returns the dictionary of links to a character's profile, ability, buff, high armor, and high armor
+        plus pages, built from their profile link.
+
+        """
 
+        char_name = RosterCache.char_name(char_href)
 
+        return {
+            'profile_url': str(char_href),
+            'abilities_url': f"https://dissidiacompendium.com/characters/{char_name}/abilities?",
+            'buffs_url': f"https://dissidiacompendium.com/characters/{char_name}/buffs?",
+            'high_armor_url': f"https://dissidiacompendium.com/characters/{char_name}/gear?7A=true",
+            'high_armor_plus_url': f"https://dissidiacompendium.com/characters/{char_name}/gear?7APlus=true"
+        }
 
-        list_build_complete = False
+    def select_characters(self, char_name_list):
+        """
 
-        count = 0
+        Narrows the roster down to the given characters, for a targeted run. If any of them aren't on the
+        cached roster (e.g., they were just added to the site), the roster is discovered again first.
 
-        while list_build_complete == False:
+        """
 
-            self.driver.execute_script(f"window.scrollBy(0, {scroll_speed});")
-            time.sleep(1)
-            ability_list = self.driver.find_elements(By.XPATH, "//div[@class='infotitle abilitydisplayfex ']")
+        char_name_list = [char_name.lower() for char_name in char_name_list]
 
-            # The last two abilities are calls. So,h the second to last ability should be a call when we're done.
-            match = re.search('\(C\)', ability_list[-2].text)
-            list_build_complete = True if match else False
+        if any(char_name not in self.character_dict_omnibus for char_name in char_name_list) and self.roster_cache is not None:
+            self.logger.info("Some requested characters aren't on the cached roster. Discovering it again.")
 
-            self.logger.info("This iteration caught %s abilities.", len(ability_list))
+            with self.stage_timer.span('roster'):
+                self.generate_character_links(refresh=True)
 
-            self.logger.info('-----------')
-            count += 1
-            if count == 15:
-                self.logger.info("Too many iterations. Examine this function for: %s", char_name.upper())
-                break
+        unknown_char_name_list = [char_name for char_name in char_name_list if char_name not in self.character_dict_omnibus]
 
-        self.logger.info("This took %s iterations.", count)
+        if unknown_char_name_list:
+            raise ValueError(f"Characters not on the roster: {', '.join(unknown_char_name_list)}")
 
-        for ability in ability_list:
-            self.logger.info("%s", ability.text)
+        self.character_dict_omnibus = {
+            char_name: self.character_dict_omnibus[char_name] for char_name in char_name_list
+        }
 
-        ability_second_div_list = self.driver.find_elements(By.XPATH, "//div[@class='bluebase abilityinfobase']")
+        self.logger.info("Targeted run for: %s", ', '.join(char_name.upper() for char_name in char_name_list))
 
-        self.logger.info("Collected ability info list for %s", char_name)
+    def load_roster_from_page_backend(self):
+        """
 
-        ability_dict = {}
+        Returns the list of character profile links from the character list page, as provided by the
+        browserless page backend. In replay mode, if the roster page was never saved, falls back to
+        every character in the snapshot store.
 
-        for index, ability_first_div in enumerate(ability_list):
+        """
 
-            ability_name = str(ability_first_div.text)
+        roster_html = self.load_page('_roster', 'characters')
 
-            ability_dict[ability_name] = {}
+        if roster_html is None:
+            if self.fetch_backend != 'replay':
+                self.logger.info("Couldn't load the character list page.")
+                return []
 
-            ability_dict[ability_name]['short_name'] = str(ability_first_div.text.split(' - ')[0])
-            ability_dict[ability_name]['ability_attack_info'] = ability_second_div_list[index]
+            self.logger.info("No roster snapshot found. Using every character in the snapshot store.")
 
-            inline_attribute_list  = []
+            return [
+                urljoin(self.character_list_url, f"/characters/{char_name}")
+                for char_name in self.snapshot_store.characters()
+            ]
 
-            ability_first_div_html = self.prettify_html_to_list(ability_first_div)
+        soup = self.html_to_soup(roster_html)
 
-            for line in ability_first_div_html:
-                if re.search(r"inline ", line):
-                    inline_attribute = re.search(r"(inline )(\w+)", line).group(2)
-                    inline_attribute_list.append(inline_attribute)
+        return [
+            urljoin(self.character_list_url, char_link.get('href'))
+            for char_link in self.find_all_with_class(soup, 'characterlink')
+        ]
 
-            ability_dict[ability_name]['attribute_list'] = inline_attribute_list
+    def capture_page(
+        self,
+        char_name,
+        page_type,
+        JP = False,
+        page_html = None  # Page source that was already pulled from the driver. Defaults to the driver's current page source.
+    ):
+        """
 
-        self.logger.info('Finished extracting inline attributes for %s', char_name.upper())
+        Returns the driver's current page source, saving it to the snapshot store first if one is
+        configured.
 
-        if not JP:
+        """
 
-            self.ability_dict_omnibus_gl[char_name] = {}
-            self.ability_dict_omnibus_gl[char_name] = ability_dict
+        if page_html is None:
+            page_html = self.driver.page_source
 
-        elif JP:
+        if self.snapshot_store is not None:
+            game_version = 'GL' if not JP else 'JP'
+            content_hash = self.snapshot_store.save(char_name, page_type, game_version, page_html)
+            self.logger.info("Saved %s %s snapshot for %s (%s).", game_version, page_type, char_name.upper(), content_hash[:12])
 
-            self.ability_dict_omnibus_jp[char_name] = {}
-            self.ability_dict_omnibus_jp[char_name] = ability_dict
+        return page_html
 
-        if return_output:
-            return ability_dict
+    def load_page(self, char_name, page_type, JP=False):
+        """
 
+        Returns a character's page HTML from the browserless page backend (the snapshot store or the
+        HTTP backend), or None if the page isn't available. Pages fetched over HTTP are saved to the
+        snapshot store if one is configured.
 
-    def generate_ability_df(
-        self,
-        char_name,  # Character name, as a string
-        JP = False  # If True, will pull from the JP version of ability_dict_omnibus instead of the GL version
-    ):
         """
 
-        Extracts the number of HP attacks dealt to an ability's main target and non-targets. The
-        function input should be a character name (char_name) in string format. Pulls data from
-        self.ability_dict_omnibus, so `generate_ability_dict` should be run for the character
-        beforehand.
+        game_version = 'GL' if not JP else 'JP'
 
-        Returns a pandas dataframe with the ability name, number of HP attacks into main targets,
-        number of HP attacks into non-targets, and ability attribute list.
+        cache_key = (char_name, page_type, game_version)
 
-        """
+        if cache_key in self.page_cache:
+            page_html = self.page_cache.pop(cache_key)
+        else:
+            with self.stage_timer.span('page_load', char_name, JP):
+                page_html = self.page_backend.get_page(
+                    char_name, page_type, game_version, self.character_dict_omnibus.get(char_name)
+                )
 
-        self.logger.info(self.LOG_DIVIDER)
-        self.logger.info("Parsing ability dict to df for %s.", char_name.upper())
-        self.logger.info(self.LOG_DIVIDER)
+            if self.fetch_backend == 'http':
+                self.failed_page_log += self.page_backend.take_failures(0)
 
-        try:
-            if not JP:
-                ability_dictionary = self.ability_dict_omnibus_gl[char_name]
-            elif JP:
-                ability_dictionary = self.ability_dict_omnibus_jp[char_name]
-        except Exception:
-            self.logger.info("Couldn't find ability_dict for %s. Creating it now.", char_name.upper())
+            if page_html is not None and self.snapshot_store is not None and self.page_backend is not self.snapshot_store:
+                self.snapshot_store.save(char_name, page_type, game_version, page_html)
 
-            self.generate_ability_dict(
-                char_name=char_name,
-                JP=JP,
-                return_output=False
-            )
+        if page_html is None:
+            self.logger.info("No %s %s page found for %s.", game_version, page_type, char_name.upper())
 
-            try:
-                if not JP:
-                    ability_dictionary = self.ability_dict_omnibus_gl[char_name]
-                elif JP:
-                    ability_dictionary = self.ability_dict_omnibus_jp[char_name]
-            except Exception:
-                version = 'GL' if not JP else 'JP'
-                self.logger.info("Couldn't retrieve ability dict. Character must not be in %s yet.", version)
-                return
+        return page_html
 
-        df_row_list = []
+    def prefetch_character_pages(self, char_name, JP=False):
+        """
 
-        for ability_name in ability_dictionary:
+        Fetches every page a character is parsed from (with the browser or the browserless page backend)
+        before any parsing happens, and holds them in the page cache for load_page to hand out. Returns a
+        dictionary of page type -> page HTML, with None for pages that couldn't be found.
 
-            self.logger.info("Begin parsing for %s.", ability_name.upper())
+        Pages already in the page cache (e.g., JP pages the navigation planner captured during the GL pass)
+        aren't fetched again.
 
-            ability_html_lines = self.prettify_html_to_list(
-                ability_dictionary[ability_name]['ability_attack_info']
-                )
+        """
 
-            row_dict = {}
-
-            row_dict['ability_name'] = ability_dictionary[ability_name]['short_name']
-            row_dict['ability_id'] = ability_name.split(' - ')[1].replace('#', '')
-
-            main_target_hp_attacks = 0
-            non_target_hp_attacks = 0
-            hp_dmg_cap_up_perc = 0
-
-            for index, line in enumerate(ability_html_lines):
-
-                # Extract HP Dmg Cap within ability and/or from FE
-
-                if re.search("- MAX BRV Cap", line):
-                    hp_dmg_cap_up_perc += int(ability_html_lines[index + 6].strip().replace('%', ''))
-
-                if re.search("MAX BRV Cap Up by", line):
-                    hp_dmg_cap_up_perc += int(ability_html_lines[index + 2].strip().replace('%', ''))
-
-                # "inline HP" is class for the HP Attack icon
-                if "inline HP" not in line:
-                    continue
-
-                # Info on single-target vs group attack appears on preceding line and/or 3 lines before, but also 2 lines after sometimes
-
-                single_or_group_lines = ability_html_lines[index - 1] + ability_html_lines[index - 3] + ability_html_lines[index + 2]
-
-                AOE = True if re.search(r"Group", single_or_group_lines) else False
-
-                if AOE:
-                    self.logger.info("%s is being considered AOE.", ability_name)
-
-                # Sometimes an inline appears after the inline(s) we care about to describe the source
-                # of the HP damage. We want to skip these instances.
-                if re.search(r"Attack", ability_html_lines[index - 2]):
-                    continue
-
-                # Info on HP attack count and type appears two lines later (e.g., Attack 3 times,
-                # Damage to non-targets after each HP attack, etc.), with a few exceptions.
-
-                # I hate hard coding an ability name like this (Crystal Generation), but we'll see if I can make it more
-                # programmatic later, or make a list of abilities that operate with this format.
-
-                if re.search(r'Crystal Generation', ability_name):  # Special case
-                    attack_info_line = ability_html_lines[index + 6]
-                else:
-                    attack_info_line = ability_html_lines[index + 2]
-
-                extra_condition_line = ability_html_lines[index + 6]
-
-                # Some abilities deal damage based on a stored value (e.g., Aerith BT effect, Astos)
-                # For these abilities, the line we want appears eleven lines later
-                if (re.search(r"Damage by", attack_info_line) or re.search(r"Damage to", attack_info_line)) and re.search(r"of stored value from", extra_condition_line):
-                    attack_info_line = ability_html_lines[index + 11]
-                    self.logger.info("Attack info line is ELEVEN lines after inline HP.")
-
-                # Other abilities deal damage based on a characters stat or current value (e.g., Aerith's LD followup)
-                # For these abilities, the line we want appears six lines later
-                if (re.search(r" by", attack_info_line) or re.search(r" based on", attack_info_line)) and re.search(r"of ", extra_condition_line):
-                    if re.search(r"to non-targets", ability_html_lines[index + 13]) and re.search(r"inline BREAK", ability_html_lines[index + 11]):
-                        attack_info_line = ability_html_lines[index + 13]
-                        self.logger.info("Attack info line is THIRTEEN lines after inline HP (Serah or Snow EX)")
-                    else:
-                        attack_info_line = ability_html_lines[index + 6]
-                        self.logger.info("Attack info line is SIX lines after inline HP.")
-
-                hp_attacks_to_add = 0
-                add_to_non_target = 0
-                copy_st_to_aoe = False
-                subtract_one = False
-
-                if re.search(r"Damage to non-targets after each HP Attack, except last", attack_info_line):
-                    copy_st_to_aoe = True
-                    subtract_one = True
-                    self.logger.info("Copying ST to AOE, and subtracting one!")
-                elif re.search(r"Damage to non-targets after each HP Attack", attack_info_line):
-                    copy_st_to_aoe = True
-                    self.logger.info("Copying ST to AOE!")
-                elif re.search(r"Group \d+", attack_info_line):
-                    AOE = True
-                    self.logger.info("Ability will be considered AOE")
-                    hp_attacks_to_add = int(re.search(r"Group \d+ times", attack_info_line).group().split(' ')[1])
-                elif re.search(r"Group", attack_info_line):
-                    AOE = True
-                    self.logger.info("Ability will be considered AOE")
-                    hp_attacks_to_add = 1
-                elif re.search(r"to non-targets × \d+", attack_info_line):
-                    add_to_non_target = int(re.search(r"× \d+", attack_info_line).group().split(' ')[1])
-                    self.logger.info("Line pertains to non-target damage")
-                elif re.search(r"to non-targets \d+ times", attack_info_line) or re.search(r"to non-trap triggered targets \d+ times", attack_info_line):
-                    add_to_non_target = int(re.search(r"\d+ times", attack_info_line).group().split(' ')[0])
-                    self.logger.info("Line pertains to non-target damage")
-                elif re.search(r"to non-targets", attack_info_line) or re.search(r"to non-trap triggered targets", attack_info_line):
-                    add_to_non_target = 1
-                    self.logger.info("Line pertains to non-target damage")
-                elif re.search(r"\d+ times", attack_info_line):
-                    hp_attacks_to_add = int(re.search("\d+ times", attack_info_line).group().split(' ')[0])
-                    self.logger.info("Line pertains to main target damage")
-                else:
-                    hp_attacks_to_add = 1
-                    self.logger.info("Line pertains to main target damage")
-
-                if AOE:
-                    main_target_hp_attacks += hp_attacks_to_add
-                    non_target_hp_attacks += hp_attacks_to_add
-                    self.logger.info("%s HP attacks added to both main and non-target", hp_attacks_to_add)
-                elif copy_st_to_aoe:
-                    non_target_hp_attacks = main_target_hp_attacks - 1 if subtract_one else main_target_hp_attacks
-                    self.logger.info("%s main target HP attacks copied to non-target", main_target_hp_attacks)
-                else:
-                    main_target_hp_attacks += hp_attacks_to_add
-                    non_target_hp_attacks += add_to_non_target
-                    self.logger.info("%s HP attacks for main, and %s HP attacks for non.", hp_attacks_to_add, add_to_non_target)
-
-            row_dict['main_target_hp_attacks'] = main_target_hp_attacks
-            row_dict['non_target_hp_attacks'] = non_target_hp_attacks
-            row_dict['hp_dmg_cap_up_perc'] = hp_dmg_cap_up_perc
-
-
-            # Add ability attribute column
-            row_dict['attribute_list'] = ability_dictionary[ability_name]['attribute_list']
-            row_dict['game_version'] = 'GL' if not JP else 'JP'
-
-            try:  # Set the corrected HP cap if the ability calls for it
-                row_dict['hp_dmg_cap_up_perc'] = self.FIX_HP_CAP_DICT[char_name][ability_dictionary[ability_name]['short_name']]
-            except Exception:
-                pass
+        game_version = 'GL' if not JP else 'JP'
 
-            try:  # Set HP cap to max if it's in the uncapped abilities dictionary
-                if ability_dictionary[ability_name]['short_name'] in self.UNCAPPED_ABILITIES_DICT[char_name]:
-                    row_dict['hp_dmg_cap_up_perc'] = 900
-                    row_dict['attribute_list'] = ['Uncapped'] + row_dict['attribute_list']
-            except Exception:
-                pass
+        page_type_list = self.character_page_types(char_name, JP=JP)
 
-            # Handling for abilities with one uncapped HP attack
-            if ability_dictionary[ability_name]['short_name'] in self.N_HP_ATTACKS_UNCAPPED.keys() and not JP:
-                ability_short_name = ability_dictionary[ability_name]['short_name']
-                special_row_dict = {}
-                row_dict['main_target_hp_attacks'] = main_target_hp_attacks - self.N_HP_ATTACKS_UNCAPPED[ability_short_name]['gl_hp_attack_count_main']
-                row_dict['non_target_hp_attacks'] = non_target_hp_attacks - self.N_HP_ATTACKS_UNCAPPED[ability_short_name]['gl_hp_attack_count_non']
-
-                special_row_dict['ability_name'] = self.N_HP_ATTACKS_UNCAPPED[ability_short_name]['followup_name']
-                special_row_dict['main_target_hp_attacks'] = self.N_HP_ATTACKS_UNCAPPED[ability_short_name]['gl_hp_attack_count_main']
-                special_row_dict['non_target_hp_attacks'] = self.N_HP_ATTACKS_UNCAPPED[ability_short_name]['gl_hp_attack_count_non']
-                special_row_dict['hp_dmg_cap_up_perc'] = 900  # Takes a character from 99,999 dmg to 999,999 dmg
-                special_row_dict['attribute_list'] = ['FollowUp'] + ability_dictionary[ability_name]['attribute_list'] if 'FollowUp' not in ability_dictionary[ability_name]['attribute_list'] else ability_dictionary[ability_name]['attribute_list']
-                special_row_dict['game_version'] = 'GL'
-
-                df_row_list.append(special_row_dict)
-
-            elif ability_name in self.N_HP_ATTACKS_UNCAPPED.keys() and JP:
-                special_row_dict = {}
-                row_dict['main_target_hp_attacks'] = main_target_hp_attacks - self.N_HP_ATTACKS_UNCAPPED[ability_short_name]['jp_hp_attack_count_main']
-                row_dict['non_target_hp_attacks'] = non_target_hp_attacks = self.N_HP_ATTACKS_UNCAPPED[ability_short_name]['jp_hp_attack_count_non']
-
-                special_row_dict['ability_name'] = self.N_HP_ATTACKS_UNCAPPED[ability_short_name]['followup_name']
-                special_row_dict['main_target_hp_attacks'] = self.N_HP_ATTACKS_UNCAPPED[ability_short_name]['jp_hp_attack_count_main']
-                special_row_dict['non_target_hp_attacks'] = self.N_HP_ATTACKS_UNCAPPED[ability_short_name]['jp_hp_attack_count_non']
-                special_row_dict['hp_dmg_cap_up_perc'] = 900  # Takes a character from 99,999 dmg to 999,999 dmg
-                special_row_dict['attribute_list'] = ['FollowUp'] + ability_dictionary[ability_name]['attribute_list'] if 'FollowUp' not in ability_dictionary[ability_name]['attribute_list'] else ability_dictionary[ability_name]['attribute_list']
-                special_row_dict['game_version'] = 'JP'
-
-                df_row_list.append(special_row_dict)
-
-            df_row_list.append(row_dict)
-
-        # Add in a Chainspell follow up. The regular one isn't coded into the website, which is inconsistent
-        # with what was done for other characters and will interfere with how I plan to integrate follow up attacks
-        if char_name == 'seymour':
-            chainspell_followup = {
-                'char_name': 'seymour',
-                'ability_name': 'Chainspell - Follow Up',
-                'ability_id': np.nan,
-                'main_target_hp_attacks': 4,
-                'non_target_hp_attacks': 0,
-                'hp_dmg_cap_up_perc': 20,
-                'attribute_list': ['Magic', 'FollowUp'],
-                'game_version': 'JP' if JP else 'GL'
+        if self.browserless:
+            page_dict = {page_type: self.load_page(char_name, page_type, JP) for page_type in page_type_list}
+        else:
+            page_dict = {
+                page_type: self.page_cache[(char_name, page_type, game_version)]
+                for page_type in page_type_list
+                if (char_name, page_type, game_version) in self.page_cache
             }
 
-            df_row_list.append(chainspell_followup)
+            if 'abilities' not in page_dict:
+                page_dict['abilities'] = self.load_ability_page(char_name, JP=JP)
 
-        ability_df = pd.DataFrame(df_row_list)
+            if not self.is_prefetched(char_name, self.bt_page_types(char_name), JP):
+                bt_page_dict = self.capture_bt_pages(char_name, JP=JP) or {}
 
-        ability_df['char_name'] = char_name
+                for page_type in self.bt_page_types(char_name):
+                    page_dict[page_type] = bt_page_dict.get(page_type)
 
-        self.logger.info("Sucessfully converted ability df for %s", char_name.upper())
+            if 'high_armor' in page_type_list and not self.is_prefetched(char_name, NavigationPlanner.VERSION_INVARIANT_PAGE_TYPES, JP):
+                page_dict['high_armor'], page_dict['high_armor_plus'] = self.capture_ha_pages(char_name, JP=JP)
 
-        return ability_df[['char_name', 'ability_name', 'ability_id', 'main_target_hp_attacks', 'non_target_hp_attacks', 'hp_dmg_cap_up_perc', 'attribute_list', 'game_version']]
+        for page_type, page_html in page_dict.items():
+            self.page_cache[(char_name, page_type, game_version)] = page_html
 
-    def retrieve_hp_caps_from_bt(
+        return page_dict
+
+    def character_page_types(
         self,
-        char_name,  # Character's name as a string
-        JP = False, # If true, will check the JP version of the website instead of GL
-        return_output = False # If true, will return a pandas dataframe row after running
+        char_name,
+        JP = False,
+        gl_ha_dict = None  # The character's parsed GL high armor. Defaults to the one in ha_dict_omnibus_gl.
     ):
+        """
+
+        Returns the page types a character is parsed from in a game version. High armor pages are skipped in
+        JP if the character's high armor was already parsed in GL, the same as retrieve_ha_hp_dmg_cap_up.
 
         """
 
-        Takes a character's name as input and adds a key-value pair to self.bt_effect_dict_omnibus. Key is char_name, and
-        the value is a dictionary with three key-value pairs:
+        page_type_list = ['abilities'] + self.bt_page_types(char_name)
 
-        1) Character's name
-        2) Personal HP Dmg Cap up from BT effect
-        3) Party-side HP Dmg Cap up from BT effect
+        if gl_ha_dict is None:
+            gl_ha_dict = self.ha_dict_omnibus_gl.get(char_name)
+
+        if not (JP and gl_ha_dict):
+            page_type_list += NavigationPlanner.VERSION_INVARIANT_PAGE_TYPES
 
+        return page_type_list
+
+    def is_prefetched(self, char_name, page_type_list, JP=False):
         """
 
-        self.logger.info(self.LOG_DIVIDER)
-        self.logger.info("Retrieving BT info for %s.", char_name.upper())
-        self.logger.info(self.LOG_DIVIDER)
+        Returns True if every page type in page_type_list is waiting in the page cache for the character.
 
-        actions = ActionChains(self.driver)
+        """
 
-        self.driver.get(self.character_dict_omnibus[char_name]['buffs_url'])
+        game_version = 'GL' if not JP else 'JP'
 
-        time.sleep(5)
+        return all((char_name, page_type, game_version) in self.page_cache for page_type in page_type_list)
 
-        if JP:
-            try:
-                switch_to_jp_button = self.driver.find_element(By.XPATH, "//span[@class='glflage smalleventbutton']")
+    @staticmethod
+    def html_to_soup(page_html):
+        """
 
-                actions.click(switch_to_jp_button).perform()
+        Parses a page's HTML. Class attributes are kept as plain strings so that lookups can match
+        them exactly, the same way the scraper's XPath expressions do.
 
-                time.sleep(5)
-            except Exception:
+        """
 
-                time.sleep(5)
+        return BeautifulSoup(page_html, 'lxml', multi_valued_attributes=None)
 
-                pass
-        elif not JP:
-            try:
-                switch_to_gl_button = self.driver.find_element(By.XPATH, "//span[@class='jpflage jpsmallinactive smalleventbutton']")
+    @staticmethod
+    def find_all_by_class(soup, tag_name, class_string):
+        """
 
-                actions.click(switch_to_gl_button).perform()
+        Equivalent to find_elements(By.XPATH, f"//{tag_name}[@class='{class_string}']") for a parsed page.
 
-                time.sleep(5)
-            except Exception:
+        """
 
-                time.sleep(5)
+        return soup.find_all(tag_name, attrs={'class': class_string})
 
-                pass
+    @staticmethod
+    def find_all_with_class(soup, class_name):
+        """
 
-        bt_personal_hp_dmg_cap_up = 0
-        bt_party_hp_dmg_cap_up = 0
+        Equivalent to find_elements(By.CLASS_NAME, class_name) for a parsed page.
 
-        try:
-            # Find the BT button for the character's buff page
-            bt_button_element = self.driver.find_element(By.XPATH, "//li[@class='filterinactive buffbutton wpbtbutton']")
-        except Exception:
-            print(f"Unable to find a BT for {char_name.title()}. Either the character isn't in GL yet, or they lack a BT in both GL and JP.")
-            self.logger.info("Couldn't find BT button for %s", char_name.upper())
-            return
+        """
 
-        # Click on it to make sure that the buff appears
-        actions.click(bt_button_element).perform()
+        return soup.find_all(attrs={'class': re.compile(rf"(^|\s){re.escape(class_name)}(\s|$)")})
 
-        # Scroll down to make sure the BT buff loads fully
-        self.driver.execute_script(f"window.scrollBy(0, 600);")
+    @staticmethod
+    def element_text(html_element):
+        """
 
-        time.sleep(1)
+        Returns the visible text of a WebElement or a parsed tag, with whitespace collapsed the way
+        Selenium's `.text` does for inline content.
 
-        self.driver.execute_script(f"window.scrollBy(0, 600);")
+        """
 
-        time.sleep(1)
+        if isinstance(html_element, Tag):
+            return ' '.join(html_element.get_text().split())
 
-        if char_name != 'lannreynn' and char_name != 'yda':
+        return html_element.text
+
+    def prettify_html_to_list(self, html_element):
+        """
+
+        Retrieves the 'outerHTML' attribute of an HTML element, parses it, and
+        returns a list to enable iteration over the HTML element. Also accepts tags from a
+        parsed snapshot (or their HTML as a string), which are re-parsed on their own so the
+        output lines match.
+
+        """
+
+        if isinstance(html_element, Tag):
+            outer_html = str(html_element)
+        elif isinstance(html_element, str):
+            outer_html = html_element
+        else:
+            outer_html = html_element.get_attribute('outerHTML')
+
+        soup = BeautifulSoup(outer_html, 'lxml')
+
+        return [line for line in soup.prettify().split('\n')]
+
+
+    def generate_ability_dict(
+        self,
+        char_name,  # Character name, as a string
+        scroll_speed = 1000,  # Scrolling speed to move through the page for lazy loading
+        JP = False,
+        return_output = False  # If true, will return output in addition to adding to class attribute
+    ):
+        """
+
+        Parses a character's ability page to college abilities with HP attacks in them. The function
+        returns an ability dictionary, where the keys are the ability names in human-readable
+        format, and the values are the <div> block containing the number of BRV attacks, HP
+        attacks, buffs granted, attack attributes, etc. of the ability
+
+        This function also checks whether the character has a JP rework. I couldn't think of a
+        better place to nest that functionality, because I didn't want the scraper to make
+        170+ additional requests just to do one thing.
+
+        """
+
+        self.logger.info(self.LOG_DIVIDER)
+        self.logger.info("Generating ability dictionary for %s", char_name.upper())
+        self.logger.info(self.LOG_DIVIDER)
+
+        if self.browserless or self.is_prefetched(char_name, ['abilities'], JP):
+            page_html = self.load_page(char_name, 'abilities', JP)
+        else:
+            page_html = self.load_ability_page(char_name, scroll_speed=scroll_speed, JP=JP)
+
+        if page_html is None:
+            return
+
+        with self.stage_timer.span('parse_ability_page', char_name, JP):
+            ability_dict = self.parse_ability_page(char_name, page_html, JP=JP)
+
+        if return_output:
+            return ability_dict
+
+    def load_ability_page(
+        self,
+        char_name,  # Character name, as a string
+        scroll_speed = 1000,  # Scrolling speed to move through the page for lazy loading
+        JP = False
+    ):
+        """
+
+        Loads a character's ability page, scrolls until every ability has been lazy loaded, and
+        returns the page's HTML. Scrolling and waiting happen in one in-page script that also returns
+        the finished page, so neither collecting nor parsing grows with the number of abilities.
+
+        """
+
+        driver_calls_at_start = self.driver_call_count
+
+        try:
+            self.open_page(char_name, 'abilities', JP)
+        except KeyError:
+            print("You need to generate the character_dict_omnibus first (run generate_character_links).")
+            self.logger.info("User didn't generate character_dict_omnibus first.")
+            return
+
+        if JP:
+            self.switch_version(char_name, 'abilities', JP=True)
+
+        page_html, abilities_found = self.collect_ability_list(char_name, scroll_speed=scroll_speed, JP=JP)
+
+        # Characters with a pending rework, or that aren't in GL yet, get a JP pass. Their JP ability page is
+        # one click away, so it's captured now instead of being loaded again in the JP pass.
+        if not JP and self.navigation_planner.enabled:
+            if not abilities_found:
+                self.navigation_planner.plan_jp_in_place(char_name, "not in GL yet")
+            elif self.driver.execute_script(self.REWORK_TAB_SCRIPT):
+                self.navigation_planner.plan_jp_in_place(char_name, "rework pending")
+
+            if self.navigation_planner.captures_jp_in_place(char_name):
+                self.capture_jp_in_place(
+                    char_name,
+                    'abilities',
+                    lambda: {'abilities': self.collect_ability_list(char_name, scroll_speed=scroll_speed, JP=True)[0]}
+                )
+
+        self.logger.info(
+            "Ability page for %s took %s WebDriver calls.",
+            char_name.upper(), self.driver_call_count - driver_calls_at_start
+        )
+
+        return page_html
+
+    def collect_ability_list(
+        self,
+        char_name,  # Character name, as a string
+        scroll_speed = 1000,  # Scrolling speed to move through the page for lazy loading
+        JP = False
+    ):
+        """
+
+        Scrolls the open ability page until every ability has been lazy loaded, and captures it. Returns a
+        (page HTML, abilities found) tuple.
+
+        """
+
+        try:
+            # Just want to test that this can run. Don't want an output.
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.driver.find_element(By.XPATH, "//div[@class='infotitle abilitydisplayfex ']")
+        except Exception:
+            # Save the page anyway. Parsing it is how we find out the character isn't in this version yet.
+            return self.capture_page(char_name, 'abilities', JP), False
+
+        # The last two abilities are calls, so the whole list has loaded once the second to last one is a call.
+        with self.stage_timer.span('ability_scroll', char_name, JP):
+            lazy_list = self.waiter.collect_lazy_list(
+                self.driver,
+                'abilities',
+                "div[class='infotitle abilitydisplayfex ']",
+                marker='(C)',
+                marker_index=-2,
+                scroll_step=scroll_speed
+            )
+
+        self.logger.info(
+            "Collected %s abilities after %s scrolls for %s.", lazy_list['item_count'], lazy_list['scrolls'], char_name.upper()
+        )
+
+        if not lazy_list['marker_found']:
+            self.logger.info("Ability list never ended with calls. Examine this function for: %s", char_name.upper())
+
+        return self.capture_page(char_name, 'abilities', JP, page_html=lazy_list['page_html']), True
+
+    def open_page(self, char_name, page_type, JP=False):
+        """
+
+        Loads one of a character's pages in the browser ('abilities', 'buffs', 'high_armor', or
+        'high_armor_plus') and waits for it to be ready. While resource blocking is calibrating for the page
+        type, the page is loaded unblocked first and then blocked, so the savings are measured on the same page.
+        Only the blocked load counts as a page load. The unblocked one is timed as a 'blocking_calibration'
+        span, and isn't counted by the navigation planner or the browser pool.
+
+        """
+
+        for blocked in ([False, True] if self.resource_blocker.calibrating(page_type) else [True]):
+            self.resource_blocker.before_load(self.driver, page_type, blocked=blocked)
+
+            started_at = time.perf_counter()
+
+            with self.stage_timer.span('page_load' if blocked else 'blocking_calibration', char_name, JP):
+                self.driver.get(self.character_dict_omnibus[char_name][f'{page_type}_url'])
+
+                self.waiter.for_page_ready(self.driver, page_type)
+
+            seconds = time.perf_counter() - started_at
+
+            if blocked:
+                self.navigation_planner.record_load()
+                self.browser_pool.record_page_load(seconds)
+
+            self.resource_blocker.after_load(self.driver, char_name, page_type, seconds)
+
+    def switch_version(self, char_name, page_type, JP=False):
+        """
+
+        Clicks the open page's flag button to show the requested game version. Returns False if the page has
+        no button to click (e.g., it's already showing that version).
+
+        """
+
+        if JP:
+            button_xpath = "//span[@class='glflage smalleventbutton']"
+        else:
+            button_xpath = "//span[@class='jpflage jpsmallinactive smalleventbutton']"
+
+        with self.stage_timer.span('version_toggle', char_name, JP):
+            try:
+                ActionChains(self.driver).click(self.driver.find_element(By.XPATH, button_xpath)).perform()
+
+                self.waiter.for_dom_stable(self.driver, page_type)
+            except Exception:
+                return False
+
+        return True
+
+    def capture_jp_in_place(
+        self,
+        char_name,
+        page_type,  # Page type of the open page
+        capture,  # Called once the page shows JP. Returns a dictionary of page type -> HTML, or None if it couldn't capture.
+        saved_loads = 1  # Page loads the JP pass would have needed for these pages
+    ):
+        """
+
+        Switches the open page to JP, captures it, holds the captured pages for the character's JP pass, and
+        switches back to GL. If the capture fails, nothing is held, so the JP pass loads the pages itself
+        instead of taking a failed capture for a missing page.
+
+        """
+
+        self.driver.execute_script("window.scrollTo(0, 0);")
+
+        if not self.switch_version(char_name, page_type, JP=True):
+            self.logger.info("Couldn't switch the %s page to JP for %s. The JP pass will load it.", page_type, char_name.upper())
+            return
+
+        try:
+            page_dict = capture()
+        except Exception as e:
+            self.logger.info("Capturing the JP %s page in place failed for %s: %s", page_type, char_name.upper(), e)
+            page_dict = None
+
+        if page_dict is None:
+            self.logger.info("Couldn't capture the JP %s page for %s. The JP pass will load it.", page_type, char_name.upper())
+        else:
+            self.navigation_planner.hold_pages(char_name, page_dict, saved_loads=saved_loads)
+
+        self.switch_version(char_name, page_type, JP=False)
+
+    def parse_ability_page(self, char_name, page_html, JP=False):
+        """
+
+        Splits a character's ability page into its ability title and ability info blocks, then builds
+        the character's ability dictionary from them. Also handles the rework and "not in GL yet" checks.
+
+        """
+
+        soup = self.html_to_soup(page_html)
+
+        if not JP:
+            self.screen_for_rework(char_name, soup)
+
+        ability_list = self.find_all_by_class(soup, 'div', 'infotitle abilitydisplayfex ')
+
+        if not ability_list:
+            self.handle_missing_abilities(char_name, JP)
+            return
+
+        ability_second_div_list = self.find_all_by_class(soup, 'div', 'bluebase abilityinfobase')
+
+        for ability in ability_list:
+            self.parser_logger.info("%s", self.element_text(ability))
+
+        self.logger.info("Collected ability info list for %s", char_name)
+
+        return self.build_ability_dict(char_name, ability_list, ability_second_div_list, JP=JP)
+
+    def handle_missing_abilities(self, char_name, JP=False):
+        """
+
+        Logs that a character's abilities couldn't be found. In GL, this means the character
+        probably isn't released yet, so they're queued up for the JP pass.
+
+        """
+
+        self.logger.info("Unable to access abilities for %s.", char_name.upper())
+        if not JP:
+            self.logger.info("They might not be released to GL yet.")
+            if char_name not in self.chars_not_in_gl_yet:
+                self.chars_not_in_gl_yet.append(char_name)
+        else:
+            self.logger.info("Something's wrong with ability_dict generation for %s, since we're already checking the JP version.", char_name.upper())
+
+    def build_ability_dict(
+        self,
+        char_name,  # Character name, as a string
+        ability_list,  # Ability title elements ('infotitle abilitydisplayfex ')
+        ability_second_div_list,  # Ability info elements ('bluebase abilityinfobase'), in the same order
+        JP = False
+    ):
+        """
+
+        Pairs each ability's title element with its info element, extracts the ability's inline
+        attributes, and adds the resulting dictionary to the GL or JP ability omnibus. Works with
+        either live WebElements or tags from a parsed snapshot.
+
+        """
+
+        ability_dict = {}
+
+        for index, ability_first_div in enumerate(ability_list):
+
+            ability_name = str(self.element_text(ability_first_div))
+
+            ability_dict[ability_name] = {}
+
+            ability_dict[ability_name]['short_name'] = str(ability_name.split(' - ')[0])
+            ability_dict[ability_name]['ability_attack_info'] = ability_second_div_list[index]
+
+            inline_attribute_list  = []
+
+            ability_first_div_html = self.prettify_html_to_list(ability_first_div)
+
+            for line in ability_first_div_html:
+                if re.search(r"inline ", line):
+                    inline_attribute = re.search(r"(inline )(\w+)", line).group(2)
+                    inline_attribute_list.append(inline_attribute)
+
+            ability_dict[ability_name]['attribute_list'] = inline_attribute_list
+
+        self.logger.info('Finished extracting inline attributes for %s', char_name.upper())
+
+        if not JP:
+
+            self.ability_dict_omnibus_gl[char_name] = {}
+            self.ability_dict_omnibus_gl[char_name] = ability_dict
+
+        elif JP:
+
+            self.ability_dict_omnibus_jp[char_name] = {}
+            self.ability_dict_omnibus_jp[char_name] = ability_dict
+
+        return ability_dict
+
+
+    def generate_ability_df(
+        self,
+        char_name,  # Character name, as a string
+        JP = False  # If True, will pull from the JP version of ability_dict_omnibus instead of the GL version
+    ):
+        """
+
+        Extracts the number of HP attacks dealt to an ability's main target and non-targets. The
+        function input should be a character name (char_name) in string format. Pulls data from
+        self.ability_dict_omnibus, so `generate_ability_dict` should be run for the character
+        beforehand.
+
+        Returns a pandas dataframe with the ability name, number of HP attacks into main targets,
+        number of HP attacks into non-targets, and ability attribute list. Corrections for uncapped
+        abilities and wrong HP caps aren't applied here; see self.ability_overrides.
+
+        """
+
+        self.logger.info(self.LOG_DIVIDER)
+        self.logger.info("Parsing ability dict to df for %s.", char_name.upper())
+        self.logger.info(self.LOG_DIVIDER)
+
+        try:
+            if not JP:
+                ability_dictionary = self.ability_dict_omnibus_gl[char_name]
+            elif JP:
+                ability_dictionary = self.ability_dict_omnibus_jp[char_name]
+        except Exception:
+            self.logger.info("Couldn't find ability_dict for %s. Creating it now.", char_name.upper())
+
+            self.generate_ability_dict(
+                char_name=char_name,
+                JP=JP,
+                return_output=False
+            )
+
+            try:
+                if not JP:
+                    ability_dictionary = self.ability_dict_omnibus_gl[char_name]
+                elif JP:
+                    ability_dictionary = self.ability_dict_omnibus_jp[char_name]
+            except Exception:
+                version = 'GL' if not JP else 'JP'
+                self.logger.info("Couldn't retrieve ability dict. Character must not be in %s yet.", version)
+                return
+
+        df_row_list = []
+
+        with self.stage_timer.span('parse_abilities', char_name, JP):
+            for ability_name in ability_dictionary:
+
+                self.parser_logger.info("Begin parsing for %s.", ability_name.upper())
+
+                ability_html_lines = self.prettify_html_to_list(
+                    ability_dictionary[ability_name]['ability_attack_info']
+                    )
+
+                row_dict = {}
+
+                row_dict['ability_name'] = ability_dictionary[ability_name]['short_name']
+                row_dict['ability_id'] = ability_name.split(' - ')[1].replace('#', '')
+
+                main_target_hp_attacks, non_target_hp_attacks, hp_dmg_cap_up_perc = self.hp_attack_parser.parse(
+                    ability_name, ability_html_lines
+                )
+
+                row_dict['main_target_hp_attacks'] = main_target_hp_attacks
+                row_dict['non_target_hp_attacks'] = non_target_hp_attacks
+                row_dict['hp_dmg_cap_up_perc'] = hp_dmg_cap_up_perc
+
+
+                # Add ability attribute column
+                row_dict['attribute_list'] = ability_dictionary[ability_name]['attribute_list']
+                row_dict['game_version'] = 'GL' if not JP else 'JP'
+
+                df_row_list.append(row_dict)
+
+        ability_df = pd.DataFrame(df_row_list)
+
+        ability_df['char_name'] = char_name
+
+        self.logger.info("Sucessfully converted ability df for %s", char_name.upper())
+
+        return ability_df[['char_name', 'ability_name', 'ability_id', 'main_target_hp_attacks', 'non_target_hp_attacks', 'hp_dmg_cap_up_perc', 'attribute_list', 'game_version']]
+
+    def retrieve_hp_caps_from_bt(
+        self,
+        char_name,  # Character's name as a string
+        JP = False, # If true, will check the JP version of the website instead of GL
+        return_output = False # If true, will return a pandas dataframe row after running
+    ):
+
+        """
+
+        Takes a character's name as input and adds a key-value pair to self.bt_effect_dict_omnibus. Key is char_name, and
+        the value is a dictionary with three key-value pairs:
+
+        1) Character's name
+        2) Personal HP Dmg Cap up from BT effect
+        3) Party-side HP Dmg Cap up from BT effect
+
+        The buffs page is captured in every slider state that needs parsing (or loaded from the browserless page
+        backend) before any parsing happens.
+
+        """
+
+        self.logger.info(self.LOG_DIVIDER)
+        self.logger.info("Retrieving BT info for %s.", char_name.upper())
+        self.logger.info(self.LOG_DIVIDER)
+
+        if self.browserless or self.is_prefetched(char_name, self.bt_page_types(char_name), JP):
+            bt_page_dict = {
+                page_type: self.load_page(char_name, page_type, JP)
+                for page_type in self.bt_page_types(char_name)
+            }
+
+            if any(page_html is None for page_html in bt_page_dict.values()):
+                self.logger.info("Couldn't find BT pages for %s", char_name.upper())
+                return
+        else:
+            bt_page_dict = self.capture_bt_pages(char_name, JP=JP)
+
+            if bt_page_dict is None:
+                return
+
+        with self.stage_timer.span('parse_bt', char_name, JP):
+            return self.parse_bt_pages(char_name, bt_page_dict, JP=JP, return_output=return_output)
+
+    @staticmethod
+    def bt_page_types(char_name):
+        """
+
+        Returns the snapshot page types that make up a character's BT effect. Lann & Reynn's BT changes
+        with the number of enemies, so their buffs page is saved once per enemy count.
+
+        """
+
+        if char_name == 'lannreynn':
+            return ['buffs_enemies_1', 'buffs_enemies_2', 'buffs_enemies_3']
+
+        return ['buffs']
+
+    def capture_bt_pages(self, char_name, JP=False):
+        """
+
+        Loads a character's buffs page, opens their BT effect, and moves its sliders into position. Returns a
+        dictionary where the keys are the page types from `bt_page_types` and the values are the page's HTML
+        in that state. Returns None if the character doesn't have a BT effect that can be parsed.
+
+        """
+
+        self.open_page(char_name, 'buffs', JP)
+
+        self.switch_version(char_name, 'buffs', JP=JP)
+
+        bt_page_dict = self.capture_bt_states(char_name, JP=JP)
+
+        if not JP and self.navigation_planner.captures_jp_in_place(char_name):
+            self.capture_jp_in_place(
+                char_name,
+                'buffs',
+                lambda: self.capture_bt_states(char_name, JP=True)
+            )
+
+        return bt_page_dict
+
+    def capture_bt_states(self, char_name, JP=False):
+        """
+
+        Opens the BT effect on the open buffs page and captures it with its sliders in every position that
+        needs parsing. Returns the same dictionary as capture_bt_pages.
+
+        """
+
+        actions = ActionChains(self.driver)
+
+        try:
+            # Find the BT button for the character's buff page
+            bt_button_element = self.driver.find_element(By.XPATH, "//li[@class='filterinactive buffbutton wpbtbutton']")
+        except Exception:
+            print(f"Unable to find a BT for {char_name.title()}. Either the character isn't in GL yet, or they lack a BT in both GL and JP.")
+            self.logger.info("Couldn't find BT button for %s", char_name.upper())
+            return
+
+        # Click on it to make sure that the buff appears
+        actions.click(bt_button_element).perform()
+
+        # Scroll down to make sure the BT buff loads fully
+        self.driver.execute_script(f"window.scrollBy(0, 600);")
+
+        self.waiter.for_dom_stable(self.driver, 'buffs')
+
+        self.driver.execute_script(f"window.scrollBy(0, 600);")
+
+        self.waiter.for_dom_stable(self.driver, 'buffs')
+
+        if char_name != 'lannreynn' and char_name != 'yda':
             # Set leveled BT to max before extracting auras
             try:
                 if self.driver.find_element(By.XPATH, "//div[@class='sliderbase infonameholder nobuffpadding']"):
@@ -677,64 +1159,262 @@ class CompendiumScraper:
             try:
                 if self.driver.find_element(By.XPATH, "//div[@class='sliderbase infonameholderenemybuff nobuffpadding']"):
 
-                    pretty_div_block_list = self.prettify_html_to_list(
-                        self.driver.find_element(
-                            By.XPATH, "//div[@class='sliderbase infonameholderenemybuff nobuffpadding']"
-                        )
-                    )
+                    pretty_div_block_list = self.prettify_html_to_list(
+                        self.driver.find_element(
+                            By.XPATH, "//div[@class='sliderbase infonameholderenemybuff nobuffpadding']"
+                        )
+                    )
+
+                    try:
+                        # find slider class
+                        for line in pretty_div_block_list:
+                            if re.search(r'css-(\w+)-Slider', line):
+                                slider_class = re.search(r'css-\w+-Slider', line).group()
+
+                        # Find width element class
+                        for line in pretty_div_block_list:
+                            if re.search(r'(css-\w+)(" style)', line):
+                                width_element_class = re.search(r'(css-\w+)(" style)', line).group(1)
+
+                        slider = self.driver.find_element(By.XPATH, f"//div[@class='{slider_class}']")
+                        width_element = self.driver.find_element(By.XPATH, f"//div[@class='{width_element_class}']")
+
+                    except Exception:
+                        print("There's a new BT Effect slider for you to figure out.")
+                        self.logger.info("Unable to account for BT Effect slider for %s.", char_name.upper())
+                        return
+
+                with self.stage_timer.span('bt_slider', char_name, JP):
+                    if self.slider_controller.set_fill(self.driver, slider, width_element, 100, label=f"{char_name.upper()} BT stacks"):
+                        self.logger.info("Reached max stacks!")
+            except Exception:
+                self.logger.info(f"No stack slider found. Assuming {char_name.upper()} has a BT without stacks.")
+                pass
+
+            return {'buffs': self.capture_page(char_name, 'buffs', JP)}
+
+        elif char_name == 'lannreynn':
+            self.logger.info("Capturing BT Effect for Lann & Reynn")
+
+            bt_page_dict = {}
+
+            pretty_div_block_list = self.prettify_html_to_list(
+                        self.driver.find_element(
+                            By.XPATH, "//div[@class='sliderbase infonameholderenemybuff nobuffpadding']"
+                        )
+                    )
+
+            # find slider class
+            for line in pretty_div_block_list:
+                if re.search(r'css-(\w+)-Slider', line):
+                    slider_class = re.search(r'css-\w+-Slider', line).group()
+
+            # Find width element class
+            for line in pretty_div_block_list:
+                if re.search(r'(css-\w+)(" style)', line):
+                    width_element_class = re.search(r'(css-\w+)(" style)', line).group(1)
+
+            slider = self.driver.find_element(By.XPATH, f"//div[@class='{slider_class}']")
+            width_element = self.driver.find_element(By.XPATH, f"//div[@class='{width_element_class}']")
+
+            # Set the slider to each enemy count, then save the page for parsing.
+            for enemy_count, fill_percentage in [(1, 0), (2, 50), (3, 100)]:
+                with self.stage_timer.span('bt_slider', char_name, JP):
+                    if not self.slider_controller.set_fill(self.driver, slider, width_element, fill_percentage, label=f"{char_name.upper()} enemy count"):
+                        self.logger.info("Unable to set the slider to an enemy count of %s for %s.", enemy_count, char_name.upper())
+                        return
+
+                self.logger.info("Slider set to enemy count of %s.", enemy_count)
+
+                page_type = f'buffs_enemies_{enemy_count}'
+                bt_page_dict[page_type] = self.capture_page(char_name, page_type, JP)
+
+            return bt_page_dict
+
+        elif char_name == 'yda':  # Necessary due to new stacked BT effect implementation from game devs
+
+            buff_holder_element = self.driver.find_element(By.CLASS_NAME, "directbuffholder")
+
+            # Every buff in the holder has its own stack slider.
+            for index, (slider, width_element) in enumerate(self.slider_pairs(buff_holder_element)):
+
+                self.logger.info("Processing loop number %s.", index+1)
+
+                with self.stage_timer.span('bt_slider', char_name, JP):
+                    if self.slider_controller.set_fill(self.driver, slider, width_element, 100, label=f"{char_name.upper()} BT stacks {index+1}"):
+                        self.logger.info("Reached max stacks!")
+
+            return {'buffs': self.capture_page(char_name, 'buffs', JP)}
+
+    def slider_pairs(self, container_element):
+        """
+
+        Returns a list of (slider, width element) pairs for every slider inside a container element, in page
+        order. Sliders and width elements are found by their generated css-* classes.
+
+        """
+
+        slider_class_list = []
+        width_class_list = []
+
+        for line in self.prettify_html_to_list(container_element):
+            slider_match = re.search(r'css-\w+-Slider', line)
+            width_match = re.search(r'(css-\w+)(" style)', line)
+
+            if slider_match and slider_match.group() not in slider_class_list:
+                slider_class_list.append(slider_match.group())
+
+            if width_match and width_match.group(1) not in width_class_list:
+                width_class_list.append(width_match.group(1))
+
+        slider_elements = [
+            slider for slider_class in slider_class_list
+            for slider in container_element.find_elements(By.CLASS_NAME, slider_class)
+        ]
+        width_elements = [
+            width_element for width_class in width_class_list
+            for width_element in container_element.find_elements(By.CLASS_NAME, width_class)
+        ]
+
+        return list(zip(slider_elements, width_elements))
+
+    def parse_bt_pages(
+        self,
+        char_name,  # Character's name as a string
+        bt_page_dict,  # Output of capture_bt_pages (or the matching snapshots)
+        JP = False,
+        return_output = False
+    ):
+        """
+
+        Extracts personal and party HP Dmg Cap up from a character's captured BT effect pages and adds the
+        results to the GL or JP BT effect omnibus.
+
+        """
+
+        bt_personal_hp_dmg_cap_up = 0
+        bt_party_hp_dmg_cap_up = 0
+
+        if char_name != 'lannreynn' and char_name != 'yda':
+
+            soup = self.html_to_soup(bt_page_dict['buffs'])
+
+            buff_holder_element = self.find_all_with_class(soup, "directbuffholder")[0]
+
+            buffunit_list = self.find_all_with_class(buff_holder_element, "buffunit")
+
+            bt_buff_description_div = None
+
+            for buffunit_div in buffunit_list:
+                buffunit_text = self.element_text(buffunit_div)
+                # Deuce's BT is labeled 'Wonderful Finale (F)' instead of 'Wonderful Finale (B)', which breaks the scraper.
+                if re.search(r"\(B\)", buffunit_text) or re.search(r"Wonderful Finale", buffunit_text):
+                    bt_buff_description_div = buffunit_div
+                    break
+
+            if bt_buff_description_div is None:
+                self.logger.info("Couldn't find BT buff description for %s", char_name.upper())
+                return
+
+            bt_buff_html_list = self.prettify_html_to_list(bt_buff_description_div)
+
+            for index, line in enumerate(bt_buff_html_list):
+
+                if re.search(r"- MAX BRV Cap", line) or re.search(r"└─ MAX BRV Cap", line):  # Personal HP Dmg Cap Up has this string
+                    try:  # Rufus fulfills preceding condition, but his BT effect text is anomalous and will trigger exception
+                        bt_personal_hp_dmg_cap_up += int(re.search(r"\d+", bt_buff_html_list[index + 6]).group())
+                    except Exception:
+                        pass
+                if re.search(r"- Party MAX BRV Cap", line) or re.search(r"└─ Party MAX BRV Cap", line):  # Party HP Dmg Cap up has this string
+                    bt_party_hp_dmg_cap_up += int(re.search(r"\d+", bt_buff_html_list[index + 6]).group())
+
+            bt_effect_dict = {}
+            bt_effect_dict['char_name'] = char_name
+            bt_effect_dict['bt_personal_hp_dmg_cap_up'] = bt_personal_hp_dmg_cap_up
+            bt_effect_dict['bt_party_hp_dmg_cap_up'] = bt_party_hp_dmg_cap_up
+            bt_effect_dict['enemy_count_apply_list'] = [1, 2, 3]
+
+            if not JP:
+
+                bt_effect_dict['game_version'] = 'GL'
+                self.bt_effect_dict_omnibus_gl[char_name] = bt_effect_dict
+
+            elif JP:
+
+                bt_effect_dict['game_version'] = 'JP'
+                self.bt_effect_dict_omnibus_jp[char_name] = bt_effect_dict
+
+            self.logger.info("Retrieved BT info for %s.", char_name.upper())
+
+            if return_output:
+                bt_effect_df = pd.DataFrame([bt_effect_dict])
+
+                return bt_effect_df
+        elif char_name == 'lannreynn':
+            self.logger.info("Parsing BT Effect for Lann & Reynn")
+
+            bt_effect_dict_list = []
+
+            for enemy_count in [1, 2, 3]:
+
+                bt_personal_hp_dmg_cap_up = 0
+                bt_party_hp_dmg_cap_up = 0
+
+                soup = self.html_to_soup(bt_page_dict[f'buffs_enemies_{enemy_count}'])
+
+                bt_buff_description_div = self.find_all_by_class(soup, 'div', 'Buffbase infobase nobuffpadding')[0]
+
+                bt_buff_html_list = self.prettify_html_to_list(bt_buff_description_div)
+
+                for index, line in enumerate(bt_buff_html_list):
+
+                    if re.search(r"- MAX BRV Cap", line) or re.search(r"└─ MAX BRV Cap", line):  # Personal HP Dmg Cap Up has this string
+                        bt_personal_hp_dmg_cap_up += int(re.search(r"\d+", bt_buff_html_list[index + 6]).group())
+                    if re.search(r"- Party MAX BRV Cap", line) or re.search(r"└─ Party MAX BRV Cap", line):  # Party HP Dmg Cap up has this string
+                        bt_party_hp_dmg_cap_up += int(re.search(r"\d+", bt_buff_html_list[index + 6]).group())
+
+                bt_effect_dict = {}
+                bt_effect_dict['char_name'] = char_name
+                bt_effect_dict['bt_personal_hp_dmg_cap_up'] = bt_personal_hp_dmg_cap_up
+                bt_effect_dict['bt_party_hp_dmg_cap_up'] = bt_party_hp_dmg_cap_up
+                bt_effect_dict['game_version'] = 'GL' if not JP else 'JP'
+                bt_effect_dict['enemy_count_apply_list'] = [enemy_count]
 
-                    try:
-                        # find slider class
-                        for line in pretty_div_block_list:
-                            if re.search(r'css-(\w+)-Slider', line):
-                                slider_class = re.search(r'css-\w+-Slider', line).group()
+                bt_effect_dict_list.append(bt_effect_dict)
 
-                        # Find width element class
-                        for line in pretty_div_block_list:
-                            if re.search(r'(css-\w+)(" style)', line):
-                                width_element_class = re.search(r'(css-\w+)(" style)', line).group(1)
+            if not JP:
 
-                        slider = self.driver.find_element(By.XPATH, f"//div[@class='{slider_class}']")
-                        width_element = self.driver.find_element(By.XPATH, f"//div[@class='{width_element_class}']")
+                self.bt_effect_dict_omnibus_gl[char_name] = bt_effect_dict_list
 
-                    except Exception:
-                        print("There's a new BT Effect slider for you to figure out.")
-                        self.logger.info("Unable to account for BT Effect slider for %s.", char_name.upper())
-                        return
+            elif JP:
 
-                offset = 80
+                self.bt_effect_dict_omnibus_jp[char_name] = bt_effect_dict_list
 
-                while width_element.get_attribute('style') != 'width: 100%;':
-                    offset += 10
-                    actions.drag_and_drop_by_offset(slider, offset, 0).release().perform()
-                    self.logger.info("Offset of %s performed.", offset)
+            self.logger.info("Retrieved BT info for %s.", char_name.upper())
 
-                self.logger.info("Reached max stacks!")
-            except Exception:
-                self.logger.info(f"No stack slider found. Assuming {char_name.upper()} has a BT without stacks.")
-                pass
+            if return_output:
+                bt_effect_df = pd.concat([pd.DataFrame(dict) for dict in bt_effect_dict_list])
 
-            buff_holder_element = self.driver.find_element(By.CLASS_NAME, "directbuffholder")
+                return bt_effect_df
+
+        elif char_name == 'yda':  # Necessary due to new stacked BT effect implementation from game devs
 
-            buffunit_list = buff_holder_element.find_elements(By.CLASS_NAME, "buffunit")
+            soup = self.html_to_soup(bt_page_dict['buffs'])
+
+            buff_holder_element = self.find_all_with_class(soup, "directbuffholder")[0]
+
+            buffunit_list = self.find_all_with_class(buff_holder_element, "buffunit")
 
             for buffunit_div in buffunit_list:
-                # Deuce's BT is labeled 'Wonderful Finale (F)' instead of 'Wonderful Finale (B)', which breaks the scraper.
-                if re.search(r"\(B\)", buffunit_div.text) or re.search(r"Wonderful Finale", buffunit_div.text):
-                    bt_buff_description_div = buffunit_div
-                    break
 
-            bt_buff_html_list = self.prettify_html_to_list(bt_buff_description_div)
+                pretty_div_block_list = self.prettify_html_to_list(buffunit_div)
 
-            for index, line in enumerate(bt_buff_html_list):
+                for index, line in enumerate(pretty_div_block_list):
 
-                if re.search(r"- MAX BRV Cap", line) or re.search(r"└─ MAX BRV Cap", line):  # Personal HP Dmg Cap Up has this string
-                    try:  # Rufus fulfills preceding condition, but his BT effect text is anomalous and will trigger exception
-                        bt_personal_hp_dmg_cap_up += int(re.search(r"\d+", bt_buff_html_list[index + 6]).group())
-                    except Exception:
-                        pass
-                if re.search(r"- Party MAX BRV Cap", line) or re.search(r"└─ Party MAX BRV Cap", line):  # Party HP Dmg Cap up has this string
-                    bt_party_hp_dmg_cap_up += int(re.search(r"\d+", bt_buff_html_list[index + 6]).group())
+                    if re.search(r"- MAX BRV Cap", line) or re.search(r"└─ MAX BRV Cap", line):  # Personal HP Dmg Cap Up has this string
+                        bt_personal_hp_dmg_cap_up += int(re.search(r"\d+", pretty_div_block_list[index + 6]).group())
+                    if re.search(r"- Party MAX BRV Cap", line) or re.search(r"└─ Party MAX BRV Cap", line):  # Party HP Dmg Cap up has this string
+                        bt_party_hp_dmg_cap_up += int(re.search(r"\d+", pretty_div_block_list[index + 6]).group())
 
             bt_effect_dict = {}
             bt_effect_dict['char_name'] = char_name
@@ -758,542 +1438,1105 @@ class CompendiumScraper:
                 bt_effect_df = pd.DataFrame([bt_effect_dict])
 
                 return bt_effect_df
-        elif char_name == 'lannreynn':
-            self.logger.info("Parsing BT Effect for Lann & Reynn")
 
-            bt_effect_dict_list = []
+    def retrieve_ha_hp_dmg_cap_up(self, char_name, JP=False, return_output=False):
+        """
+
+        Retrieves HP Dmg Cap up values from a character's high armor pages, both personal and
+        party-wide, and adds character key-value pair to self.ha_dict_omnibus, where the key is char_name and the
+        value is a dict with  three key-value pairs: 1) character name, 2) personal hp dmg cap up,
+        and 3) party-wide hp dmg cap up. Without a browser, the pages come from the page backend.
+
+        """
+        self.logger.info(self.LOG_DIVIDER)
+        self.logger.info("Retrieving High Armor info for %s.", char_name.upper())
+        self.logger.info(self.LOG_DIVIDER)
+
+        try:
+            if JP and self.ha_dict_omnibus_gl[char_name]:  # We shouldn't do this if we already collected it in GL -- it'll be the same
+                self.logger.info("High armor already parsed for %s. Skipping.", char_name.upper())
+
+                if not self.browserless:
+                    self.navigation_planner.record_saved(
+                        char_name, len(NavigationPlanner.VERSION_INVARIANT_PAGE_TYPES), "high armor doesn't change in JP"
+                    )
+
+                return
+        except Exception:
+            pass
+
+        if self.browserless or self.is_prefetched(char_name, ['high_armor', 'high_armor_plus'], JP):
+            high_armor_page_html = self.load_page(char_name, 'high_armor', JP)
+            high_armor_plus_page_html = self.load_page(char_name, 'high_armor_plus', JP)
+
+            if high_armor_page_html is None:
+                return
+        else:
+            high_armor_page_html, high_armor_plus_page_html = self.capture_ha_pages(char_name, JP=JP)
+
+        with self.stage_timer.span('parse_high_armor', char_name, JP):
+            return self.parse_ha_pages(char_name, high_armor_page_html, high_armor_plus_page_html, JP=JP, return_output=return_output)
+
+    def parse_ha_pages(
+        self,
+        char_name,  # Character's name as a string
+        high_armor_page_html,
+        high_armor_plus_page_html,  # None if the page couldn't be loaded
+        JP = False,
+        return_output = False  # If true, will return a pandas dataframe row after running
+    ):
+        """
+
+        Parses a character's high armor and high armor plus pages (from capture_ha_pages or the page backend)
+        and adds their HP Dmg Cap up values to the GL or JP high armor omnibus.
+
+        """
+
+        high_armor_div_list = self.find_all_by_class(
+            self.html_to_soup(high_armor_page_html), 'div', 'infonameholderenemybuff default_passive Buffbase'
+        )
+
+        if not high_armor_div_list:
+            self.logger.info("Could not find High Armor for %s.", char_name.upper())
+            print(f"Unable to find High Armor info for {char_name.title()}.")
+            if not JP:
+                print("They might not be released to GL yet.")
+                if char_name not in self.chars_not_in_gl_yet:
+                    self.chars_not_in_gl_yet.append(char_name)
+                return
+            else:
+                self.logger.info("Something's wrong with high armor parsing for %s, since we're already checking the JP version.", char_name.upper())
+                return
+
+        if high_armor_plus_page_html is None:
+            self.logger.info("Couldn't find High Armor+ page for %s.", char_name.upper())
+            return
+
+        high_armor_html = self.prettify_html_to_list(high_armor_div_list[0])
+
+        personal_ha_hp_dmg_cap_up = 0
+        party_ha_hp_dmg_cap_up = 0
+
+        # Extract base high armor values
+        for index, line in enumerate(high_armor_html):
+            if re.search(r"- MAX BRV Cap", line):
+                personal_ha_hp_dmg_cap_up += int(re.search("\d+", high_armor_html[index + 6]).group())
+            if re.search(r"- Party MAX BRV Cap", line):
+                party_ha_hp_dmg_cap_up += int(re.search("\d+", high_armor_html[index + 6]).group())
+
+        high_armor_plus_div_list = self.find_all_by_class(
+            self.html_to_soup(high_armor_plus_page_html), 'div', 'infonameholderenemybuff default_passive Buffbase'
+        )
+
+        for div_block in high_armor_plus_div_list:
+
+            ha_plus_html = self.prettify_html_to_list(div_block)
+
+            for index, line in enumerate(ha_plus_html):
+                if re.search(r"- MAX BRV Cap", line):
+                    personal_ha_hp_dmg_cap_up += int(re.search(
+                        "\d+", ha_plus_html[index + 6]
+                    ).group())
+
+                if re.search(r"- Party MAX BRV Cap", line):
+                    party_ha_hp_dmg_cap_up += int(re.search(
+                        "\d+", ha_plus_html[index + 6]
+                    ).group())
+
+        ha_hp_dmg_cap_up_dict = {}
+        ha_hp_dmg_cap_up_dict['char_name'] = char_name
+        ha_hp_dmg_cap_up_dict['personal_hp_dmg_cap_up'] = personal_ha_hp_dmg_cap_up
+        ha_hp_dmg_cap_up_dict['party_ha_hp_dmg_cap_up'] = party_ha_hp_dmg_cap_up
+
+        if not JP:
+
+            ha_hp_dmg_cap_up_dict['game_version'] = 'GL'
+            self.ha_dict_omnibus_gl[char_name] = ha_hp_dmg_cap_up_dict
+
+        elif JP:
+
+            ha_hp_dmg_cap_up_dict['game_version'] = 'JP'
+            self.ha_dict_omnibus_jp[char_name] = ha_hp_dmg_cap_up_dict
+
+        self.logger.info("High armor info parsed for %s.", char_name.upper())
+
+        if return_output:
+            ha_hp_dmg_cap_up_df = pd.DataFrame([ha_hp_dmg_cap_up_dict])
+
+            return ha_hp_dmg_cap_up_df
+
+    def capture_ha_pages(self, char_name, JP=False):
+        """
+
+        Loads a character's high armor and high armor plus pages in the requested game version and
+        returns their HTML as a tuple. The high armor plus page is only loaded if the character has a
+        high armor, and is None otherwise.
+
+        """
+
+        self.open_page(char_name, 'high_armor', JP)
+
+        self.switch_version(char_name, 'high_armor', JP=JP)
+
+        high_armor_page_html = self.capture_page(char_name, 'high_armor', JP)
+
+        if self.has_high_armor():
+            return high_armor_page_html, self.capture_ha_plus_page(char_name, JP=JP)
+
+        # Without a GL high armor, the character gets a JP pass. Their JP high armor is one click away.
+        if not JP and self.navigation_planner.enabled:
+            self.navigation_planner.plan_jp_in_place(char_name, "no GL high armor")
+
+            self.capture_jp_in_place(
+                char_name,
+                'high_armor',
+                lambda: {
+                    'high_armor': self.capture_page(char_name, 'high_armor', True),
+                    'high_armor_plus': self.capture_ha_plus_page(char_name, JP=True) if self.has_high_armor() else None
+                }
+            )
+
+        return high_armor_page_html, None
+
+    def has_high_armor(self):
+        """
+
+        Returns True if the open page shows a high armor block.
+
+        """
+
+        try:
+            self.driver.find_element(By.XPATH, "//div[@class='infonameholderenemybuff default_passive Buffbase']")
+        except Exception:
+            return False
+
+        return True
+
+    def capture_ha_plus_page(self, char_name, JP=False):
+        """
+
+        Loads a character's high armor plus page, scrolls until every block has loaded, and captures it. The
+        site keeps the game version picked on the high armor page.
+
+        """
+
+        self.open_page(char_name, 'high_armor_plus', JP)
+
+        with self.stage_timer.span('ha_plus_scroll', char_name, JP):
+            self.driver.execute_script("window.scrollBy(0, 300);")
+
+            high_armor_plus_div_list = self.driver.find_elements(
+                By.XPATH, "//div[@class='infonameholderenemybuff default_passive Buffbase']"
+            )
+
+            # Make sure we've captured all the HA+ blocks before extracting data
+            while len(high_armor_plus_div_list) < 5:
+                self.driver.execute_script("window.scrollBy(0, 300);")
+                self.waiter.for_dom_stable(self.driver, 'high_armor_plus')
+                high_armor_plus_div_list = self.driver.find_elements(
+                    By.XPATH, "//div[@class='infonameholderenemybuff default_passive Buffbase']"
+                )
+
+        return self.capture_page(char_name, 'high_armor_plus', JP)
+
+    def screen_for_rework(self, char_name, soup):
+        """
+
+        Checks whether a character has had a rework in the Japanese version of the game. If so, this function
+        will add them to the characters with reworks list to be parsed later. Takes the parsed abilities page.
+
+        """
+
+        if self.find_all_by_class(soup, 'li', 'filterinactive buffbutton reworktabred_direct'):
+            self.chars_with_reworks_pending.append(char_name)
+            self.logger.info("Found an upcoming rework for %s.", char_name.upper())
+
+def scrape_character(
+    cs,  # CompendiumScraper instance
+    char_name,  # Character name, as a string
+    JP = False
+):
+    """
+
+    Runs every scrape for one character in one game version, saves the results to the intermediate
+    store, and returns a dictionary with the character's dataframes and the scraper state
+    they produced. The output is picklable, so it can be sent back from a worker process.
+
+    """
+
+    game_version = 'GL' if not JP else 'JP'
+
+    parsed_ability_df = None
+    bt_effect_df = None
+    high_armor_cap_df = None
+    page_hashes = None
+
+    driver_calls_at_start = cs.driver_call_count
+    wait_seconds_at_start = cs.waiter.total_wait_seconds()
+    spans_at_start = len(cs.stage_timer.span_list)
+    page_loads_at_start = cs.navigation_planner.page_load_count
+    saved_loads_at_start = cs.navigation_planner.saved_load_count
+    savings_at_start = len(cs.resource_blocker.savings_log)
+    failures_at_start = len(cs.failed_page_log)
+    started_at = time.perf_counter()
+
+    # JP pages captured in place during the GL pass are handed out like prefetched pages.
+    cs.page_cache.update(cs.navigation_planner.take_pages(char_name, game_version))
+
+    if cs.manifest is not None:
+        page_dict = cs.prefetch_character_pages(char_name, JP=JP)
+
+        page_hashes = {
+            page_type: None if page_html is None else SnapshotStore.content_hash(page_html)
+            for page_type, page_html in page_dict.items()
+        }
+
+        manifest_entry = cs.manifest.unchanged_entry(char_name, game_version, page_hashes)
+
+        if manifest_entry is not None:
+            carried_forward_result = load_saved_result(cs, char_name, JP, manifest_entry)
+
+            if carried_forward_result is not None:
+                cs.logger.info(
+                    "Pages for %s in %s haven't changed since %s. Carrying forward previous rows.",
+                    char_name.upper(), game_version, manifest_entry['scraped_at_utc']
+                )
+
+                cs.page_cache.clear()
+                carried_forward_result['driver_calls'] = cs.driver_call_count - driver_calls_at_start
+                carried_forward_result['wait_seconds'] = cs.waiter.total_wait_seconds() - wait_seconds_at_start
+                carried_forward_result['spans'] = cs.stage_timer.take_spans(spans_at_start)
+                carried_forward_result['seconds'] = time.perf_counter() - started_at
+                carried_forward_result['page_loads'] = cs.navigation_planner.page_load_count - page_loads_at_start
+                carried_forward_result['page_loads_saved'] = cs.navigation_planner.saved_load_count - saved_loads_at_start
+                carried_forward_result['resource_savings'] = cs.resource_blocker.take_savings(savings_at_start)
+                carried_forward_result['failed_pages'] = cs.failed_page_log[failures_at_start:]
+                carried_forward_result['carried_forward'] = True
+
+                # Restore the flags and dictionaries the parse would have set, so the JP pass sees the same state.
+                merge_character_result(cs, carried_forward_result)
+
+                cs.checkpoints.save(char_name, game_version, ScrapeManifest.build_entry(carried_forward_result))
+
+                return carried_forward_result
+
+    cs.generate_ability_dict(char_name, JP=JP)
+
+    parsed_ability_df = cs.generate_ability_df(char_name, JP=JP)
+
+    bt_effect_df = cs.retrieve_hp_caps_from_bt(char_name, JP=JP, return_output=True)
+
+    high_armor_cap_df = cs.retrieve_ha_hp_dmg_cap_up(char_name, JP=JP, return_output=True)
+
+    # Anything the parsers didn't ask for (e.g., a high armor plus page for a character without high armor)
+    # is dropped, so it doesn't leak into the next character.
+    cs.page_cache.clear()
+
+    intermediate_df_dict = {
+        'ability_df': parsed_ability_df,
+        'bt_effect_df': bt_effect_df,
+        'ha_cap_df': high_armor_cap_df
+    }
+
+    with cs.stage_timer.span('save_intermediates', char_name, JP):
+        cs.intermediate_store.save(char_name, game_version, cs.scrape_started_at_utc, intermediate_df_dict)
+
+    for df_name, df in intermediate_df_dict.items():
+        if df is None:
+            cs.logger.info("No %s to save for %s.", df_name, char_name.upper())
+        else:
+            cs.logger.info("Successfully saved intermediate %s for %s.", df_name, char_name.upper())
+
+    driver_calls = cs.driver_call_count - driver_calls_at_start
+    cs.logger.info(
+        "%s needed %s WebDriver calls in %s.", char_name.upper(), driver_calls, game_version,
+        extra={'char_name': char_name, 'game_version': game_version, 'driver_calls': driver_calls}
+    )
+
+    wait_seconds = cs.waiter.total_wait_seconds() - wait_seconds_at_start
+    cs.logger.info(
+        "%s spent %.1fs waiting on pages in %s.", char_name.upper(), wait_seconds, game_version,
+        extra={'char_name': char_name, 'game_version': game_version, 'wait_seconds': wait_seconds}
+    )
+
+    ability_dict_omnibus = cs.ability_dict_omnibus_gl if not JP else cs.ability_dict_omnibus_jp
+    bt_effect_dict_omnibus = cs.bt_effect_dict_omnibus_gl if not JP else cs.bt_effect_dict_omnibus_jp
+    ha_dict_omnibus = cs.ha_dict_omnibus_gl if not JP else cs.ha_dict_omnibus_jp
+
+    ability_dict = ability_dict_omnibus.get(char_name)
+
+    if ability_dict is not None:
+        # Parsed tags can't be sent between processes cheaply, so keep their HTML instead.
+        ability_dict = {
+            ability_name: {**ability_info, 'ability_attack_info': str(ability_info['ability_attack_info'])}
+            for ability_name, ability_info in ability_dict.items()
+        }
+
+    result = {
+        'char_name': char_name,
+        'game_version': game_version,
+        'ability_df': parsed_ability_df,
+        'bt_effect_df': bt_effect_df,
+        'ha_cap_df': high_armor_cap_df,
+        'ability_dict': ability_dict,
+        'bt_effect_dict': bt_effect_dict_omnibus.get(char_name),
+        'ha_dict': ha_dict_omnibus.get(char_name),
+        'rework_pending': char_name in cs.chars_with_reworks_pending,
+        'not_in_gl_yet': char_name in cs.chars_not_in_gl_yet,
+        'driver_calls': driver_calls,
+        'wait_seconds': wait_seconds,
+        'spans': cs.stage_timer.take_spans(spans_at_start),
+        'seconds': time.perf_counter() - started_at,
+        'page_loads': cs.navigation_planner.page_load_count - page_loads_at_start,
+        'page_loads_saved': cs.navigation_planner.saved_load_count - saved_loads_at_start,
+        'resource_savings': cs.resource_blocker.take_savings(savings_at_start),
+        'failed_pages': cs.failed_page_log[failures_at_start:],
+        'page_hashes': page_hashes,
+        'scraped_at_utc': cs.scrape_started_at_utc,
+        'carried_forward': False
+    }
+
+    # Written last, so a checkpoint only ever exists for a character whose dataframes are all saved.
+    cs.checkpoints.save(char_name, game_version, ScrapeManifest.build_entry(result))
+
+    return result
+
+
+def scrape_character_on_healthy_browser(cs, char_name, JP=False):
+    """
+
+    Runs scrape_character on a healthy browser. The browser pool is checked before the character starts
+    (replacing the browser if it's unhealthy), and if the character fails with a WebDriver error (e.g.,
+    Chrome crashed), it's scraped again from the start on a fresh browser.
+
+    """
+
+    if cs.browser_pool is None:
+        return scrape_character(cs, char_name, JP=JP)
+
+    cs.driver = cs.browser_pool.check()
+
+    for attempt in range(cs.browser_pool.retries + 1):
+        try:
+            return scrape_character(cs, char_name, JP=JP)
+        except WebDriverException as e:
+            if attempt == cs.browser_pool.retries:
+                raise
+
+            cs.logger.info(
+                "WebDriver error while scraping %s: %s. Retrying on a fresh browser.", char_name.upper(), type(e).__name__
+            )
+
+            cs.page_cache.clear()
+            cs.driver = cs.browser_pool.recycle(f"{type(e).__name__} while scraping {char_name}")
+
+
+def load_saved_result(
+    cs,  # CompendiumScraper instance
+    char_name,  # Character name, as a string
+    JP,
+    saved_entry  # The character's scrape manifest entry or checkpoint
+):
+    """
+
+    Rebuilds a `scrape_character` result for a character that was already parsed, using the dataframes
+    the entry's run saved to the intermediate store and the flags saved in a scrape manifest entry or
+    checkpoint. Returns None if any of the saved dataframes are missing, so the character gets parsed again.
+
+    """
+
+    game_version = 'GL' if not JP else 'JP'
+
+    stored_df_dict = cs.intermediate_store.load(char_name, game_version, saved_entry['scraped_at_utc'])
+
+    df_dict = {'ability_df': None, 'bt_effect_df': None, 'ha_cap_df': None}
+
+    for df_name in df_dict:
+        if not saved_entry['outputs'][df_name]:
+            continue
+
+        if df_name not in stored_df_dict:
+            cs.logger.info("Saved %s for %s is missing. Parsing again.", df_name, char_name.upper())
+            return None
+
+        df_dict[df_name] = stored_df_dict[df_name]
+
+    return {
+        'char_name': char_name,
+        'game_version': game_version,
+        **df_dict,
+        'ability_dict': None,
+        # Both of these dataframes are a single row built straight from the dictionary.
+        'bt_effect_dict': None if df_dict['bt_effect_df'] is None else df_dict['bt_effect_df'].iloc[0].to_dict(),
+        'ha_dict': None if df_dict['ha_cap_df'] is None else df_dict['ha_cap_df'].iloc[0].to_dict(),
+        'rework_pending': saved_entry['rework_pending'],
+        'not_in_gl_yet': saved_entry['not_in_gl_yet'],
+        'driver_calls': 0,
+        'wait_seconds': 0,
+        'spans': [],
+        'seconds': 0,
+        'page_loads': 0,
+        'page_loads_saved': 0,
+        'resource_savings': [],
+        'failed_pages': [],
+        'page_hashes': saved_entry['page_hashes'],
+        'scraped_at_utc': saved_entry['scraped_at_utc'],
+        'carried_forward': False
+    }
+
+
+def resume_character(cs, char_name, JP=False):
+    """
 
-            pretty_div_block_list = self.prettify_html_to_list(
-                        self.driver.find_element(
-                            By.XPATH, "//div[@class='sliderbase infonameholderenemybuff nobuffpadding']"
-                        )
-                    )
+    Returns a character's result from their checkpoint in the run being resumed, merged into `cs`, or None
+    if the character still needs to be scraped (no checkpoint, or their saved dataframes are gone).
 
-            # find slider class
-            for line in pretty_div_block_list:
-                if re.search(r'css-(\w+)-Slider', line):
-                    slider_class = re.search(r'css-\w+-Slider', line).group()
+    """
 
-            # Find width element class
-            for line in pretty_div_block_list:
-                if re.search(r'(css-\w+)(" style)', line):
-                    width_element_class = re.search(r'(css-\w+)(" style)', line).group(1)
+    game_version = 'GL' if not JP else 'JP'
 
-            slider = self.driver.find_element(By.XPATH, f"//div[@class='{slider_class}']")
-            width_element = self.driver.find_element(By.XPATH, f"//div[@class='{width_element_class}']")
+    checkpoint = cs.checkpoints.load(char_name, game_version)
 
-            offset = 0
+    if checkpoint is None:
+        return None
 
-            # Set the slider to 1 enemy, then parse for data.
-            while width_element.get_attribute('style') != 'width: 0%;':
-                offset -= 10
-                actions.drag_and_drop_by_offset(slider, offset, 0).release().perform()
-                self.logger.info("Offset of %s performed.", offset)
+    result = load_saved_result(cs, char_name, JP, checkpoint)
 
-            self.logger.info("Slider set to enemy count of 1.")
+    if result is not None:
+        # Checkpoints of carried forward characters keep the run that originally parsed them.
+        result['carried_forward'] = result['scraped_at_utc'] != cs.scrape_started_at_utc
 
-            bt_buff_description_div = self.driver.find_element(
-                By.XPATH, "//div[@class='Buffbase infobase nobuffpadding']"
-            )
+        cs.logger.info("Resumed %s in %s from checkpoint.", char_name.upper(), game_version)
+        merge_character_result(cs, result)
 
-            bt_buff_html_list = self.prettify_html_to_list(bt_buff_description_div)
+    return result
 
-            for index, line in enumerate(bt_buff_html_list):
 
-                if re.search(r"- MAX BRV Cap", line) or re.search(r"└─ MAX BRV Cap", line):  # Personal HP Dmg Cap Up has this string
-                    bt_personal_hp_dmg_cap_up += int(re.search(r"\d+", bt_buff_html_list[index + 6]).group())
-                if re.search(r"- Party MAX BRV Cap", line) or re.search(r"└─ Party MAX BRV Cap", line):  # Party HP Dmg Cap up has this string
-                    bt_party_hp_dmg_cap_up += int(re.search(r"\d+", bt_buff_html_list[index + 6]).group())
+def merge_character_result(cs, result):
+    """
 
-            bt_effect_dict = {}
-            bt_effect_dict['char_name'] = char_name
-            bt_effect_dict['bt_personal_hp_dmg_cap_up'] = bt_personal_hp_dmg_cap_up
-            bt_effect_dict['bt_party_hp_dmg_cap_up'] = bt_party_hp_dmg_cap_up
-            bt_effect_dict['game_version'] = 'GL' if not JP else 'JP'
-            bt_effect_dict['enemy_count_apply_list'] = [1]
+    Merges the output of `scrape_character` into the main scraper's omnibus dictionaries and
+    GL/JP tracking lists. Safe to call more than once for the same result.
 
-            bt_effect_dict_list.append(bt_effect_dict)
+    """
 
-            bt_personal_hp_dmg_cap_up = 0
-            bt_party_hp_dmg_cap_up = 0
+    char_name = result['char_name']
+    JP = result['game_version'] == 'JP'
 
-            while width_element.get_attribute('style') != 'width: 50%;':
-                offset += 10
-                actions.drag_and_drop_by_offset(slider, offset, 0).release().perform()
-                self.logger.info("Offset of %s performed.", offset)
+    for omnibus, key in [
+        (cs.ability_dict_omnibus_gl if not JP else cs.ability_dict_omnibus_jp, 'ability_dict'),
+        (cs.bt_effect_dict_omnibus_gl if not JP else cs.bt_effect_dict_omnibus_jp, 'bt_effect_dict'),
+        (cs.ha_dict_omnibus_gl if not JP else cs.ha_dict_omnibus_jp, 'ha_dict')
+    ]:
+        if result[key] is not None and char_name not in omnibus:
+            omnibus[char_name] = result[key]
 
-            self.logger.info("Slider set to enemy count of 2.")
+    if result['rework_pending'] and char_name not in cs.chars_with_reworks_pending:
+        cs.chars_with_reworks_pending.append(char_name)
 
-            bt_buff_description_div = self.driver.find_element(
-                By.XPATH, "//div[@class='Buffbase infobase nobuffpadding']"
-            )
+    if result['not_in_gl_yet'] and char_name not in cs.chars_not_in_gl_yet:
+        cs.chars_not_in_gl_yet.append(char_name)
 
-            bt_buff_html_list = self.prettify_html_to_list(bt_buff_description_div)
+    cs.driver_call_counts[(char_name, result['game_version'])] = result['driver_calls']
 
-            for index, line in enumerate(bt_buff_html_list):
+    # JP pages a worker captured in place, for whichever worker runs the character's JP pass.
+    cs.navigation_planner.add_held_pages(result.pop('held_pages', {}))
 
-                if re.search(r"- MAX BRV Cap", line) or re.search(r"└─ MAX BRV Cap", line):  # Personal HP Dmg Cap Up has this string
-                    bt_personal_hp_dmg_cap_up += int(re.search(r"\d+", bt_buff_html_list[index + 6]).group())
-                if re.search(r"- Party MAX BRV Cap", line) or re.search(r"└─ Party MAX BRV Cap", line):  # Party HP Dmg Cap up has this string
-                    bt_party_hp_dmg_cap_up += int(re.search(r"\d+", bt_buff_html_list[index + 6]).group())
 
-            bt_effect_dict = {}
-            bt_effect_dict['char_name'] = char_name
-            bt_effect_dict['bt_personal_hp_dmg_cap_up'] = bt_personal_hp_dmg_cap_up
-            bt_effect_dict['bt_party_hp_dmg_cap_up'] = bt_party_hp_dmg_cap_up
-            bt_effect_dict['game_version'] = 'GL' if not JP else 'JP'
-            bt_effect_dict['enemy_count_apply_list'] = [2]
+# Each worker process keeps one scraper (and one browser pool) for every character it's handed.
+_worker_scraper = None
 
-            bt_effect_dict_list.append(bt_effect_dict)
 
-            bt_personal_hp_dmg_cap_up = 0
-            bt_party_hp_dmg_cap_up = 0
+def init_worker(config_yml_path, character_dict_omnibus, fetch_backend, incremental=False, scrape_started_at_utc=None):
+    """
 
-            while width_element.get_attribute('style') != 'width: 100%;':
-                offset += 10
-                actions.drag_and_drop_by_offset(slider, offset, 0).release().perform()
-                self.logger.info("Offset of %s performed.", offset)
+    Process pool initializer. Starts the worker's own headless browser. The worker's results are stamped
+    with the main scraper's start time, so they belong to the same run.
 
-            self.logger.info("Slider set to enemy count of 3.")
+    """
 
-            bt_buff_description_div = self.driver.find_element(
-                By.XPATH, "//div[@class='Buffbase infobase nobuffpadding']"
-            )
+    global _worker_scraper
 
-            bt_buff_html_list = self.prettify_html_to_list(bt_buff_description_div)
+    _worker_scraper = CompendiumScraper(
+        config_yml_path,
+        fetch_backend=fetch_backend,
+        character_dict_omnibus=character_dict_omnibus,
+        headless=True,
+        incremental=incremental
+    )
 
-            for index, line in enumerate(bt_buff_html_list):
+    if scrape_started_at_utc is not None:
+        _worker_scraper.scrape_started_at_utc = scrape_started_at_utc
 
-                if re.search(r"- MAX BRV Cap", line) or re.search(r"└─ MAX BRV Cap", line):  # Personal HP Dmg Cap Up has this string
-                    bt_personal_hp_dmg_cap_up += int(re.search(r"\d+", bt_buff_html_list[index + 6]).group())
-                if re.search(r"- Party MAX BRV Cap", line) or re.search(r"└─ Party MAX BRV Cap", line):  # Party HP Dmg Cap up has this string
-                    bt_party_hp_dmg_cap_up += int(re.search(r"\d+", bt_buff_html_list[index + 6]).group())
 
-            bt_effect_dict = {}
-            bt_effect_dict['char_name'] = char_name
-            bt_effect_dict['bt_personal_hp_dmg_cap_up'] = bt_personal_hp_dmg_cap_up
-            bt_effect_dict['bt_party_hp_dmg_cap_up'] = bt_party_hp_dmg_cap_up
-            bt_effect_dict['game_version'] = 'GL' if not JP else 'JP'
-            bt_effect_dict['enemy_count_apply_list'] = [3]
+def scrape_character_in_worker(char_name, JP=False, gl_ha_dict=None, held_page_dict=None):
+    """
 
-            bt_effect_dict_list.append(bt_effect_dict)
+    Process pool task. Scrapes one character on the worker's browser, which is replaced whenever it
+    stops being healthy, the same as in a serial run.
 
-            if not JP:
+    """
 
-                self.bt_effect_dict_omnibus_gl[char_name] = bt_effect_dict_list
+    # The JP pass skips high armor that was already parsed in GL, so the worker needs to know about it.
+    if gl_ha_dict is not None:
+        _worker_scraper.ha_dict_omnibus_gl[char_name] = gl_ha_dict
 
-            elif JP:
+    # JP pages captured in place by whichever worker ran the character's GL pass.
+    if held_page_dict:
+        _worker_scraper.navigation_planner.add_held_pages(held_page_dict)
 
-                self.bt_effect_dict_omnibus_jp[char_name] = bt_effect_dict_list
+    result = scrape_character_on_healthy_browser(_worker_scraper, char_name, JP=JP)
 
-            self.logger.info("Retrieved BT info for %s.", char_name.upper())
+    if not JP:
+        result['held_pages'] = _worker_scraper.navigation_planner.take_pages(char_name, 'JP')
 
-            if return_output:
-                bt_effect_df = pd.concat([pd.DataFrame(dict) for dict in bt_effect_dict_list])
+    return result
 
-                return bt_effect_df
 
-        elif char_name == 'yda':  # Necessary due to new stacked BT effect implementation from game devs
+def run_character_pass(
+    cs,  # CompendiumScraper instance
+    char_name_list,  # Characters to scrape, in the order their results should be returned
+    JP = False,
+    workers = 1,  # Number of browser processes to split the characters across
+    on_result = None  # Called with each result, in list order, as soon as it's ready. Its return value replaces the result.
+):
+    """
 
-            buff_holder_element = self.driver.find_element(By.CLASS_NAME, "directbuffholder")
+    Scrapes every character in char_name_list and returns their `scrape_character` results in the
+    same order as the list, no matter how many workers are used. With more than one worker, the
+    characters are spread across a pool of processes that each run their own headless browser,
+    and the results are merged back into `cs` in list order.
 
-            slider_class_list = []
+    When resuming, characters with a checkpoint are loaded from the intermediate store instead, and
+    only the rest are scraped.
 
-            width_class_list = []
+    """
 
-            for line in self.prettify_html_to_list(buff_holder_element):
+    result_dict = {}
 
-                if re.search(r'css-(\w+)-Slider', line):
-                    slider_class = re.search(r'css-\w+-Slider', line).group()
+    if cs.resuming:
+        for char_name in char_name_list:
+            result = resume_character(cs, char_name, JP=JP)
 
-                    slider_class_list.append(slider_class)
+            if result is not None:
+                result_dict[char_name] = result
 
-                if re.search(r'(css-\w+)(" style)', line):
-                    width_class = re.search(r'(css-\w+)(" style)', line).group(1)
+        cs.logger.info(
+            "Resumed %s of %s characters from checkpoints.", len(result_dict), len(char_name_list)
+        )
 
-                    width_class_list.append(width_class)
+    remaining_char_name_list = [char_name for char_name in char_name_list if char_name not in result_dict]
 
-            slider_class_unique_list = list(set(slider_class_list))
+    if workers <= 1:
+        for char_name in char_name_list:
+            if char_name not in result_dict:
+                result_dict[char_name] = scrape_character_on_healthy_browser(cs, char_name, JP=JP)
 
-            width_class_unique_list = list(set(width_class_list))
+            if on_result is not None:
+                result_dict[char_name] = on_result(result_dict[char_name])
 
-            if len(slider_class_unique_list) == 1:
-                slider_elements = buff_holder_element.find_elements(By.CLASS_NAME, slider_class_unique_list[0])
-            else:
-                slider_elements = [buff_holder_element.find_element(By.CLASS_NAME, slider_class_unique_list[slider_class]) for slider_class in slider_class_unique_list]
+        return [result_dict[char_name] for char_name in char_name_list]
 
-            if len(width_class_unique_list) == 1:
-                width_elements = buff_holder_element.find_elements(By.CLASS_NAME, width_class_unique_list[0])
-            else:
-                width_elements = [buff_holder_element.find_element(By.CLASS_NAME, width_class_unique_list[width_class]) for width_class in width_class_unique_list]
+    cs.logger.info("Splitting %s characters across %s workers.", len(remaining_char_name_list), workers)
 
-            buffunit_list = buff_holder_element.find_elements(By.CLASS_NAME, "buffunit")
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_worker,
+        initargs=(
+            cs.config_yml_path, cs.character_dict_omnibus, cs.fetch_backend, cs.incremental, cs.scrape_started_at_utc
+        )
+    ) as executor:
+        future_dict = {
+            char_name: executor.submit(
+                scrape_character_in_worker,
+                char_name,
+                JP,
+                cs.ha_dict_omnibus_gl.get(char_name) if JP else None,
+                cs.navigation_planner.take_pages(char_name, 'JP') if JP else None
+            )
+            for char_name in remaining_char_name_list
+        }
 
-            for index, buffunit_div in enumerate(buffunit_list):
+        for char_name in char_name_list:
+            if char_name in future_dict:
+                result_dict[char_name] = future_dict[char_name].result()
 
-                self.logger.info("Processing loop number %s.", index+1)
+            merge_character_result(cs, result_dict[char_name])
 
-                offset = 80
+            if on_result is not None:
+                result_dict[char_name] = on_result(result_dict[char_name])
 
-                while width_elements[index].get_attribute('style') != 'width: 100%;':
-                    offset += 10
-                    actions.drag_and_drop_by_offset(slider_elements[index], offset, 0).release().perform()
-                    self.logger.info("Offset of %s performed.", offset)
+    return [result_dict[char_name] for char_name in char_name_list]
 
-                self.logger.info("Reached max stacks!")
 
-                pretty_div_block_list = self.prettify_html_to_list(buffunit_div)
+def record_run_report(
+    cs,  # CompendiumScraper instance
+    engine,  # SQLAlchemy engine for the Postgres database
+    result_list,  # Every scrape_character result of the run
+    wall_seconds  # Seconds since the run started
+):
+    """
 
-                for index, line in enumerate(pretty_div_block_list):
+    Builds the run's performance report from its character results and the run-level spans left in
+    cs.stage_timer, saves it as JSON to the config's run_report_dir, and loads it into raw_run_reports
+    under the run's scrape_started_at_utc and scrape_ended_at_utc (unless engine is None, as in a
+    parse-only run). Returns the report.
 
-                    if re.search(r"- MAX BRV Cap", line) or re.search(r"└─ MAX BRV Cap", line):  # Personal HP Dmg Cap Up has this string
-                        bt_personal_hp_dmg_cap_up += int(re.search(r"\d+", pretty_div_block_list[index + 6]).group())
-                    if re.search(r"- Party MAX BRV Cap", line) or re.search(r"└─ Party MAX BRV Cap", line):  # Party HP Dmg Cap up has this string
-                        bt_party_hp_dmg_cap_up += int(re.search(r"\d+", pretty_div_block_list[index + 6]).group())
+    """
 
-            bt_effect_dict = {}
-            bt_effect_dict['char_name'] = char_name
-            bt_effect_dict['bt_personal_hp_dmg_cap_up'] = bt_personal_hp_dmg_cap_up
-            bt_effect_dict['bt_party_hp_dmg_cap_up'] = bt_party_hp_dmg_cap_up
-            bt_effect_dict['enemy_count_apply_list'] = [1, 2, 3]
+    report = build_run_report(
+        cs.scrape_started_at_utc, cs.scrape_ended_at_utc, result_list, cs.stage_timer.span_list, wall_seconds
+    )
 
-            if not JP:
+    report_path = save_run_report(cs.config.get('run_report_dir', cs.config['datasets_dir'] + 'run_reports/'), report)
 
-                bt_effect_dict['game_version'] = 'GL'
-                self.bt_effect_dict_omnibus_gl[char_name] = bt_effect_dict
+    cs.logger.info(cs.LOG_DIVIDER)
+    cs.logger.info("Run took %.1fs. Report saved to %s.", wall_seconds, report_path)
+    cs.logger.info(
+        "Loaded %s pages. The navigation planner saved %s page loads.",
+        report['page_loads']['loaded'], report['page_loads']['saved']
+    )
 
-            elif JP:
+    for page_type, page_savings in report['resource_blocking'].items():
+        cs.logger.info(
+            "Resource blocking on %s pages: %.0f KB and %.1fs saved over %s pages (%s measured, the rest estimated).",
+            page_type, page_savings['bytes_saved'] / 1024, page_savings['ms_saved'] / 1000, page_savings['pages'],
+            page_savings['measured_pages']
+        )
 
-                bt_effect_dict['game_version'] = 'JP'
-                self.bt_effect_dict_omnibus_jp[char_name] = bt_effect_dict
+    for failed_page in report['failed_pages']:
+        cs.logger.info(
+            "Failed to fetch %s %s page for %s: %s",
+            failed_page['game_version'], failed_page['page_type'], failed_page['char_name'].upper(), failed_page['error']
+        )
 
-            self.logger.info("Retrieved BT info for %s.", char_name.upper())
+    for stage, stage_summary in report['stages'].items():
+        cs.logger.info(
+            "%s: %.1fs over %s spans (p50 %.2fs, p90 %.2fs).",
+            stage, stage_summary['total'], stage_summary['count'], stage_summary['p50'], stage_summary['p90']
+        )
 
-            if return_output:
-                bt_effect_df = pd.DataFrame([bt_effect_dict])
+    for character in report['slowest_characters']:
+        cs.logger.info(
+            "Slow: %s in %s took %.1fs and %s WebDriver calls.",
+            character['char_name'].upper(), character['game_version'], character['seconds'], character['driver_calls']
+        )
 
-                return bt_effect_df
+    cs.logger.info(cs.LOG_DIVIDER)
 
-    def retrieve_ha_hp_dmg_cap_up(self, char_name, JP=False, return_output=False):
-        """
+    if engine is None:
+        return report
 
-        Retrieves HP Dmg Cap up values from a character's high armor pages, both personal and
-        party-wide, and adds character key-value pair to self.ha_dict_omnibus, where the key is char_name and the
-        value is a dict with  three key-value pairs: 1) character name, 2) personal hp dmg cap up,
-        and 3) party-wide hp dmg cap up.
+    try:
+        PostgresBulkLoader(engine, cs.logger).load_tables({
+            'raw_run_reports': pd.DataFrame([{
+                'wall_seconds': wall_seconds,
+                'character_versions': report['character_versions'],
+                'driver_calls': report['driver_calls']['total'],
+                'page_loads': report['page_loads']['loaded'],
+                'page_loads_saved': report['page_loads']['saved'],
+                'bytes_saved': sum(page_savings['bytes_saved'] for page_savings in report['resource_blocking'].values()),
+                'ms_saved': sum(page_savings['ms_saved'] for page_savings in report['resource_blocking'].values()),
+                'report_json': json.dumps(report),
+                'scrape_started_at_utc': cs.scrape_started_at_utc,
+                'scrape_ended_at_utc': cs.scrape_ended_at_utc
+            }])
+        })
+    except Exception as e:
+        cs.logger.info("Couldn't load the run report into the SQL database: %s", e)
 
-        """
-        self.logger.info(self.LOG_DIVIDER)
-        self.logger.info("Retrieving High Armor info for %s.", char_name.upper())
-        self.logger.info(self.LOG_DIVIDER)
+    return report
 
-        try:
-            if JP and self.ha_dict_omnibus_gl[char_name]:  # We shouldn't do this if we already collected it in GL -- it'll be the same
-                self.logger.info("High armor already parsed for %s. Skipping.", char_name.upper())
-                return
-        except Exception:
-            pass
 
-        self.driver.get(self.character_dict_omnibus[char_name]['high_armor_url'])
+def fetch_pages(cs):
+    """
 
-        time.sleep(5)
+    Fetches every character's pages into the snapshot store without parsing them, so a later parse-only
+    run (--mode parse) can replay them. With a browser, the navigation planner captures the JP pages the
+    JP pass will need while the GL pages are open. Without one, there's nothing to tell which characters
+    need a JP pass before parsing, so every character's JP pages are fetched too.
 
-        actions = ActionChains(self.driver)
+    """
 
-        if JP:
-            try:
-                switch_to_jp_button = self.driver.find_element(By.XPATH, "//span[@class='glflage smalleventbutton']")
+    if cs.snapshot_store is None:
+        raise ValueError("Fetch mode needs a 'snapshot_dir' entry in the config YAML.")
 
-                actions.click(switch_to_jp_button).perform()
+    if not cs.browserless and not cs.navigation_planner.enabled:
+        cs.logger.info("plan_navigation is off, so no JP pages will be fetched.")
 
-                time.sleep(5)
-            except Exception:
-                pass
-        elif not JP:
-            try:
-                switch_to_gl_button = self.driver.find_element(By.XPATH, "//span[@class='jpflage jpsmallinactive smalleventbutton']")
+    page_count = 0
 
-                actions.click(switch_to_gl_button).perform()
+    for char_name in cs.character_dict_omnibus:
+        if cs.browser_pool is not None:
+            cs.driver = cs.browser_pool.check()
 
-                time.sleep(5)
-            except Exception:
-                pass
-        try:
-            high_armor_html = self.prettify_html_to_list(
-                self.driver.find_element(By.XPATH, "//div[@class='infonameholderenemybuff default_passive Buffbase']")
-            )
-        except Exception:
-            self.logger.info("Could not find High Armor for %s.", char_name.upper())
-            print(f"Unable to find High Armor info for {char_name.title()}.")
-            if not JP:
-                print("They might not be released to GL yet.")
-                if char_name not in self.chars_not_in_gl_yet:
-                    self.chars_not_in_gl_yet.append(char_name)
-                return
-            else:
-                self.logger.info("Something's wrong with high armor parsing for %s, since we're already checking the JP version.", char_name.upper())
-                return
+        page_html_list = list(cs.prefetch_character_pages(char_name).values())
 
-        personal_ha_hp_dmg_cap_up = 0
-        party_ha_hp_dmg_cap_up = 0
+        if cs.browserless:
+            page_html_list += cs.prefetch_character_pages(char_name, JP=True).values()
+        else:
+            page_html_list += cs.navigation_planner.take_pages(char_name, 'JP').values()
 
-        # Extract base high armor values
-        for index, line in enumerate(high_armor_html):
-            if re.search(r"- MAX BRV Cap", line):
-                personal_ha_hp_dmg_cap_up += int(re.search("\d+", high_armor_html[index + 6]).group())
-            if re.search(r"- Party MAX BRV Cap", line):
-                party_ha_hp_dmg_cap_up += int(re.search("\d+", high_armor_html[index + 6]).group())
+        cs.page_cache.clear()
 
-        self.driver.get(self.character_dict_omnibus[char_name]['high_armor_plus_url'])
+        fetched_count = sum(page_html is not None for page_html in page_html_list)
+        page_count += fetched_count
 
-        time.sleep(5)
+        cs.logger.info("Fetched %s pages for %s.", fetched_count, char_name.upper())
 
-        self.driver.execute_script("window.scrollBy(0, 300);")
+    cs.logger.info(cs.LOG_DIVIDER)
+    cs.logger.info("Fetched %s pages into %s.", page_count, cs.config['snapshot_dir'])
+    cs.logger.info(cs.LOG_DIVIDER)
 
-        high_armor_plus_div_list = self.driver.find_elements(
-            By.XPATH, "//div[@class='infonameholderenemybuff default_passive Buffbase']"
-        )
 
-        # Make sure we've captured all the HA+ blocks before extracting data
-        while len(high_armor_plus_div_list) < 5:
-            self.driver.execute_script("window.scrollBy(0, 300);")
-            high_armor_plus_div_list = self.driver.find_elements(
-                By.XPATH, "//div[@class='infonameholderenemybuff default_passive Buffbase']"
-            )
+def load_saved_outputs(config_yml_path, output_format=None):
+    """
 
-        for div_block in high_armor_plus_div_list:
+    Loads the raw tables saved by an earlier run (CSVs, or the latest run in the Parquet datasets) into the
+    SQL database, without starting a scraper.
 
-            ha_plus_html = self.prettify_html_to_list(div_block)
+    """
 
-            for index, line in enumerate(ha_plus_html):
-                if re.search(r"- MAX BRV Cap", line):
-                    personal_ha_hp_dmg_cap_up += int(re.search(
-                        "\d+", ha_plus_html[index + 6]
-                    ).group())
+    with open(config_yml_path, 'r') as yml:
+        config = yaml.safe_load(yml)
 
-                if re.search(r"- Party MAX BRV Cap", line):
-                    party_ha_hp_dmg_cap_up += int(re.search(
-                        "\d+", ha_plus_html[index + 6]
-                    ).group())
+    logger = configure_logging(config, __name__)
 
-        ha_hp_dmg_cap_up_dict = {}
-        ha_hp_dmg_cap_up_dict['char_name'] = char_name
-        ha_hp_dmg_cap_up_dict['personal_hp_dmg_cap_up'] = personal_ha_hp_dmg_cap_up
-        ha_hp_dmg_cap_up_dict['party_ha_hp_dmg_cap_up'] = party_ha_hp_dmg_cap_up
+    output_format = output_format or config.get('output_format', 'csv')
 
-        if not JP:
+    if output_format == 'parquet':
+        # Only needed for Parquet input, and it pulls in pyarrow.
+        from parquet_store import ParquetOutput
 
-            ha_hp_dmg_cap_up_dict['game_version'] = 'GL'
-            self.ha_dict_omnibus_gl[char_name] = ha_hp_dmg_cap_up_dict
+        parquet_output = ParquetOutput(config.get('parquet_dir', config['datasets_dir'] + 'parquet/'))
 
-        elif JP:
+        df_dict = {
+            table_name: parquet_output.read(table_name).drop(columns=['scrape_run'])
+            for table_name in RAW_TABLE_CSV_DICT
+        }
+    else:
+        df_dict = {
+            table_name: read_raw_csv(config['datasets_dir'] + csv_name)
+            for table_name, csv_name in RAW_TABLE_CSV_DICT.items()
+        }
 
-            ha_hp_dmg_cap_up_dict['game_version'] = 'JP'
-            self.ha_dict_omnibus_jp[char_name] = ha_hp_dmg_cap_up_dict
+    # Rows the run carried forward are already in the database under the run that parsed them.
+    report_dir = config.get('run_report_dir', config['datasets_dir'] + 'run_reports/')
 
-        self.logger.info("High armor info parsed for %s.", char_name.upper())
+    for table_name, df in df_dict.items():
+        if df.empty:
+            continue
 
-        if return_output:
-            ha_hp_dmg_cap_up_df = pd.DataFrame([ha_hp_dmg_cap_up_dict])
+        carried_forward_key_set = carried_forward_keys(report_dir, df['scrape_started_at_utc'].iloc[0])
 
-            return ha_hp_dmg_cap_up_df
+        if carried_forward_key_set is None:
+            logger.info("No run report found for %s. Loading every row.", table_name)
+            continue
 
-    def screen_for_rework(self, char_name):
-        """
+        df_dict[table_name] = drop_carried_forward_rows(df, carried_forward_key_set)
 
-        Checks whether a character has had a rework in the Japanese version of the game. If so, this function
-        will add them to the characters with reworks list to be parsed later.
+        logger.info(
+            "Skipping %s rows of %s carried forward from earlier runs.", len(df) - len(df_dict[table_name]), table_name
+        )
 
-        """
+    load_stats = PostgresBulkLoader(create_sql_engine(config), logger).load_tables(df_dict)
+
+    for table_name, table_stats in load_stats.items():
+        logger.info("Loaded %s rows into %s in %.2fs.", table_stats['rows'], table_name, table_stats['seconds'])
 
-        try:
-            if self.driver.find_element(By.XPATH, "//li[@class='filterinactive buffbutton reworktabred_direct']"):
-                self.chars_with_reworks_pending.append(char_name)
-                self.logger.info("Found an upcoming rework for %s.", char_name.upper())
-        except Exception:
-            return
 
 def main():
     """
 
     One function that will complete all standard web scraping operations.
 
-    """
+    Pass --mode to run only one step of the pipeline:
 
-    config_yml_path = sys.argv[1]
+    - fetch: save every character's pages to the config's snapshot_dir, without parsing them
+    - parse: parse the saved pages (like --replay) and save the raw tables, without loading them
+    - load: load the saved raw tables into the SQL database, without starting a scraper
 
-    cs = CompendiumScraper(config_yml_path)
+    Only fetching starts a browser, and selenium and SQLAlchemy are only imported by the steps that use
+    them, so parse-only and load-only runs start quickly.
 
-    ability_df_list = []
+    The roster is cached for the config's roster_ttl_hours (24 by default), so most runs skip the
+    character list page. Pass --refresh-roster to discover it again, and --characters to scrape only a
+    few characters.
 
-    bt_effect_df_list = []
+    Pass --replay to re-parse the pages saved in the config's snapshot_dir instead of scraping the
+    website, or --fetch-backend http to fetch saved pages from a snapshot server. No browser is started in either
+    case. Pass --workers to split the characters across several processes, and --async-crawl to fetch the
+    whole roster from a snapshot server concurrently on one event loop. Async crawls only re-read pages a
+    Selenium run already recorded; they don't scrape the website.
 
-    ha_cap_df_list = []
+    Pass --resume to pick up an interrupted run: characters it already finished are loaded from their
+    checkpoints and the intermediate store, and only the rest are scraped.
 
-    character_count = 1
+    Pass --incremental to skip parsing characters whose pages haven't changed since the last run. Their
+    rows from the last run are carried forward: they're saved to this run's CSVs (or Parquet datasets), so
+    those always hold the full roster, but they aren't loaded into the SQL database again, where they're
+    already stored under the run that parsed them.
 
-    for char_name in cs.character_dict_omnibus:
+    Pass --output-format parquet to save the raw tables as Parquet datasets (partitioned by game version
+    and scrape run, with typed columns) instead of CSVs. This needs pyarrow.
+
+    Pass --stream-load to load each character's rows into the SQL database as soon as they're parsed,
+    instead of all at once at the end. Rows of a run that hasn't finished have no scrape_ended_at_utc.
+    If a load fails, the run stops, and --resume picks it back up.
+
+    Every run ends with a performance report (see run_report.py): time spent per stage, the slowest
+    characters, and WebDriver call counts. It's saved as JSON to the config's run_report_dir (defaults to
+    <datasets_dir>/run_reports/) and loaded into raw_run_reports with the run's timestamps.
 
-        # Restart the driver every once in a while so program doesn't crash
-        if character_count in [30, 60, 90, 120, 150, 180]:
-            cs.driver.close()
-            cs.driver = webdriver.Chrome()
-            time.sleep(5)
+    """
 
-        parsed_ability_df = None
-        bt_effect_df = None
-        high_armor_cap_df = None
+    arg_parser = argparse.ArgumentParser(description="Scrape character data from Dissidia Compendium.")
+    arg_parser.add_argument('config_yml_path', help="Path to the scraper's config YAML.")
+    arg_parser.add_argument('--replay', action='store_true', help="Parse saved page snapshots instead of scraping the website.")
+    arg_parser.add_argument('--fetch-backend', choices=['selenium', 'replay', 'http'], help="Where pages come from. Defaults to the config's 'fetch_backend' entry, or selenium.")
+    arg_parser.add_argument('--workers', type=int, default=1, help="Number of browser processes to scrape with.")
+    arg_parser.add_argument('--async-crawl', action='store_true', help="Re-read every recorded page concurrently from a snapshot server, then parse from the snapshot store. Doesn't scrape the website.")
+    arg_parser.add_argument('--incremental', action='store_true', default=None, help="Reuse the previous rows of characters whose pages haven't changed.")
+    arg_parser.add_argument('--resume', action='store_true', help="Continue the last run from its checkpoints instead of starting over.")
+    arg_parser.add_argument('--stream-load', action='store_true', default=None, help="Load each character's rows into the SQL database as soon as they're parsed.")
+    arg_parser.add_argument('--stream-buffer-rows', type=int, help="Rows held in memory between streamed loads. Defaults to the config's 'stream_buffer_rows' entry, or 5000.")
+    arg_parser.add_argument('--output-format', choices=['csv', 'parquet'], help="How the raw tables are saved to disk. Defaults to the config's 'output_format' entry, or csv.")
+    arg_parser.add_argument('--mode', choices=['all', 'fetch', 'parse', 'load'], default='all', help="Run every step (the default), or only fetching, parsing, or loading.")
+    arg_parser.add_argument('--characters', nargs='+', help="Only scrape these characters (e.g., aerith lannreynn). The saved raw tables will only hold them.")
+    arg_parser.add_argument('--refresh-roster', action='store_true', help="Discover the roster again even if the cached one is still fresh.")
+    args = arg_parser.parse_args()
+
+    if args.mode == 'load':
+        load_saved_outputs(args.config_yml_path, output_format=args.output_format)
+        return
+
+    if args.mode == 'parse' and args.stream_load:
+        arg_parser.error("--stream-load loads into the SQL database, which a parse-only run doesn't do.")
+
+    if args.mode == 'parse' and args.async_crawl:
+        arg_parser.error("--async-crawl fetches pages, which a parse-only run doesn't do.")
+
+    if args.mode == 'fetch' and (args.replay or args.fetch_backend == 'replay'):
+        arg_parser.error("Fetch mode can't fetch from the snapshot store.")
+
+    run_started_at = time.perf_counter()
+
+    if args.mode == 'parse':
+        fetch_backend = 'replay'
+    elif args.async_crawl:
+        fetch_backend = 'http'
+    elif args.replay:
+        fetch_backend = 'replay'
+    else:
+        fetch_backend = args.fetch_backend
+
+    cs = CompendiumScraper(
+        args.config_yml_path, fetch_backend=fetch_backend, incremental=args.incremental, refresh_roster=args.refresh_roster
+    )
 
-        cs.generate_ability_dict(char_name)
+    if args.characters:
+        cs.select_characters(args.characters)
 
-        parsed_ability_df = cs.generate_ability_df(char_name)
+    if args.mode == 'fetch':
+        fetch_pages(cs)
+        return
 
-        if parsed_ability_df is not None:
-            ability_df_list.append(parsed_ability_df)
+    resumed_run_started_at_utc = cs.checkpoints.resume_run() if args.resume else None
 
-        bt_effect_df = cs.retrieve_hp_caps_from_bt(char_name, return_output=True)
+    if resumed_run_started_at_utc is not None:
+        # Keep the interrupted run's timestamp, so its rows and the resumed rows load as one scrape.
+        cs.scrape_started_at_utc = resumed_run_started_at_utc
+        cs.resuming = True
+        cs.logger.info("Resuming the run started at %s.", cs.scrape_started_at_utc)
+    else:
+        if args.resume:
+            cs.logger.info("No run to resume. Starting a new one.")
 
-        if bt_effect_df is not None:
-            bt_effect_df_list.append(bt_effect_df)
+        cs.checkpoints.start_run(cs.scrape_started_at_utc)
 
-        high_armor_cap_df = cs.retrieve_ha_hp_dmg_cap_up(char_name, return_output=True)
+    engine = None if args.mode == 'parse' else create_sql_engine(cs.config)
 
-        if high_armor_cap_df is not None:
-            ha_cap_df_list.append(high_armor_cap_df)
+    output_format = args.output_format or cs.config.get('output_format', 'csv')
 
-        try:
-            parsed_ability_df.to_csv(cs.config['temp_ability_df_dir'] + f"{char_name}_abiilty_df_gl.csv", index=False)
-            cs.logger.info("Successfully saved temporary ability_df for %s.", char_name.upper())
-        except Exception:
-            cs.logger.info("No ability_df to save for %s.", char_name.upper())
-            pass
+    parquet_output = None
 
-        try:
-            bt_effect_df.to_csv(cs.config['temp_bt_effect_df_dir'] + f"{char_name}_bt_effect_df_gl.csv", index=False)
-            cs.logger.info("Successfully saved temporary bt_effect_df for %s.", char_name.upper())
-        except Exception:
-            cs.logger.info("No bt_effect_df to save for %s.", char_name.upper())
-            pass
+    if output_format == 'parquet':
+        # Only needed for Parquet output, and it pulls in pyarrow.
+        from parquet_store import ParquetOutput
 
-        try:
-            high_armor_cap_df.to_csv(cs.config['temp_ha_cap_df_dir'] + f"{char_name}_ha_cap_df_gl.csv", index=False)
-            cs.logger.info("Successfully saved temporary ha_cap_df for %s.", char_name.upper())
-        except Exception:
-            cs.logger.info("No high_armor_cap_df to save for %s.", char_name.upper())
-            pass
+        parquet_output = ParquetOutput(cs.config.get('parquet_dir', cs.config['datasets_dir'] + 'parquet/'))
 
-        character_count += 1
+    stream_load = cs.config.get('stream_load', False) if args.stream_load is None else args.stream_load
+    stream_load = stream_load and engine is not None
 
-    cs.jp_scrape_set = set(cs.chars_with_reworks_pending + cs.chars_not_in_gl_yet)
+    stream_loader = None
+    on_result = None
 
-    character_count = 1
+    if stream_load:
+        stream_loader = StreamingRunLoader(
+            PostgresBulkLoader(engine, cs.logger),
+            cs.scrape_started_at_utc,
+            csv_path_dict=None if parquet_output is not None else {
+                table_name: cs.config['datasets_dir'] + csv_name
+                for table_name, csv_name in RAW_TABLE_CSV_DICT.items()
+            },
+            max_buffered_rows=args.stream_buffer_rows or cs.config.get('stream_buffer_rows', 5000),
+            parquet_output=parquet_output
+        )
 
-    cs.logger.info(cs.LOG_DIVIDER)
-    cs.logger.info("BEGIN PARSING JP VERSION")
-    cs.logger.info(cs.LOG_DIVIDER)
+        def on_result(result):
+            # Overrides only ever touch one character's rows, so they can be applied a character at a time.
+            with cs.stage_timer.span('sql_load'):
+                stream_loader.add({
+                    'raw_abilities': None if result['ability_df'] is None else cs.ability_overrides.apply(result['ability_df']),
+                    'raw_bt_effects': result['bt_effect_df'],
+                    'raw_high_armor_caps': result['ha_cap_df']
+                }, load=not result['carried_forward'])
 
-    for char_name in cs.jp_scrape_set:
-        # Restart the driver every once in a while so program doesn't crash
-        if character_count in [30, 60, 90, 120, 150, 180]:
-            cs.driver.close()
-            cs.driver = webdriver.Chrome()
-            time.sleep(5)
+            # Recorded now, but only saved once the run is complete.
+            if cs.manifest is not None:
+                cs.manifest.record(result)
 
-        parsed_ability_df = None
-        bt_effect_df = None
-        high_armor_cap_df = None
+            # The rows are buffered or loaded, so the result doesn't need to hold on to them.
+            return {**result, 'ability_df': None, 'bt_effect_df': None, 'ha_cap_df': None}
 
-        cs.generate_ability_dict(char_name, JP=True)
+    ability_df_list = []
 
-        parsed_ability_df = cs.generate_ability_df(char_name, JP=True)
+    bt_effect_df_list = []
 
-        if parsed_ability_df is not None:
-            ability_df_list.append(parsed_ability_df)
+    ha_cap_df_list = []
 
-        bt_effect_df = cs.retrieve_hp_caps_from_bt(char_name, JP=True, return_output=True)
+    if args.async_crawl:
+        # Only needed for async crawls, and it pulls in aiohttp.
+        from async_crawler import AsyncRosterCrawler
+
+        # The worker functions are passed in, since importing this module from async_crawler would load a
+        # second copy of it when it's run as a script.
+        result_list = AsyncRosterCrawler.from_config(
+            cs,
+            workers=args.workers,
+            init_worker=init_worker,
+            scrape_in_worker=scrape_character_in_worker,
+            merge_result=merge_character_result,
+            resume=resume_character
+        ).crawl(on_result=on_result)
+
+        cs.jp_scrape_set = set(cs.chars_with_reworks_pending + cs.chars_not_in_gl_yet)
+    else:
+        result_list = run_character_pass(cs, list(cs.character_dict_omnibus), workers=args.workers, on_result=on_result)
+
+        # Keep the JP pass in roster order, so the output doesn't depend on set ordering or worker count.
+        cs.jp_scrape_set = set(cs.chars_with_reworks_pending + cs.chars_not_in_gl_yet)
+
+        cs.logger.info(cs.LOG_DIVIDER)
+        cs.logger.info("BEGIN PARSING JP VERSION")
+        cs.logger.info(cs.LOG_DIVIDER)
+
+        result_list += run_character_pass(
+            cs,
+            [char_name for char_name in cs.character_dict_omnibus if char_name in cs.jp_scrape_set],
+            JP=True,
+            workers=args.workers,
+            on_result=on_result
+        )
 
-        if bt_effect_df is not None:
-            bt_effect_df_list.append(bt_effect_df)
+    if cs.manifest is not None:
+        carried_forward_count = sum(result['carried_forward'] for result in result_list)
+        cs.logger.info(
+            "%s of %s character scrapes were unchanged and carried forward.", carried_forward_count, len(result_list)
+        )
 
-        high_armor_cap_df = cs.retrieve_ha_hp_dmg_cap_up(char_name, JP=True, return_output=True)
+    cs.logger.info(cs.LOG_DIVIDER)
+    cs.logger.info("Saving out dataframes to %s%s.", output_format.upper(), "" if engine is None else " and SQL database")
+    cs.logger.info(cs.LOG_DIVIDER)
 
-        if high_armor_cap_df is not None:
-            ha_cap_df_list.append(high_armor_cap_df)
+    cs.scrape_ended_at_utc = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
 
-        try:
-            parsed_ability_df.to_csv(cs.config['temp_ability_df_dir'] + f"{char_name}_abiilty_df_jp.csv", index=False)
-            cs.logger.info("Successfully saved temporary ability_df for %s.", char_name.upper())
-        except Exception:
-            cs.logger.info("No ability_df to save for %s.", char_name.upper())
-            pass
+    if stream_loader is not None:
+        with cs.stage_timer.span('sql_load'):
+            loaded_rows = stream_loader.finish(cs.scrape_ended_at_utc)
 
-        try:
-            bt_effect_df.to_csv(cs.config['temp_bt_effect_df_dir'] + f"{char_name}_bt_effect_df_jp.csv", index=False)
-            cs.logger.info("Successfully saved temporary bt_effect_df for %s.", char_name.upper())
-        except Exception:
-            cs.logger.info("No bt_effect_df to save for %s.", char_name.upper())
-            pass
+        for table_name, row_count in loaded_rows.items():
+            cs.logger.info("Streamed %s rows into %s.", row_count, table_name)
 
-        try:
-            high_armor_cap_df.to_csv(cs.config['temp_ha_cap_df_dir'] + f"{char_name}_ha_cap_df_jp.csv", index=False)
-            cs.logger.info("Successfully saved temporary ha_cap_df for %s.", char_name.upper())
-        except Exception:
-            cs.logger.info("No high_armor_cap_df to save for %s.", char_name.upper())
-            pass
+        if cs.manifest is not None:
+            cs.manifest.save()
 
-        character_count += 1
+        cs.logger.info("Data uploaded to SQL database.")
 
-    engine_url = sa.URL.create(
-        "postgresql",
-        username=cs.config['pg_user'],
-        password=cs.config['pg_pass'],
-        host=cs.config['pg_host'],
-        database=cs.config['pg_db']
-    )
+        record_run_report(cs, engine, result_list, time.perf_counter() - run_started_at)
+        return
 
-    cs.logger.info(cs.LOG_DIVIDER)
-    cs.logger.info("Saving out dataframes to CSV and SQL database.")
-    cs.logger.info(cs.LOG_DIVIDER)
+    for result in result_list:
+        if result['ability_df'] is not None:
+            ability_df_list.append(result['ability_df'])
 
-    cs.scrape_ended_at_utc = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+        if result['bt_effect_df'] is not None:
+            bt_effect_df_list.append(result['bt_effect_df'])
 
-    engine = sa.create_engine(engine_url)
+        if result['ha_cap_df'] is not None:
+            ha_cap_df_list.append(result['ha_cap_df'])
 
-    final_raw_abilities_df = pd.concat(ability_df_list)
+    final_raw_abilities_df = cs.ability_overrides.apply(pd.concat(ability_df_list))
     final_raw_abilities_df['scrape_started_at_utc'] = cs.scrape_started_at_utc
     final_raw_abilities_df['scrape_ended_at_utc'] = cs.scrape_ended_at_utc
 
-    final_raw_abilities_df.to_csv(cs.config['datasets_dir'] + 'raw_abilities.csv', index=False)
-
-    cs.logger.info("ABILITIES saved to CSV")
-
     final_raw_bt_effects_df = pd.concat(bt_effect_df_list)
     final_raw_bt_effects_df['scrape_started_at_utc'] = cs.scrape_started_at_utc
     final_raw_bt_effects_df['scrape_ended_at_utc'] = cs.scrape_ended_at_utc
 
-    final_raw_bt_effects_df.to_csv(cs.config['datasets_dir'] + 'raw_bt_effects.csv', index=False)
-
-    cs.logger.info("BT EFFECTS saved to CSV")
-
     final_raw_ha_caps_df = pd.concat(ha_cap_df_list)
     final_raw_ha_caps_df['scrape_started_at_utc'] = cs.scrape_started_at_utc
     final_raw_ha_caps_df['scrape_ended_at_utc'] = cs.scrape_ended_at_utc
 
-    final_raw_ha_caps_df.to_csv(cs.config['datasets_dir'] + 'raw_high_armor_caps.csv', index=False)
+    final_raw_df_dict = {
+        'raw_abilities': final_raw_abilities_df,
+        'raw_bt_effects': final_raw_bt_effects_df,
+        'raw_high_armor_caps': final_raw_ha_caps_df
+    }
+
+    with cs.stage_timer.span('save_outputs'):
+        for table_name, final_raw_df in final_raw_df_dict.items():
+            if parquet_output is not None:
+                parquet_output.write_run(table_name, final_raw_df)
+                cs.logger.info("%s saved to Parquet", table_name.upper())
+            else:
+                final_raw_df.to_csv(cs.config['datasets_dir'] + RAW_TABLE_CSV_DICT[table_name], index=False)
+                cs.logger.info("%s saved to CSV", table_name.upper())
+
+    # Only remember this run's fingerprints once its rows are saved, so a failed run never causes the
+    # next one to skip characters.
+    if cs.manifest is not None:
+        for result in result_list:
+            cs.manifest.record(result)
 
-    cs.logger.info("HIGH ARMOR CAPS saved to CSV")
+        cs.manifest.save()
+
+    if engine is None:
+        cs.logger.info("Parse-only run. Load the saved tables with --mode load.")
+
+        record_run_report(cs, None, result_list, time.perf_counter() - run_started_at)
+        return
+
+    # Carried forward rows are already in the database under the run that parsed them.
+    carried_forward_key_set = {
+        (result['char_name'], result['game_version']) for result in result_list if result['carried_forward']
+    }
 
     try:
-        with engine.begin() as conn:
-            final_raw_abilities_df.to_sql('raw_abilities', con=conn, if_exists='append', index=False)
-            final_raw_bt_effects_df.to_sql('raw_bt_effects', con=conn, if_exists='append', index=False)
-            final_raw_ha_caps_df.to_sql('raw_high_armor_caps', con=conn, if_exists='append', index=False)
-            cs.logger.info("Data uploaded to SQL database.")
+        with cs.stage_timer.span('sql_load'):
+            PostgresBulkLoader(engine, cs.logger).load_tables({
+                table_name: drop_carried_forward_rows(final_raw_df, carried_forward_key_set)
+                for table_name, final_raw_df in final_raw_df_dict.items()
+            })
+        cs.logger.info("Data uploaded to SQL database.")
     except Exception as e:
         print("Encountered an error during SQL database insert:")
         print(e)
         print("You'll need to manually upload this data to the SQL database.")
 
+    record_run_report(cs, engine, result_list, time.perf_counter() - run_started_at)
+
 
 if __name__ == '__main__':
     main()
\ No newline at end of file